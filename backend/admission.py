@@ -0,0 +1,157 @@
+"""Bounded admission for expensive async work.
+
+An AdmissionGate lets at most `limit` operations run at once and at
+most `queue` more wait for a slot. Anything beyond that, or a wait
+longer than `timeout` seconds, is rejected straight away with
+Overloaded instead of piling up behind the running work. That
+backpressure keeps a burst on one endpoint from starving the rest.
+
+AdmissionMiddleware puts whole HTTP routes behind gates: a rejected
+request gets 429 (queue full) or 503 (waited too long) with Retry-After,
+and an admitted one reports its wait as a Server-Timing entry.
+"""
+import asyncio
+import os
+import re
+import time
+from contextlib import asynccontextmanager
+
+ADMISSION_TIMEOUT = float(os.environ.get('ADMISSION_TIMEOUT', '5'))
+
+
+class Overloaded(Exception):
+    """Raised when a gate cannot admit more work; `retry_after` is in seconds.
+
+    `reason` is "queue_full" when the wait queue had no room and "timeout"
+    when the request waited `timeout` seconds without getting a slot.
+    """
+
+    def __init__(self, gate, retry_after, reason='queue_full'):
+        super().__init__(f"{gate} is overloaded, retry in {retry_after}s")
+        self.gate = gate
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class AdmissionGate:
+    """Concurrency limit plus a bounded wait queue, for use on one event loop"""
+
+    def __init__(self, name, limit, queue, timeout, retry_after=1):
+        self.name = name
+        self.limit = limit
+        self.queue = queue
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._slots = asyncio.Semaphore(limit)
+        self.running = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    async def acquire(self):
+        """Take a slot, waiting in the queue if needed; returns the seconds waited"""
+        # Counted here rather than via the semaphore: acquires still scheduled
+        # inside wait_for have not taken their slot yet
+        if self.running + self.waiting >= self.limit + self.queue:
+            self.rejected += 1
+            raise Overloaded(self.name, self.retry_after)
+        started = time.perf_counter()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise Overloaded(self.name, self.retry_after, reason='timeout')
+        finally:
+            self.waiting -= 1
+        waited = time.perf_counter() - started
+        self.admitted += 1
+        self.wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        self.running += 1
+        return waited
+
+    def release(self):
+        self.running -= 1
+        self._slots.release()
+
+    @asynccontextmanager
+    async def admit(self):
+        """Hold a slot for the duration of the `async with` block; yields the seconds waited"""
+        waited = await self.acquire()
+        try:
+            yield waited
+        finally:
+            self.release()
+
+    def stats(self):
+        return {
+            "limit": self.limit,
+            "queue": self.queue,
+            "running": self.running,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "mean_wait_ms": 1000 * self.wait_seconds / self.admitted if self.admitted else 0.0,
+            "max_wait_ms": 1000 * self.max_wait_seconds,
+        }
+
+
+def gate_from_env(name, limit, queue, timeout=ADMISSION_TIMEOUT, retry_after=1):
+    """AdmissionGate whose sizes ADMISSION_<NAME>_LIMIT / _QUEUE / _TIMEOUT override"""
+    prefix = 'ADMISSION_' + re.sub(r'\W', '_', name).upper()
+    return AdmissionGate(name,
+                         limit=int(os.environ.get(prefix + '_LIMIT', limit)),
+                         queue=int(os.environ.get(prefix + '_QUEUE', queue)),
+                         timeout=float(os.environ.get(prefix + '_TIMEOUT', timeout)),
+                         retry_after=retry_after)
+
+
+class AdmissionMiddleware:
+    """ASGI middleware that puts requests to the given routes behind their gates.
+
+    `routes` is a list of (method, path regex, gate); the first full match
+    wins. The slot is held until the response has been sent, so a streamed
+    export counts as running for as long as it streams.
+    """
+
+    def __init__(self, app, routes):
+        self.app = app
+        self.routes = [(method, re.compile(pattern), gate) for method, pattern, gate in routes]
+
+    def gate_for(self, scope):
+        for method, pattern, gate in self.routes:
+            if scope['method'] == method and pattern.fullmatch(scope['path']):
+                return gate
+        return None
+
+    async def __call__(self, scope, receive, send):
+        gate = self.gate_for(scope) if scope['type'] == 'http' else None
+        if gate is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            waited = await gate.acquire()
+        except Overloaded as e:
+            from starlette.responses import JSONResponse
+
+            status_code = 429 if e.reason == 'queue_full' else 503
+            response = JSONResponse({"detail": f"Too many {gate.name} requests in progress, please retry"},
+                                    status_code=status_code, headers={"Retry-After": str(e.retry_after)})
+            await response(scope, receive, send)
+            return
+
+        timing = f"admission;dur={waited * 1000:.1f}".encode()
+
+        async def send_with_timing(message):
+            if message['type'] == 'http.response.start':
+                message = {**message, 'headers': [*message.get('headers', []), (b'server-timing', timing)]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            gate.release()
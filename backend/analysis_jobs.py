@@ -0,0 +1,137 @@
+"""Long-running analyses run by the job queue (see job_queue).
+
+Every job function takes (params, inputs, ctx): the JSON params it was
+submitted with, the dataset columns of the version it runs on (as
+returned by DatasetStore.columns) and the JobContext for progress,
+cancellation and output files. It returns the JSON result to store.
+
+Many weight vectors are scored with topsis_scores in chunks sized so that
+the (weights x alternatives x criteria) intermediates stay around
+SCORE_CHUNK_CELLS cells, reporting progress after each chunk.
+"""
+import numpy as np
+
+from topsis_engine import CRITERIA_NAMES, LEVEL_COLUMNS, VALUE_COLUMNS, levels_to_values, rank_desc, topsis, topsis_scores
+
+SCORE_CHUNK_CELLS = 4_000_000
+
+
+def _values(inputs):
+    return levels_to_values(np.column_stack([inputs[name] for name in LEVEL_COLUMNS]))
+
+
+def _alternative(inputs, row):
+    return {"No": int(inputs['No'][row]), "Vendor": inputs['Vendor'][row], "Nama Paket (Plan)": inputs['Nama Paket (Plan)'][row]}
+
+
+def _score_chunks(X, W, ctx, message):
+    """Yield (start, scores) for consecutive chunks of the weight rows W"""
+    chunk = max(1, SCORE_CHUNK_CELLS // max(1, X.size))
+    for start in range(0, len(W), chunk):
+        yield start, topsis_scores(X, W[start:start + chunk])
+        ctx.progress(min(start + chunk, len(W)), len(W), message)
+
+
+def sweep(params, inputs, ctx):
+    """Vary one criterion's weight from 0 to 1 (the others keep their proportions).
+
+    params: weights (4), criterion (index), steps, track (how many of the
+    best alternatives at the given weights to follow).
+    """
+    X = _values(inputs)
+    base = np.asarray(params['weights'], dtype=float)
+    criterion = params['criterion']
+    steps = np.linspace(0.0, 1.0, params['steps'])
+
+    others = np.delete(base, criterion)
+    share = others / others.sum() if others.sum() > 0 else np.full(len(others), 1 / len(others))
+    W = np.empty((len(steps), len(base)))
+    W[:, criterion] = steps
+    W[:, np.arange(len(base)) != criterion] = np.outer(1 - steps, share)
+
+    tracked = np.argsort(-topsis(X, base)['scores'], kind='stable')[:params['track']]
+    points = []
+    paths = np.empty((len(tracked), len(steps)), dtype=int)
+    for start, S in _score_chunks(X, W, ctx, 'scoring'):
+        for i, scores in enumerate(S, start):
+            ranks = rank_desc(scores)
+            best = int(np.argmax(scores))
+            points.append({"weight": float(steps[i]), "weights": W[i].round(6).tolist(),
+                           "top": {**_alternative(inputs, best), "Score": float(scores[best])}})
+            paths[:, i] = ranks[tracked]
+
+    return {
+        "criterion": CRITERIA_NAMES[criterion],
+        "points": points,
+        "tracked": [{**_alternative(inputs, row), "ranks": paths[j].tolist()} for j, row in enumerate(tracked)],
+    }
+
+
+def smaa(params, inputs, ctx):
+    """SMAA-2 style rank acceptability from weights sampled uniformly over the simplex.
+
+    params: samples, ranks (how many top ranks to count), seed. For every
+    alternative that ever reached one of those ranks, returns the share of
+    samples in which it held each rank and its central weight vector (the
+    mean weights that made it first).
+    """
+    X = _values(inputs)
+    n = len(X)
+    samples, ranks = params['samples'], min(params['ranks'], n)
+    W = np.random.default_rng(params.get('seed')).dirichlet(np.ones(len(CRITERIA_NAMES)), size=samples)
+
+    counts = np.zeros((ranks, n), dtype=np.int64)
+    central = np.zeros((n, len(CRITERIA_NAMES)))
+    for start, S in _score_chunks(X, W, ctx, 'sampling'):
+        top = np.argsort(-S, axis=1, kind='stable')[:, :ranks]
+        for r in range(ranks):
+            counts[r] += np.bincount(top[:, r], minlength=n)
+        np.add.at(central, top[:, 0], W[start:start + len(S)])
+
+    reached = np.flatnonzero(counts.sum(axis=0))
+    reached = reached[np.lexsort([-counts[r, reached] for r in reversed(range(ranks))])]
+    alternatives = []
+    for row in reached:
+        first = counts[0, row]
+        alternatives.append({
+            **_alternative(inputs, row),
+            "acceptability": (counts[:, row] / samples).round(6).tolist(),
+            "central_weights": (central[row] / first).round(6).tolist() if first else None,
+        })
+    return {"samples": samples, "criteria": CRITERIA_NAMES, "alternatives": alternatives}
+
+
+def batch(params, inputs, ctx):
+    """Score many weight scenarios; returns each one's `top` best alternatives"""
+    X = _values(inputs)
+    W = np.asarray(params['scenarios'], dtype=float)
+    top = min(params['top'], len(X))
+    results = []
+    for _, S in _score_chunks(X, W, ctx, 'scoring'):
+        best = np.argsort(-S, axis=1, kind='stable')[:, :top]
+        for scores, rows in zip(S, best):
+            results.append([{**_alternative(inputs, row), "Score": float(scores[row])} for row in rows])
+    return {"scenarios": results}
+
+
+def export(params, inputs, ctx):
+    """Write the full ranking for one weight vector to a csv/ndjson/parquet file"""
+    from export_service import CHUNK_ROWS, iter_export, rank_order
+
+    X = _values(inputs)
+    res = topsis(X, params['weights'])
+    columns = {**inputs, **dict(zip(VALUE_COLUMNS, X.T)), 'Score': res['scores'], 'Rank': res['ranks'],
+               'D_pos': res['d_pos'], 'D_neg': res['d_neg']}
+    columns = {name: columns[name] for name in params['columns']}
+
+    name = f"hasil_topsis.{params['format']}"
+    parts = -(-len(X) // CHUNK_ROWS) + 1  # chunks plus the closing write
+    with open(ctx.path(name), 'wb') as f:
+        for i, part in enumerate(iter_export(columns, rank_order(res['ranks'], res['scores']), params['format'])):
+            f.write(part)
+            ctx.progress(min(i + 1, parts), parts, 'writing')
+    ctx.progress(parts, parts, 'written')
+    return {"file": name, "format": params['format'], "rows": len(X)}
+
+
+JOB_KINDS = {'sweep': sweep, 'smaa': smaa, 'batch': batch, 'export': export}
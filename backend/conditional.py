@@ -0,0 +1,51 @@
+"""Strong ETags and If-None-Match handling for cacheable responses.
+
+An ETag is derived from what a response depends on (a dataset content
+hash, the history version, the request parameters) rather than from its
+body, so a matching conditional request is answered with 304 Not
+Modified before anything is loaded or serialized. Responses carry
+`Cache-Control: no-cache`, which lets browsers keep the body but makes
+them revalidate it on every use.
+"""
+import hashlib
+import json
+
+from fastapi import Response
+
+CACHE_CONTROL = 'no-cache'
+
+
+def make_etag(*parts):
+    """Strong ETag of JSON-serializable `parts`"""
+    payload = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+    return '"' + hashlib.sha256(payload.encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match, etag):
+    """Whether an If-None-Match header value matches `etag`.
+
+    If-None-Match uses the weak comparison, so a W/ prefix the client (or
+    a proxy) added is ignored.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*':
+            return True
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def validator_headers(etag):
+    return {'ETag': etag, 'Cache-Control': CACHE_CONTROL}
+
+
+def not_modified(request, etag):
+    """A 304 response if the request already holds `etag`, else None"""
+    if etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=304, headers=validator_headers(etag))
+    return None
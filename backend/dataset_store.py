@@ -0,0 +1,334 @@
+"""Versioned vendor catalog with structural sharing.
+
+Every change to the catalog creates a new integer dataset version.
+Rows are immutable and content-addressed: a version is an ordered list
+of row ids, so rows that did not change are shared by every version
+containing them. The row position gives the vendor's No.
+
+On disk the store is a delta log (dataset_versions.jsonl): each
+distinct row is written once, and each version records only its edits
+against the previous one:
+
+    {"op": "row", "id": 7, "data": ["Hetzner", "CPX31", 2, 3, 1, 1]}
+    {"op": "version", "version": 3, "timestamp": "...", "source": "api:add",
+     "edits": [["s", 4, [7]], ["i", 20, [8]], ["d", 2, 1]]}
+
+In memory every CHECKPOINT_EVERY-th version keeps its full row-id
+list; any other version is rebuilt from the nearest earlier checkpoint
+and kept in a small LRU, so looking up a past snapshot is cheap.
+
+Several processes (uvicorn workers) can share one log. Commits take an
+exclusive lock on `<log>.lock`, first read whatever other processes
+appended, and then publish the new head version to `<log>.head`. Every
+read path stats that head file and tails the log when it moved, so a
+vendor edit in one worker is the current version in all of them on
+their next request. Version records carry the workbook's stat, so the
+other workers also skip re-parsing a workbook that was already
+committed.
+"""
+import difflib
+import hashlib
+import json
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, run a single worker
+    fcntl = None
+
+ROW_FIELDS = ['Vendor', 'Nama Paket (Plan)', 'CPU_Level', 'RAM_Level', 'DiskIO_Level', 'Price_Level']
+TEXT_FIELDS = 2
+CHECKPOINT_EVERY = 32
+SNAPSHOT_CACHE_SIZE = int(os.environ.get('DATASET_SNAPSHOT_CACHE', '16'))
+
+
+def _apply(order, edits):
+    """Apply range edits to a row-id array in place"""
+    for edit in edits:
+        kind, pos = edit[0], edit[1]
+        if kind == 'd':
+            del order[pos:pos + edit[2]]
+        elif kind == 'i':
+            order[pos:pos] = array('q', edit[2])
+        elif kind == 's':
+            order[pos:pos + len(edit[2])] = array('q', edit[2])
+        else:
+            raise ValueError(f"Unknown dataset edit {kind!r}")
+    return order
+
+
+def _diff(old, new):
+    """Range edits turning row-id list `old` into `new` (applied in order)"""
+    # Single-row API edits touch one spot: trim the common prefix and suffix
+    # so the (quadratic worst case) matcher only sees the changed middle
+    start = 0
+    limit = min(len(old), len(new))
+    while start < limit and old[start] == new[start]:
+        start += 1
+    end = 0
+    while end < limit - start and old[len(old) - 1 - end] == new[len(new) - 1 - end]:
+        end += 1
+    old_mid, new_mid = old[start:len(old) - end], new[start:len(new) - end]
+
+    edits = []
+    matcher = difflib.SequenceMatcher(None, old_mid, new_mid, autojunk=False)
+    # Back to front, so earlier positions are still valid when applied
+    for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+        if tag == 'equal':
+            continue
+        i1, i2, j1, j2 = i1 + start, i2 + start, j1 + start, j2 + start
+        if tag == 'replace' and i2 - i1 == j2 - j1:
+            edits.append(['s', i1, list(new[j1:j2])])
+            continue
+        if i2 > i1:
+            edits.append(['d', i1, i2 - i1])
+        if j2 > j1:
+            edits.append(['i', i1, list(new[j1:j2])])
+    return edits
+
+
+def _encode(record):
+    return (json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+
+class DatasetStore:
+    """Copy-on-write row store plus delta log; versions are 1, 2, 3, ..."""
+
+    def __init__(self, path):
+        self.path = path
+        self.head_path = path + '.head'
+        self.lock_path = path + '.lock'
+        self._lock = threading.RLock()
+        self._lock_file = None
+        self._lock_depth = 0
+        self._rows = []          # row id -> row tuple
+        self._row_ids = {}       # row tuple -> row id
+        self._edits = {}         # version -> edits against version - 1
+        self._info = {}          # version -> {"timestamp", "source", "rows"}
+        self._checkpoints = {0: array('q')}
+        self._cache = OrderedDict()
+        self._hashes = {}        # version -> content hash
+        self._file_stat = None
+        self._head_stat = None
+        self._log_end = 0        # bytes of the log applied so far
+        self.head = 0
+        self._head_order = array('q')
+        with self._lock, self._exclusive():
+            self._head_stat = _stat(self.head_path)
+            self._tail()
+            # Only a write that never completed can leave a partial line here
+            if os.path.exists(self.path) and os.path.getsize(self.path) != self._log_end:
+                with open(self.path, 'ab') as f:
+                    f.truncate(self._log_end)
+        self._writer = open(path, 'ab')
+
+    # ---------- persistence ----------
+
+    @contextmanager
+    def _exclusive(self):
+        """Hold the log's cross-process lock; re-entrant, call with self._lock held"""
+        if self._lock_depth == 0 and fcntl is not None:
+            self._lock_file = open(self.lock_path, 'a')
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        self._lock_depth += 1
+        try:
+            yield
+        finally:
+            self._lock_depth -= 1
+            if self._lock_depth == 0 and self._lock_file is not None:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+                self._lock_file.close()
+                self._lock_file = None
+
+    @contextmanager
+    def exclusive(self):
+        """Serialize a read-modify-write of the catalog across threads and processes"""
+        with self._lock, self._exclusive():
+            yield
+
+    def _tail(self):
+        """Apply the records appended to the log since it was last read"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as f:
+            f.seek(self._log_end)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # torn write at the tail
+                self._log_end += len(line)
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record['op'] == 'row':
+                    self._register_row(tuple(record['data']), record['id'])
+                elif record['op'] == 'version':
+                    self._add_version(record['version'], record['edits'],
+                                      record.get('timestamp'), record.get('source'))
+                    if record.get('file_stat'):
+                        self._file_stat = tuple(record['file_stat'])
+
+    def refresh(self):
+        """Pick up versions committed by other processes; one stat() when there are none"""
+        stat = _stat(self.head_path)
+        with self._lock:
+            if stat != self._head_stat:
+                self._head_stat = stat
+                self._tail()
+            return self.head
+
+    def _register_row(self, row, row_id=None):
+        if row_id is None:
+            row_id = len(self._rows)
+        if row_id != len(self._rows):
+            raise ValueError(f"Dataset log out of order: row {row_id}")
+        self._rows.append(row)
+        self._row_ids[row] = row_id
+        return row_id
+
+    def _add_version(self, version, edits, timestamp, source):
+        if version != self.head + 1:
+            raise ValueError(f"Dataset log out of order: version {version} after {self.head}")
+        order = _apply(array('q', self._head_order), edits)
+        self._edits[version] = edits
+        self._info[version] = {"timestamp": timestamp, "source": source, "rows": len(order)}
+        if version % CHECKPOINT_EVERY == 0:
+            self._checkpoints[version] = order
+        self.head = version
+        self._head_order = order
+
+    # ---------- writes ----------
+
+    def commit(self, rows, source='api', file_stat=None):
+        """Record `rows` (sequences in ROW_FIELDS order) as the new head.
+
+        Returns the head version; no version is created when nothing changed.
+        `file_stat` is the stat of the workbook the rows were read from.
+        """
+        with self._lock, self._exclusive():
+            self._tail()
+            lines = []
+            order = []
+            for row in rows:
+                row = tuple(row)
+                row_id = self._row_ids.get(row)
+                if row_id is None:
+                    row_id = self._register_row(row)
+                    lines.append(_encode({'op': 'row', 'id': row_id, 'data': list(row)}))
+                order.append(row_id)
+
+            if order == self._head_order.tolist():
+                return self.head
+
+            edits = _diff(self._head_order.tolist(), order)
+            version = self.head + 1
+            timestamp = datetime.now().isoformat()
+            record = {'op': 'version', 'version': version, 'timestamp': timestamp, 'source': source, 'edits': edits}
+            if file_stat is not None:
+                record['file_stat'] = list(file_stat)
+            lines.append(_encode(record))
+            data = b''.join(lines)
+            if os.fstat(self._writer.fileno()).st_size != self._log_end:
+                # A process died mid-commit; the partial line would swallow this one
+                self._writer.truncate(self._log_end)
+            self._writer.write(data)
+            self._writer.flush()
+            self._log_end += len(data)
+            self._add_version(version, edits, timestamp, source)
+            self._publish_head()
+            return version
+
+    def _publish_head(self):
+        tmp_path = self.head_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(f"{self.head}\n")
+        os.replace(tmp_path, self.head_path)
+        self._head_stat = _stat(self.head_path)
+
+    def sync(self, data_file, reader, source='file'):
+        """Commit the contents of `data_file` if it changed since the last sync.
+
+        `reader(path)` returns rows in ROW_FIELDS order. The file's size and
+        mtime are compared first, so an unchanged file costs one stat().
+        """
+        st = os.stat(data_file)
+        stat = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            self.refresh()
+            if stat == self._file_stat:
+                return self.head
+            with self._exclusive():
+                # Another worker may have committed this very file meanwhile
+                self._tail()
+                if stat == self._file_stat:
+                    return self.head
+                version = self.commit(reader(data_file), source, file_stat=stat)
+            self._file_stat = stat
+            return version
+
+    # ---------- reads ----------
+
+    def versions(self):
+        self.refresh()
+        with self._lock:
+            return [{"version": v, **info} for v, info in self._info.items()]
+
+    def snapshot(self, version):
+        """Row tuples of `version` (KeyError for an unknown version)"""
+        with self._lock:
+            return [self._rows[row_id] for row_id in self._order(version)]
+
+    def content_hash(self, version):
+        """SHA-256 of a version's rows: equal data hashes equal in any store or process"""
+        with self._lock:
+            digest = self._hashes.get(version)
+            if digest is None:
+                rows = json.dumps(self.snapshot(version), ensure_ascii=False, separators=(',', ':'))
+                digest = self._hashes[version] = hashlib.sha256(rows.encode('utf-8')).hexdigest()
+            return digest
+
+    def _order(self, version):
+        if version > self.head:
+            self.refresh()  # possibly committed by another worker
+        if version == self.head:
+            return self._head_order
+        if version not in self._info and version != 0:
+            raise KeyError(f"Unknown dataset version {version}")
+        if version in self._cache:
+            self._cache.move_to_end(version)
+            return self._cache[version]
+        base = version - version % CHECKPOINT_EVERY
+        order = array('q', self._checkpoints[base])
+        for v in range(base + 1, version + 1):
+            _apply(order, self._edits[v])
+        self._cache[version] = order
+        if len(self._cache) > SNAPSHOT_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return order
+
+    def columns(self, version):
+        """Column arrays of a version: No (1-based position), text as object, levels as int64"""
+        rows = self.snapshot(version)
+        columns = {'No': np.arange(1, len(rows) + 1, dtype=np.int64)}
+        fields = list(zip(*rows)) if rows else [()] * len(ROW_FIELDS)
+        for i, (name, values) in enumerate(zip(ROW_FIELDS, fields)):
+            columns[name] = np.array(values, dtype=object if i < TEXT_FIELDS else np.int64)
+        return columns
+
+    def close(self):
+        self._writer.close()
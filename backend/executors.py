@@ -0,0 +1,75 @@
+"""Sized executors for the blocking parts of async routes.
+
+Routes are `async def`; what blocks runs on a pool per kind of work so
+that each has its own limit:
+
+- "io": dataset workbook reads and writes, history/dataset log access
+  (IO_WORKERS threads).
+- "cpu": pandas/NumPy scoring and response building (CPU_WORKERS
+  threads; NumPy releases the GIL in its kernels).
+- "report": building export workbooks (REPORT_WORKERS threads).
+  openpyxl serialization is pure Python and holds the GIL, so these
+  are kept to one thread by default: a burst of exports then queues
+  behind itself instead of taking the interpreter from /api/calculate.
+"""
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+IO_WORKERS = int(os.environ.get('IO_WORKERS', '4'))
+CPU_WORKERS = int(os.environ.get('CPU_WORKERS', str(min(4, os.cpu_count() or 2))))
+REPORT_WORKERS = int(os.environ.get('REPORT_WORKERS', '1'))
+
+_SIZES = {'io': IO_WORKERS, 'cpu': CPU_WORKERS, 'report': REPORT_WORKERS}
+_executors = {}
+_lock = threading.Lock()
+
+
+def get_executor(kind):
+    """The shared pool for `kind` ("io", "cpu" or "report"), created on first use"""
+    executor = _executors.get(kind)
+    if executor is None:
+        with _lock:
+            executor = _executors.get(kind)
+            if executor is None:
+                executor = _executors[kind] = ThreadPoolExecutor(
+                    max_workers=_SIZES[kind], thread_name_prefix=f'{kind}-pool')
+    return executor
+
+
+async def run_in(kind, fn, *args, **kwargs):
+    """Await fn(*args, **kwargs) on the `kind` pool, keeping the caller's context"""
+    call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(get_executor(kind), call)
+
+
+async def run_io(fn, *args, **kwargs):
+    return await run_in('io', fn, *args, **kwargs)
+
+
+async def run_cpu(fn, *args, **kwargs):
+    return await run_in('cpu', fn, *args, **kwargs)
+
+
+def offload(kind):
+    """Turn a blocking route function into an async one that runs on the `kind` pool.
+
+    The wrapper keeps the original signature, so FastAPI still sees the
+    same parameters and dependencies.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        async def route(*args, **kwargs):
+            return await run_in(kind, fn, *args, **kwargs)
+        return route
+    return decorate
+
+
+def shutdown():
+    with _lock:
+        for executor in _executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        _executors.clear()
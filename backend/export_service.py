@@ -0,0 +1,124 @@
+"""Streaming export of ranked TOPSIS results.
+
+Rows are emitted in rank order, one chunk at a time, straight from the
+column arrays: no sorted copy of the full table and no full output
+buffer is ever built. Each generator yields encoded bytes so it can feed
+a StreamingResponse or a file.
+"""
+import csv
+import importlib.util
+import io
+import json
+
+import numpy as np
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+CHUNK_ROWS = 10000
+
+
+def rank_order(ranks, scores=None):
+    """Row indices in output order: by rank, ties broken by score then position"""
+    if scores is None:
+        return np.argsort(np.asarray(ranks), kind='stable')
+    return np.lexsort((-np.asarray(scores), np.asarray(ranks)))
+
+
+def _chunks(columns, order, chunk_rows):
+    """Yield {name: ndarray} slices of the columns, following `order`"""
+    for start in range(0, len(order), chunk_rows):
+        idx = order[start:start + chunk_rows]
+        yield {name: values[idx] for name, values in columns.items()}
+
+
+def _rows(chunk):
+    return zip(*(values.tolist() for values in chunk.values()))
+
+
+def iter_csv(columns, order, chunk_rows=CHUNK_ROWS):
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator='\n')
+    writer.writerow(list(columns))
+    yield buf.getvalue().encode('utf-8')
+
+    for chunk in _chunks(columns, order, chunk_rows):
+        buf.seek(0)
+        buf.truncate()
+        writer.writerows(_rows(chunk))
+        yield buf.getvalue().encode('utf-8')
+
+
+def iter_ndjson(columns, order, chunk_rows=CHUNK_ROWS):
+    names = list(columns)
+    for chunk in _chunks(columns, order, chunk_rows):
+        lines = (json.dumps(dict(zip(names, row)), ensure_ascii=False) for row in _rows(chunk))
+        yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back to a generator"""
+
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.parts.append(bytes(b))
+        self.position += len(b)
+        return len(b)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = b''.join(self.parts)
+        self.parts.clear()
+        return data
+
+
+def iter_parquet(columns, order, chunk_rows=CHUNK_ROWS):
+    """One Parquet row group per chunk (requires pyarrow)"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _ChunkSink()
+    writer = None
+    for chunk in _chunks(columns, order, chunk_rows):
+        if writer is None:
+            table = pa.table(chunk)
+            writer = pq.ParquetWriter(sink, table.schema)
+        else:
+            table = pa.table(chunk, schema=writer.schema)
+        writer.write_table(table, row_group_size=chunk_rows)
+        yield sink.drain()
+    if writer is None:
+        writer = pq.ParquetWriter(sink, pa.table({name: values[:0] for name, values in columns.items()}).schema)
+    writer.close()
+    yield sink.drain()
+
+
+_WRITERS = {'csv': iter_csv, 'ndjson': iter_ndjson, 'parquet': iter_parquet}
+
+
+def iter_export(columns, order, fmt, chunk_rows=CHUNK_ROWS):
+    """Stream `columns` (ordered name -> array) in `order` as csv/ndjson/parquet bytes"""
+    if fmt not in _WRITERS:
+        raise ValueError(f"Unsupported export format '{fmt}', expected one of: {', '.join(_WRITERS)}")
+    # Checked here, not inside the generator, so callers fail before any byte is sent
+    if fmt == 'parquet' and importlib.util.find_spec('pyarrow') is None:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+    columns = {name: np.asarray(values) for name, values in columns.items()}
+    return _WRITERS[fmt](columns, np.asarray(order), chunk_rows)
+
+
+def write_export(path, columns, order, fmt, chunk_rows=CHUNK_ROWS):
+    """Stream an export straight to a file"""
+    with open(path, 'wb') as f:
+        for part in iter_export(columns, order, fmt, chunk_rows):
+            f.write(part)
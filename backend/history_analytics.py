@@ -0,0 +1,144 @@
+"""Rolling aggregates over the calculation history.
+
+Kept up to date as entries are saved and deleted, so the dashboard's
+trend numbers (vendor win counts, top-score statistics, average weights
+per day and per ISO week) are read without scanning the history.
+
+Every aggregate is a count, a sum or a sum of squares, which makes
+removing a deleted entry as cheap as adding it.
+"""
+from datetime import datetime
+
+WEIGHT_KEYS = ('cpu', 'ram', 'disk', 'price')
+PERIODS = ('day', 'week')
+
+
+def features(entry):
+    """The parts of an entry the aggregates use, or None if it has no usable timestamp"""
+    try:
+        t = datetime.fromisoformat(entry['timestamp'])
+    except (KeyError, TypeError, ValueError):
+        return None
+    year, week, _ = t.isocalendar()
+    weights = entry.get('weights') or {}
+    return (
+        t.date().isoformat(),
+        f"{year}-W{week:02d}",
+        entry.get('top_vendor'),
+        float(entry.get('top_score') or 0.0),
+        tuple(float(weights.get(k, 0.0)) for k in WEIGHT_KEYS),
+    )
+
+
+class _Stats:
+    """Count, sum and sum of squares of a series (mean and std derived)"""
+
+    __slots__ = ('count', 'total', 'total_sq')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def add(self, value, sign=1):
+        self.count += sign
+        self.total += sign * value
+        self.total_sq += sign * value * value
+
+    def summary(self):
+        if not self.count:
+            return {"count": 0, "mean": None, "std": None}
+        mean = self.total / self.count
+        variance = max(self.total_sq / self.count - mean * mean, 0.0)
+        return {"count": self.count, "mean": mean, "std": variance ** 0.5}
+
+
+class _Bucket:
+    """Aggregates for one day or week"""
+
+    __slots__ = ('score', 'weights', 'winners')
+
+    def __init__(self):
+        self.score = _Stats()
+        self.weights = [0.0] * len(WEIGHT_KEYS)
+        self.winners = {}
+
+    def add(self, vendor, score, weights, sign):
+        self.score.add(score, sign)
+        for i, w in enumerate(weights):
+            self.weights[i] += sign * w
+        if vendor:
+            self.winners[vendor] = self.winners.get(vendor, 0) + sign
+            if not self.winners[vendor]:
+                del self.winners[vendor]
+
+    def summary(self, period):
+        count = self.score.count
+        top = max(self.winners.items(), key=lambda item: (item[1], item[0]), default=(None, 0))
+        return {
+            "period": period,
+            "count": count,
+            "top_score": self.score.summary(),
+            "weights_mean": {k: w / count for k, w in zip(WEIGHT_KEYS, self.weights)},
+            "top_vendor": top[0],
+            "top_vendor_wins": top[1],
+        }
+
+
+class HistoryAnalytics:
+    """Per-vendor win statistics and per-day / per-week buckets"""
+
+    def __init__(self):
+        self.count = 0
+        self.vendors = {}                        # top_vendor -> _Stats of its winning scores
+        self.buckets = {p: {} for p in PERIODS}  # period -> key -> _Bucket
+
+    def add(self, feats, sign=1):
+        """Apply the features of one entry (sign=-1 removes it)"""
+        if feats is None:
+            return
+        day, week, vendor, score, weights = feats
+        self.count += sign
+        if vendor:
+            stats = self.vendors.get(vendor)
+            if stats is None:
+                stats = self.vendors[vendor] = _Stats()
+            stats.add(score, sign)
+            if not stats.count:
+                del self.vendors[vendor]
+        for period, key in zip(PERIODS, (day, week)):
+            buckets = self.buckets[period]
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = _Bucket()
+            bucket.add(vendor, score, weights, sign)
+            if not bucket.score.count:
+                del buckets[key]
+
+    def remove(self, feats):
+        self.add(feats, sign=-1)
+
+    def summary(self, period='day', limit=None):
+        """Aggregates as plain dicts; `limit` keeps only the latest periods"""
+        vendors = sorted(
+            ({"vendor": vendor, "wins": stats.count, "win_share": stats.count / self.count,
+              "score": stats.summary()} for vendor, stats in self.vendors.items()),
+            key=lambda v: (-v["wins"], v["vendor"]))
+
+        keys = sorted(self.buckets[period])
+        if limit is not None:
+            keys = keys[-limit:]
+        series = [self.buckets[period][key].summary(key) for key in keys]
+
+        weight_drift = None
+        if len(series) >= 2:
+            latest, previous = series[-1]["weights_mean"], series[-2]["weights_mean"]
+            weight_drift = {k: latest[k] - previous[k] for k in WEIGHT_KEYS}
+
+        return {
+            "total_entries": self.count,
+            "vendors": vendors,
+            "period": period,
+            "series": series,
+            "weight_drift": weight_drift,
+        }
@@ -0,0 +1,587 @@
+"""Append-only calculation history log.
+
+Entries are stored one JSON record per line in a JSONL file:
+
+    {"op": "meta", "next_id": 42}           first line after a rewrite
+    {"op": "put", "entry": {"id": 41, ...}} a saved calculation
+    {"op": "del", "id": 17}                 tombstone for a deleted entry
+
+Saving appends a single line and deleting appends a tombstone, so both
+cost O(1) I/O regardless of history size. An in-memory offset index
+(three parallel arrays sorted by id) locates each entry's line for
+random reads. Once enough of the file is dead (deleted entries and
+tombstones), a background thread rewrites it with only the live
+entries while appends continue.
+
+Secondary indexes (timestamp, tags, top vendor and weight bucket) are
+kept in memory, keyed by id, and rebuilt from the log on open; `query`
+uses them for filtered, cursor-paginated reads. Rolling analytics (see
+history_analytics) are maintained the same way.
+
+Several processes (uvicorn workers) can share one log, with the same
+scheme as dataset_store: writes take an exclusive lock on `<log>.lock`,
+first apply whatever other processes appended (or reload the log when
+another process rewrote it), then assign the next id and publish
+`<log>.head`. Reads stat that head file and catch up when it moved.
+Compaction swaps the file under the same lock.
+"""
+import json
+import os
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from datetime import datetime
+
+from history_analytics import WEIGHT_KEYS, HistoryAnalytics, features
+
+COMPACT_MIN_DEAD_BYTES = int(os.environ.get('HISTORY_COMPACT_MIN_BYTES', str(1 << 20)))
+COMPACT_DEAD_RATIO = 0.5
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, run a single worker
+    fcntl = None
+
+WEIGHT_BUCKET = 0.05
+_EMPTY = array('q')
+
+
+def _pread(f, length, offset):
+    if hasattr(os, 'pread'):
+        return os.pread(f.fileno(), length, offset)
+    f.seek(offset)
+    return f.read(length)
+
+
+def _mix(entry_id):
+    """64-bit hash of an id (splitmix64 finalizer), for the live-set digest"""
+    z = (entry_id + 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+    return z ^ (z >> 31)
+
+
+def _encode(record):
+    return (json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def _scan(f, start=0):
+    """Yield (offset, line, record) for every complete line from `start`"""
+    f.seek(start)
+    offset = start
+    for line in f:
+        if not line.endswith(b'\n'):
+            break  # torn write at the tail; ignored until overwritten
+        if line.strip():
+            yield offset, line, json.loads(line)
+        offset += len(line)
+
+
+class _Index:
+    """Offset index: ids ascending, with the byte range of each entry's line"""
+
+    def __init__(self):
+        self.ids = array('q')
+        self.offsets = array('q')
+        self.lengths = array('l')  # 0 = deleted
+        self.live = 0
+        self.live_bytes = 0
+        self.dead_bytes = 0
+        self.next_id = 1
+        # XOR of _mix(id) over live entries: entries never change once written,
+        # so this with next_id identifies the history's content
+        self.digest = 0
+
+    def position(self, entry_id):
+        pos = bisect_left(self.ids, entry_id)
+        if pos < len(self.ids) and self.ids[pos] == entry_id and self.lengths[pos]:
+            return pos
+        return None
+
+    def apply(self, offset, length, record):
+        op = record.get('op')
+        if op == 'put':
+            entry_id = record['entry']['id']
+            if self.ids and entry_id <= self.ids[-1]:
+                raise ValueError(f"History log out of order at byte {offset}: id {entry_id}")
+            self.ids.append(entry_id)
+            self.offsets.append(offset)
+            self.lengths.append(length)
+            self.live += 1
+            self.live_bytes += length
+            self.next_id = max(self.next_id, entry_id + 1)
+            self.digest ^= _mix(entry_id)
+        elif op == 'del':
+            self.dead_bytes += length
+            pos = self.position(record['id'])
+            if pos is not None:
+                self.live -= 1
+                self.live_bytes -= self.lengths[pos]
+                self.dead_bytes += self.lengths[pos]
+                self.lengths[pos] = 0
+                self.digest ^= _mix(record['id'])
+        elif op == 'meta':
+            self.next_id = max(self.next_id, int(record.get('next_id', 1)))
+
+
+def parse_timestamp(value):
+    """ISO 8601 timestamp (as stored in entries) to epoch seconds"""
+    return datetime.fromisoformat(value).timestamp()
+
+
+def weight_bucket(weights):
+    """Bucket a weights dict (or cpu/ram/disk/price sequence) in WEIGHT_BUCKET steps"""
+    if isinstance(weights, dict):
+        weights = [weights.get(k, 0) for k in WEIGHT_KEYS]
+    return tuple(int(round(float(w) / WEIGHT_BUCKET)) for w in weights)
+
+
+def _contains(ids, entry_id):
+    pos = bisect_left(ids, entry_id)
+    return pos < len(ids) and ids[pos] == entry_id
+
+
+class _SecondaryIndex:
+    """Id postings per tag / vendor / weight bucket, plus timestamps by id.
+
+    Postings only grow (deleted ids are filtered against the offset index
+    at query time); they are ascending because ids are assigned in order.
+    """
+
+    def __init__(self):
+        self.ids = array('q')
+        self.times = array('d')
+        self.times_sorted = True
+        self.tags = {}
+        self.vendors = {}
+        self.weights = {}
+
+    @staticmethod
+    def _post(postings, key, entry_id):
+        ids = postings.get(key)
+        if ids is None:
+            ids = postings[key] = array('q')
+        ids.append(entry_id)
+
+    def add(self, entry):
+        entry_id = entry['id']
+        try:
+            t = parse_timestamp(entry['timestamp'])
+        except (KeyError, TypeError, ValueError):
+            t = 0.0
+        if self.times and t < self.times[-1]:
+            self.times_sorted = False
+        self.ids.append(entry_id)
+        self.times.append(t)
+        for tag in set(entry.get('tags') or []):
+            self._post(self.tags, str(tag).lower(), entry_id)
+        if entry.get('top_vendor'):
+            self._post(self.vendors, str(entry['top_vendor']).lower(), entry_id)
+        if entry.get('weights'):
+            self._post(self.weights, weight_bucket(entry['weights']), entry_id)
+
+    def time_of(self, entry_id):
+        return self.times[bisect_left(self.ids, entry_id)]
+
+
+class HistoryStore:
+    """Calculation history backed by an append-only JSONL log"""
+
+    def __init__(self, path, legacy_path=None):
+        self.path = path
+        self.head_path = path + '.head'
+        self.lock_path = path + '.lock'
+        self._lock = threading.RLock()
+        self._lock_file = None
+        self._lock_depth = 0
+        self._compacting = False
+        self._generation = 0
+        self._writer = self._reader = None
+
+        with self._lock, self._exclusive():
+            if not os.path.exists(path):
+                self._create(path, self._legacy_entries(legacy_path))
+            self._head_stat = _stat(self.head_path)
+            self._load()
+            if self._writer.tell() != self._log_end:
+                # Drop a torn last line so the next append starts on a fresh line
+                self._writer.truncate(self._log_end)
+
+    # ---------- setup ----------
+
+    @staticmethod
+    def _legacy_entries(legacy_path):
+        """Entries from the old calculation_history.json (newest first) to migrate"""
+        if not legacy_path or not os.path.exists(legacy_path):
+            return []
+        with open(legacy_path, 'r', encoding='utf-8') as f:
+            history = json.load(f)
+        # Old ids were len+1 and could repeat; keep them when they are unique
+        ids = [h.get('id') for h in history]
+        if len(set(ids)) != len(ids) or not all(isinstance(i, int) for i in ids):
+            for new_id, entry in enumerate(reversed(history), 1):
+                entry['id'] = new_id
+        return sorted(history, key=lambda h: h['id'])
+
+    @staticmethod
+    def _create(path, entries, next_id=1):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            last = entries[-1]['id'] if entries else 0
+            f.write(_encode({'op': 'meta', 'next_id': max(next_id, last + 1)}))
+            for entry in entries:
+                f.write(_encode({'op': 'put', 'entry': entry}))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _load(self):
+        """(Re)build every index from the log file currently at `path`"""
+        index = _Index()
+        secondary = _SecondaryIndex()
+        live = {}  # id -> analytics features, for entries not (yet) deleted
+        end = 0  # end of the last complete line; a torn tail is not counted
+        with open(self.path, 'rb') as f:
+            ino = os.fstat(f.fileno()).st_ino
+            for offset, line, record in _scan(f):
+                end = offset + len(line)
+                index.apply(offset, len(line), record)
+                if record.get('op') == 'put':
+                    secondary.add(record['entry'])
+                    live[record['entry']['id']] = features(record['entry'])
+                elif record.get('op') == 'del':
+                    live.pop(record['id'], None)
+        analytics = HistoryAnalytics()
+        for feats in live.values():
+            analytics.add(feats)
+        self._index, self._secondary, self._analytics = index, secondary, analytics
+        self._reopen(ino, end)
+
+    def _reopen(self, ino, end):
+        if self._writer is not None:
+            self._writer.close()
+        self._writer = open(self.path, 'ab')
+        # Readers still holding the previous file object keep reading the old inode
+        self._reader = open(self.path, 'rb')
+        self._ino = ino
+        self._log_end = end
+        self._generation += 1
+
+    # ---------- cross-process coordination ----------
+
+    @contextmanager
+    def _exclusive(self):
+        """Hold the log's cross-process lock; re-entrant, call with self._lock held"""
+        if self._lock_depth == 0 and fcntl is not None:
+            self._lock_file = open(self.lock_path, 'a')
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        self._lock_depth += 1
+        try:
+            yield
+        finally:
+            self._lock_depth -= 1
+            if self._lock_depth == 0 and self._lock_file is not None:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+                self._lock_file.close()
+                self._lock_file = None
+
+    def _catch_up(self):
+        """Apply what other processes wrote since the log was last read (call with self._lock held)"""
+        try:
+            ino = os.stat(self.path).st_ino
+        except FileNotFoundError:
+            return  # between another process's unlink and replace; it publishes the head next
+        if ino != self._ino:
+            self._load()  # cleared or compacted elsewhere
+            return
+        for offset, line, record in _scan(self._reader, self._log_end):
+            self._apply(offset, len(line), record)
+            self._log_end = offset + len(line)
+
+    def _apply(self, offset, length, record):
+        """Apply one log record to the offset, secondary and analytics indexes"""
+        op = record.get('op')
+        if op == 'del':
+            entry = self._read(record['id'])
+            if entry is not None:
+                self._analytics.remove(features(entry))
+        self._index.apply(offset, length, record)
+        if op == 'put':
+            self._secondary.add(record['entry'])
+            self._analytics.add(features(record['entry']))
+
+    def _write(self, record):
+        """Append a record at the end of the log (call with both locks held, after _catch_up)"""
+        line = _encode(record)
+        offset = self._log_end
+        if os.fstat(self._writer.fileno()).st_size != offset:
+            # A process died mid-append; the partial line would swallow this one
+            self._writer.truncate(offset)
+        self._writer.write(line)
+        self._writer.flush()
+        self._log_end += len(line)
+        self._apply(offset, len(line), record)
+        self._publish_head()
+
+    def _publish_head(self):
+        tmp_path = f"{self.head_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(f"{self._version()}\n")
+        os.replace(tmp_path, self.head_path)
+        self._head_stat = _stat(self.head_path)
+
+    def refresh(self):
+        """Pick up entries written by other processes; one stat() when there are none"""
+        stat = _stat(self.head_path)
+        with self._lock:
+            if stat != self._head_stat:
+                self._head_stat = stat
+                self._catch_up()
+
+    # ---------- writes ----------
+
+    def append(self, entry):
+        """Assign the next id to `entry`, append it and return the id"""
+        with self._lock, self._exclusive():
+            self._catch_up()
+            entry = {'id': self._index.next_id, **{k: v for k, v in entry.items() if k != 'id'}}
+            self._write({'op': 'put', 'entry': entry})
+            return entry['id']
+
+    def delete(self, entry_id):
+        """Tombstone an entry; returns False if it does not exist"""
+        with self._lock, self._exclusive():
+            self._catch_up()
+            if self._index.position(entry_id) is None:
+                return False
+            self._write({'op': 'del', 'id': entry_id})
+            compact = self._should_compact()
+        if compact:
+            self.compact_in_background()
+        return True
+
+    def clear(self):
+        """Remove every entry (ids keep increasing afterwards)"""
+        with self._lock, self._exclusive():
+            self._catch_up()
+            self._create(self.path, [], self._index.next_id)
+            self._load()
+            self._publish_head()
+
+    # ---------- reads ----------
+
+    def __len__(self):
+        self.refresh()
+        return self._index.live
+
+    def _version(self):
+        index = self._index
+        return f"{index.next_id}-{index.live}-{index.digest:016x}"
+
+    @property
+    def version(self):
+        """Token that changes whenever an entry is saved, deleted or cleared, by any process.
+
+        It is taken after catching up with the shared log (see refresh) and
+        only depends on which entries are live, so it survives restarts and
+        compaction, and every process sharing the log reports the same one.
+        """
+        self.refresh()
+        with self._lock:
+            return self._version()
+
+    def _read(self, entry_id):
+        pos = self._index.position(entry_id)
+        if pos is None:
+            return None
+        return json.loads(_pread(self._reader, self._index.lengths[pos], self._index.offsets[pos]))['entry']
+
+    def get(self, entry_id):
+        self.refresh()
+        with self._lock:
+            pos = self._index.position(entry_id)
+            if pos is None:
+                return None
+            reader, offset, length = self._reader, self._index.offsets[pos], self._index.lengths[pos]
+        return json.loads(_pread(reader, length, offset))['entry']
+
+    def analytics(self, period='day', limit=None):
+        """Rolling aggregates (see HistoryAnalytics.summary); no entries are read"""
+        self.refresh()
+        with self._lock:
+            return self._analytics.summary(period, limit)
+
+    def iter_entries(self, newest_first=True):
+        """Yield live entries; a snapshot of the index is taken up front"""
+        self.refresh()
+        with self._lock:
+            index, reader = self._index, self._reader
+            positions = [(index.offsets[i], index.lengths[i]) for i in range(len(index.ids)) if index.lengths[i]]
+        if newest_first:
+            positions.reverse()
+        for offset, length in positions:
+            yield json.loads(_pread(reader, length, offset))['entry']
+
+    def query(self, limit=None, cursor=None, since=None, until=None, tag=None, vendor=None,
+              weights=None, fields=None):
+        """Live entries newest first, filtered through the secondary indexes.
+
+        `cursor` is the id of the last entry of the previous page (only
+        older entries are returned); `since`/`until` are epoch seconds;
+        `weights` matches entries in the same weight bucket; `fields`
+        projects each entry onto those keys. Returns (entries, next_cursor),
+        next_cursor being None on the last page.
+        """
+        self.refresh()
+        with self._lock:
+            index, secondary, reader = self._index, self._secondary, self._reader
+
+            postings = []
+            if tag is not None:
+                postings.append(secondary.tags.get(tag.lower(), _EMPTY))
+            if vendor is not None:
+                postings.append(secondary.vendors.get(vendor.lower(), _EMPTY))
+            if weights is not None:
+                postings.append(secondary.weights.get(weight_bucket(weights), _EMPTY))
+
+            # Id window: below the cursor and, when timestamps follow id order,
+            # inside [since, until] (found by bisecting the timestamp column)
+            ids = secondary.ids
+            lo, hi = 0, bisect_left(ids, cursor) if cursor is not None else len(ids)
+            if secondary.times_sorted:
+                if since is not None:
+                    lo = bisect_left(secondary.times, since)
+                if until is not None:
+                    hi = min(hi, bisect_right(secondary.times, until))
+
+            if postings:
+                # Walk the shortest posting list, probe the others by binary search
+                postings.sort(key=len)
+                driver, others = postings[0], postings[1:]
+                if hi <= lo:
+                    d_lo = d_hi = 0
+                else:
+                    d_lo, d_hi = bisect_left(driver, ids[lo]), bisect_right(driver, ids[hi - 1])
+                candidates = (driver[i] for i in range(d_hi - 1, d_lo - 1, -1))
+            else:
+                others = []
+                candidates = (ids[i] for i in range(hi - 1, lo - 1, -1))
+
+            timed = since is not None or until is not None
+            found = []
+            for entry_id in candidates:
+                if others and not all(_contains(ids, entry_id) for ids in others):
+                    continue
+                if timed:
+                    t = secondary.time_of(entry_id)
+                    if until is not None and t > until:
+                        continue
+                    if since is not None and t < since:
+                        if secondary.times_sorted:
+                            break  # everything further down is older still
+                        continue
+                pos = index.position(entry_id)
+                if pos is None:
+                    continue
+                found.append((index.offsets[pos], index.lengths[pos]))
+                if limit is not None and len(found) > limit:
+                    break
+
+        more = limit is not None and len(found) > limit
+        if more:
+            found = found[:limit]
+        entries = [json.loads(_pread(reader, length, offset))['entry'] for offset, length in found]
+        next_cursor = entries[-1]['id'] if more and entries else None
+        if fields:
+            entries = [{k: e[k] for k in fields if k in e} for e in entries]
+        return entries, next_cursor
+
+    # ---------- compaction ----------
+
+    def _should_compact(self):
+        index = self._index
+        return (not self._compacting and index.dead_bytes >= COMPACT_MIN_DEAD_BYTES
+                and index.dead_bytes > index.live_bytes * COMPACT_DEAD_RATIO)
+
+    def compact_in_background(self):
+        with self._lock:
+            if self._compacting:
+                return None
+            self._compacting = True
+        thread = threading.Thread(target=self._compact_guarded, name='history-compaction', daemon=True)
+        thread.start()
+        return thread
+
+    def compact(self):
+        """Rewrite the log with only the live entries (blocking)"""
+        with self._lock:
+            if self._compacting:
+                return False
+            self._compacting = True
+        self._compact_guarded()
+        return True
+
+    def _compact_guarded(self):
+        try:
+            self._compact()
+        except Exception:
+            import traceback
+            traceback.print_exc()
+        finally:
+            with self._lock:
+                self._compacting = False
+
+    def _compact(self):
+        # Phase 1, unlocked: copy the live lines as of a snapshot. The log is
+        # append-only, so every byte before `snapshot_end` is immutable.
+        with self._lock:
+            generation = self._generation
+            index, reader = self._index, self._reader
+            snapshot_end = self._log_end
+            live = [(index.ids[i], index.offsets[i], index.lengths[i])
+                    for i in range(len(index.ids)) if index.lengths[i]]
+            next_id = index.next_id
+
+        tmp_path = f"{self.path}.{os.getpid()}.compact"
+        new_index = _Index()
+        try:
+            with open(tmp_path, 'wb') as out:
+                meta = _encode({'op': 'meta', 'next_id': next_id})
+                out.write(meta)
+                new_index.apply(0, len(meta), {'op': 'meta', 'next_id': next_id})
+                for entry_id, offset, length in live:
+                    new_offset = out.tell()
+                    out.write(_pread(reader, length, offset))
+                    new_index.apply(new_offset, length, {'op': 'put', 'entry': {'id': entry_id}})
+
+                # Phase 2, holding both locks so that no process appends to the
+                # old file: carry over whatever was appended meanwhile, then swap
+                with self._lock, self._exclusive():
+                    self._catch_up()
+                    if self._generation != generation:
+                        return  # cleared or compacted while copying; the copy is stale
+                    for _, line, record in _scan(self._reader, snapshot_end):
+                        # Tombstones are copied too: their targets may be in phase 1's copy
+                        new_index.apply(out.tell(), len(line), record)
+                        out.write(line)
+                    out.flush()
+                    os.fsync(out.fileno())
+                    end = out.tell()
+                    ino = os.fstat(out.fileno()).st_ino
+                    os.replace(tmp_path, self.path)
+                    self._index = new_index
+                    self._reopen(ino, end)
+                    # Other processes see the new inode on their next read and reload
+                    self._publish_head()
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
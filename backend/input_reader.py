@@ -0,0 +1,130 @@
+"""Fast reader for the '1. Input Level' sheet of TOPSIS_Input_Level.xlsx.
+
+The workbook stays the source of truth when teams edit it by hand, so
+it is re-read often. Instead of `pd.read_excel` (which loads styles and
+every sheet's metadata), only the input sheet is read: with
+python-calamine when it is installed, otherwise with openpyxl in
+streaming read-only mode. The header is validated once and the rows go
+straight into typed NumPy arrays.
+"""
+import importlib.util
+import time
+
+import numpy as np
+
+INPUT_SHEET = '1. Input Level'
+HEADER_ROW = 3
+COLUMNS = ['No', 'Vendor', 'Nama Paket (Plan)', 'CPU_Level', 'RAM_Level', 'DiskIO_Level', 'Price_Level']
+HEADER_VARIANTS = (
+    # Written back by the API (DataFrame.to_excel)
+    ('No', 'Vendor', 'Nama Paket (Plan)', 'CPU_Level', 'RAM_Level', 'DiskIO_Level', 'Price_Level'),
+    # Written by generate_excel.py / generate_excel_level.py
+    ('No', 'Vendor', 'Nama Paket', 'CPU Lvl', 'RAM Lvl', 'I/O Lvl', 'Harga Lvl'),
+)
+LEVEL_COLUMNS = COLUMNS[3:]
+
+
+class InputFormatError(ValueError):
+    """The workbook does not have the expected '1. Input Level' layout"""
+
+
+def available_engine():
+    return 'calamine' if importlib.util.find_spec('python_calamine') else 'openpyxl'
+
+
+def _rows_calamine(path):
+    from python_calamine import CalamineWorkbook
+
+    wb = CalamineWorkbook.from_path(path)
+    if INPUT_SHEET not in wb.sheet_names:
+        raise InputFormatError(f"Sheet '{INPUT_SHEET}' not found in {path}")
+    # By default calamine drops the leading empty rows and columns, which
+    # would shift the header off HEADER_ROW
+    for row in wb.get_sheet_by_name(INPUT_SHEET).to_python(skip_empty_area=False):
+        # calamine reports empty cells as ''
+        yield [None if value == '' else value for value in row]
+
+
+def _rows_openpyxl(path):
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        if INPUT_SHEET not in wb.sheetnames:
+            raise InputFormatError(f"Sheet '{INPUT_SHEET}' not found in {path}")
+        yield from wb[INPUT_SHEET].iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+def _check_header(row):
+    header = tuple(None if v is None else str(v).strip() for v in list(row)[:len(COLUMNS)])
+    if header not in HEADER_VARIANTS:
+        raise InputFormatError(
+            f"Unexpected header in '{INPUT_SHEET}' row {HEADER_ROW}: {list(header)}; "
+            f"expected {list(HEADER_VARIANTS[0])}")
+
+
+def _to_int(value, column, row_no):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise InputFormatError(f"'{INPUT_SHEET}' row {row_no}: {column} must be a number, got {value!r}")
+    if not number.is_integer():
+        raise InputFormatError(f"'{INPUT_SHEET}' row {row_no}: {column} must be a whole number, got {value!r}")
+    return int(number)
+
+
+def read_input_level(path, engine=None):
+    """Read the vendor levels from `path`.
+
+    Returns `(columns, stats)`: `columns` maps each name in COLUMNS to a
+    NumPy array (int64 for No and levels, object for text), and `stats`
+    holds the engine used, the row count and the load time in seconds.
+    Rows without a vendor name (notes under the table) are skipped, as
+    `dropna(subset=['Vendor'])` did before, and a missing or non-numeric
+    No is replaced by the row's position. Levels must be whole numbers.
+    """
+    engine = engine or available_engine()
+    reader = _rows_calamine if engine == 'calamine' else _rows_openpyxl
+    started = time.perf_counter()
+
+    numbers = {name: [] for name in ['No'] + LEVEL_COLUMNS}
+    vendors, plans = [], []
+    header_seen = False
+    for row_no, row in enumerate(reader(path), 1):
+        if row_no < HEADER_ROW:
+            continue
+        if row_no == HEADER_ROW:
+            _check_header(row)
+            header_seen = True
+            continue
+
+        row = list(row[:len(COLUMNS)]) + [None] * (len(COLUMNS) - len(row))
+        no, vendor, plan, *levels = row
+        if vendor is None or (isinstance(vendor, str) and not vendor.strip()):
+            continue
+        vendors.append(str(vendor))
+        plans.append(None if plan is None else str(plan))
+        # The catalog renumbers rows, so like the old pandas read a blank or
+        # hand-typed No does not stop the load; it takes the row's position
+        try:
+            numbers['No'].append(_to_int(no, 'No', row_no))
+        except InputFormatError:
+            numbers['No'].append(len(vendors))
+        for name, value in zip(LEVEL_COLUMNS, levels):
+            numbers[name].append(_to_int(value, name, row_no))
+
+    if not header_seen:
+        raise InputFormatError(f"'{INPUT_SHEET}' has no header row (expected on row {HEADER_ROW})")
+
+    columns = {
+        'No': np.array(numbers['No'], dtype=np.int64),
+        'Vendor': np.array(vendors, dtype=object),
+        'Nama Paket (Plan)': np.array(plans, dtype=object),
+    }
+    for name in LEVEL_COLUMNS:
+        columns[name] = np.array(numbers[name], dtype=np.int64)
+
+    stats = {'engine': engine, 'rows': len(vendors), 'seconds': time.perf_counter() - started}
+    return columns, stats
@@ -0,0 +1,299 @@
+"""Background jobs for analyses too long for one request.
+
+A job is submitted with a kind and JSON params and gets an id straight
+away; it runs in a process pool (JOB_WORKERS) and keeps its state in its
+own directory under JOB_DIR:
+
+- job.json       kind, params, state and timestamps (written by the API)
+- progress.json  {done, total, message}, written by the worker as it runs
+- cancel         created to ask a running job to stop
+- result.json    the job's result, plus any files it names
+- owner.lock     flock'ed by the API process that submitted the job for
+                 as long as the job is queued or running
+
+Workers and the API share nothing but those files, so no broker is
+needed, and every API process (uvicorn worker) reads the same job
+state: any of them can report, cancel or delete any job. A job still
+marked queued or running whose owner.lock can be taken has lost its
+owner (that process stopped) and is marked failed. Finished jobs are
+deleted JOB_RESULT_TTL seconds after they end.
+"""
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+JOB_DIR = os.environ.get('JOB_DIR', 'jobs')
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '1'))
+JOB_MAX_PENDING = int(os.environ.get('JOB_MAX_PENDING', '32'))
+JOB_RESULT_TTL = float(os.environ.get('JOB_RESULT_TTL', str(24 * 3600)))
+PROGRESS_INTERVAL = 0.25
+
+FINISHED = ('done', 'failed', 'cancelled')
+
+_JOB_ID = re.compile(r'[0-9a-f]{32}')
+
+try:
+    import fcntl
+except ImportError:  # Windows: jobs are only visible to the process that ran them
+    fcntl = None
+
+
+class JobCancelled(Exception):
+    """Raised inside a job once its cancellation was requested"""
+
+
+class QueueFull(Exception):
+    """Raised by submit() while JOB_MAX_PENDING jobs are queued or running"""
+
+
+def _write_json(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+class JobContext:
+    """What a job function gets in the worker: progress, cancellation and output paths"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._reported = 0.0
+
+    def path(self, name):
+        """Path of an output file in the job's directory"""
+        return os.path.join(self.directory, name)
+
+    def progress(self, done, total, message=None):
+        """Record progress (at most every PROGRESS_INTERVAL seconds); raises JobCancelled when asked to stop"""
+        if os.path.exists(self.path('cancel')):
+            raise JobCancelled()
+        now = time.monotonic()
+        if done >= total or now - self._reported >= PROGRESS_INTERVAL:
+            self._reported = now
+            _write_json(self.path('progress.json'), {"done": done, "total": total, "message": message})
+
+
+def _run(fn, directory, params, inputs):
+    """Worker entry point: run fn(params, inputs, ctx) and store its result"""
+    ctx = JobContext(directory)
+    ctx.progress(0, 1, 'started')
+    result = fn(params, inputs, ctx)
+    _write_json(ctx.path('result.json'), result)
+
+
+class JobQueue:
+    """Job registry (the job directories) plus this process's worker pool.
+
+    `kinds` maps a kind name to a picklable job function
+    fn(params, inputs, ctx) returning a JSON-serializable result.
+    `params` are stored with the job; `inputs` (e.g. dataset columns)
+    only go to the worker.
+    """
+
+    def __init__(self, kinds, directory=JOB_DIR, workers=JOB_WORKERS, max_pending=JOB_MAX_PENDING,
+                 ttl=JOB_RESULT_TTL):
+        self.kinds = kinds
+        self.directory = directory
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._futures = {}
+        self._owned = {}  # job id -> open owner.lock, held until the job finishes
+        # spawn, not fork: the API process has threads of its own
+        self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        os.makedirs(directory, exist_ok=True)
+        self.evict_expired()
+
+    def _dir(self, job_id):
+        return os.path.join(self.directory, job_id)
+
+    def _meta(self, job_id):
+        """job.json of a job, or None (also for anything that is not a job id)"""
+        if not _JOB_ID.fullmatch(job_id):
+            return None
+        return _read_json(os.path.join(self._dir(job_id), 'job.json'))
+
+    def _save(self, meta):
+        try:
+            _write_json(os.path.join(self._dir(meta['id']), 'job.json'), meta)
+        except FileNotFoundError:
+            pass  # deleted meanwhile
+
+    def _job_ids(self):
+        try:
+            return [name for name in os.listdir(self.directory) if _JOB_ID.fullmatch(name)]
+        except FileNotFoundError:
+            return []
+
+    # ---------- ownership ----------
+
+    def _take_ownership(self, job_id):
+        f = open(os.path.join(self._dir(job_id), 'owner.lock'), 'w')
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        self._owned[job_id] = f
+
+    def _release_ownership(self, job_id):
+        f = self._owned.pop(job_id, None)
+        if f is not None:
+            f.close()  # drops the flock
+
+    def _reconcile(self, meta):
+        """Mark an unfinished job failed if the process that owned it is gone"""
+        job_id = meta['id']
+        if meta['state'] in FINISHED or job_id in self._owned:
+            return meta
+        if fcntl is None:
+            orphaned, lock = True, None  # single process: jobs it does not own are from a previous run
+        else:
+            try:
+                lock = open(os.path.join(self._dir(job_id), 'owner.lock'), 'a')
+            except FileNotFoundError:
+                return meta  # deleted meanwhile
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                orphaned = True
+            except BlockingIOError:
+                orphaned = False  # the owner is still running it
+        try:
+            if orphaned:
+                # Re-read under the lock: the owner may have finished it just now
+                meta = self._meta(job_id) or meta
+                if meta['state'] not in FINISHED:
+                    meta.update(state='failed', error='Interrupted: the server process running it stopped',
+                                finished=time.time())
+                    self._save(meta)
+        finally:
+            if lock is not None:
+                lock.close()
+        return meta
+
+    # ---------- lifecycle ----------
+
+    def submit(self, kind, params, inputs=None):
+        """Queue a job; returns its status. KeyError for an unknown kind, QueueFull when saturated"""
+        fn = self.kinds[kind]
+        self.evict_expired()
+        with self._lock:
+            pending = sum(1 for meta in self._all() if meta['state'] not in FINISHED)
+            if pending >= self.max_pending:
+                raise QueueFull(f"{pending} jobs are already queued or running")
+            job_id = uuid.uuid4().hex
+            os.makedirs(self._dir(job_id))
+            # Owned before job.json exists, so no other process takes it for orphaned
+            self._take_ownership(job_id)
+            self._save({"id": job_id, "kind": kind, "params": params, "state": "queued", "owner": os.getpid(),
+                        "created": time.time(), "finished": None, "error": None})
+            future = self._futures[job_id] = self._executor.submit(_run, fn, self._dir(job_id), params, inputs)
+        future.add_done_callback(lambda done: self._finish(job_id, done))
+        return self.status(job_id)
+
+    def _finish(self, job_id, future):
+        error = None
+        if future.cancelled():
+            state = 'cancelled'
+        else:
+            exc = future.exception()
+            if exc is None:
+                state = 'done'
+            elif isinstance(exc, JobCancelled):
+                state = 'cancelled'
+            else:
+                state = 'failed'
+                error = f"{type(exc).__name__}: {exc}"
+        with self._lock:
+            self._futures.pop(job_id, None)
+            meta = self._meta(job_id)
+            if meta is not None:
+                meta.update(state=state, error=error, finished=time.time())
+                self._save(meta)
+            self._release_ownership(job_id)
+
+    def cancel(self, job_id):
+        """Cancel a queued job, or ask a running one (in any process) to stop at its next progress report"""
+        meta = self._meta(job_id)
+        if meta is None:
+            return None
+        with self._lock:
+            future = self._futures.get(job_id)
+        if meta['state'] not in FINISHED and not (future is not None and future.cancel()):
+            try:
+                open(os.path.join(self._dir(job_id), 'cancel'), 'w').close()
+            except FileNotFoundError:
+                return None  # deleted meanwhile
+        return self.status(job_id)
+
+    def delete(self, job_id):
+        """Cancel the job if needed and remove it with its files; False if unknown"""
+        if self.cancel(job_id) is None:
+            return False
+        shutil.rmtree(self._dir(job_id), ignore_errors=True)
+        return True
+
+    def evict_expired(self):
+        """Delete finished jobs whose results outlived the TTL"""
+        cutoff = time.time() - self.ttl
+        for meta in self._all():
+            if meta['state'] in FINISHED and meta['finished'] < cutoff:
+                shutil.rmtree(self._dir(meta['id']), ignore_errors=True)
+
+    # ---------- reads ----------
+
+    def _all(self):
+        """job.json of every job on disk, orphaned ones marked failed"""
+        metas = (self._meta(job_id) for job_id in self._job_ids())
+        return [self._reconcile(meta) for meta in metas if meta is not None]
+
+    def status(self, job_id):
+        """Job metadata with its latest progress, or None"""
+        meta = self._meta(job_id)
+        if meta is None:
+            return None
+        return self._status(self._reconcile(meta))
+
+    def _status(self, meta):
+        directory = self._dir(meta['id'])
+        progress = _read_json(os.path.join(directory, 'progress.json'))
+        if meta['state'] == 'queued' and progress is not None:
+            meta['state'] = 'running'
+        meta['progress'] = progress
+        if meta['state'] not in FINISHED and os.path.exists(os.path.join(directory, 'cancel')):
+            meta['cancel_requested'] = True
+        meta['expires'] = meta['finished'] + self.ttl if meta['finished'] else None
+        return meta
+
+    def list(self):
+        self.evict_expired()
+        metas = sorted(self._all(), key=lambda meta: meta['created'], reverse=True)
+        return [self._status(meta) for meta in metas]
+
+    def result(self, job_id):
+        """The stored result of a finished job (None if it has none)"""
+        if not _JOB_ID.fullmatch(job_id):
+            return None
+        return _read_json(os.path.join(self._dir(job_id), 'result.json'))
+
+    def file_path(self, job_id, name):
+        """Path of an output file a job named in its result"""
+        return os.path.join(self._dir(job_id), os.path.basename(name))
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            for job_id in list(self._owned):
+                self._release_ownership(job_id)
@@ -1,19 +1,40 @@
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-import pandas as pd
-import numpy as np
 import os
 import json
-import hashlib
-import secrets
+import asyncio
 from datetime import datetime, timedelta
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from jose import JWTError, jwt
+from admission import AdmissionMiddleware, gate_from_env
+from conditional import make_etag, not_modified, validator_headers
+from executors import offload, run_cpu, run_in, run_io
+from single_flight import SingleFlight
 
 app = FastAPI(title="SPK Kajek API")
 
+# Heavy routes each get a concurrency limit and a bounded wait queue, so a
+# burst on one degrades to 429/503 instead of queueing cheap routes behind
+# it. Sizes are overridable via ADMISSION_<NAME>_LIMIT / _QUEUE / _TIMEOUT.
+admission_gates = {
+    "calculate-detail": gate_from_env("calculate-detail", limit=2, queue=8),
+    "export": gate_from_env("export", limit=2, queue=16),
+    "correlation": gate_from_env("correlation", limit=2, queue=4),
+    "replay": gate_from_env("replay", limit=2, queue=8),
+    "chart": gate_from_env("chart", limit=2, queue=16),
+}
+# Added before CORS so that rejections still carry the CORS headers
+app.add_middleware(AdmissionMiddleware, routes=[
+    ("POST", r"/api/calculate-detail", admission_gates["calculate-detail"]),
+    ("POST", r"/api/export/[^/]+", admission_gates["export"]),
+    ("POST", r"/api/history/correlation", admission_gates["correlation"]),
+    ("GET", r"/api/history/\d+/replay", admission_gates["replay"]),
+    ("GET", r"/api/chart/[^/]+", admission_gates["chart"]),
+])
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -25,8 +46,14 @@ app.add_middleware(
 
 DATA_FILE = "TOPSIS_Input_Level.xlsx"
 CSV_FILE = "No-Vendor-NamaPaketPlan-CPU-RAM-DiskIOSpeed-HargaBulanUSD.csv"
-HISTORY_FILE = "calculation_history.json"
+HISTORY_FILE = "calculation_history.jsonl"
+LEGACY_HISTORY_FILE = "calculation_history.json"  # migrated into HISTORY_FILE on first start
 USERS_FILE = "users.json"
+DATASET_LOG = "dataset_versions.jsonl"
+# Part of every result cache key. The disk cache outlives deploys, so bump
+# this whenever a cached body changes: response shape, workbook layout,
+# chart style
+RESULT_SCHEMA = 1
 
 # JWT Configuration
 SECRET_KEY = "your-secret-key-here-change-in-production-09f26e094faa6ca2556c818166b7a9563b93f7099f6f0f4caa6cf63b88e8d3e7"
@@ -42,6 +69,10 @@ class WeightRequest(BaseModel):
     disk: float
     price: float
 
+    def as_list(self):
+        """Weights in criteria order: CPU, RAM, Disk I/O, Harga"""
+        return [self.cpu, self.ram, self.disk, self.price]
+
 class VendorData(BaseModel):
     vendor: str
     nama_paket: str
@@ -74,34 +105,46 @@ class ChangePassword(BaseModel):
 
 # ==================== AUTH UTILITIES ====================
 
-def hash_password(password: str) -> str:
-    """Hash a password using PBKDF2 with SHA-256"""
-    # Generate a random salt
-    salt = secrets.token_hex(16)
-    # Hash the password with the salt
-    pwd_hash = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt.encode('utf-8'), 100000)
-    # Return salt and hash combined
-    return f"{salt}${pwd_hash.hex()}"
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against a hash"""
+password_hasher = None
+
+def get_password_hasher():
+    """Create the password hashing pool on first use (from the event loop)"""
+    global password_hasher
+    if password_hasher is None:
+        from password_hasher import PasswordHasher
+        password_hasher = PasswordHasher()
+    return password_hasher
+
+async def hash_in_pool(op, *args):
+    """Run a hash/verify on the bounded pool; 503 with Retry-After when it is saturated"""
+    from admission import Overloaded
+
+    hasher = get_password_hasher()
     try:
-        salt, pwd_hash = hashed_password.split('$')
-        # Hash the provided password with the same salt
-        new_hash = hashlib.pbkdf2_hmac('sha256', plain_password.encode('utf-8'), salt.encode('utf-8'), 100000)
-        # Compare hashes
-        return new_hash.hex() == pwd_hash
-    except Exception:
-        return False
-
-
-def load_users():
-    """Load users from JSON file"""
-    if os.path.exists(USERS_FILE):
-        with open(USERS_FILE, 'r') as f:
-            return json.load(f)
-    # Create default admin user if file doesn't exist
-    default_users = {
+        return await getattr(hasher, op)(*args)
+    except Overloaded as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail="Too many password operations in progress, please retry",
+                            headers={"Retry-After": str(e.retry_after)})
+
+@app.get("/api/admission")
+async def get_admission_stats():
+    """Limits, queue depth, rejections and queue wait times of every admission gate"""
+    gates = {name: gate.stats() for name, gate in admission_gates.items()}
+    if password_hasher is not None:
+        gates["password hashing"] = password_hasher.gate.stats()
+    return gates
+
+@app.on_event("shutdown")
+def shutdown_password_hasher():
+    if password_hasher is not None:
+        password_hasher.shutdown()
+
+def default_users():
+    """Users written at startup when users.json does not exist: a default admin"""
+    from password_hasher import hash_password
+
+    return {
         "admin": {
             "username": "admin",
             "password": hash_password("admin123"),
@@ -109,13 +152,18 @@ def load_users():
             "display_name": "Administrator"
         }
     }
-    save_users(default_users)
-    return default_users
 
-def save_users(users):
-    """Save users to JSON file"""
-    with open(USERS_FILE, 'w') as f:
-        json.dump(users, f, indent=2, ensure_ascii=False)
+user_registry = None
+token_cache = None
+
+def get_user_registry():
+    """users.json kept in memory (see user_store); opened on first use, seeded by warm_up()"""
+    global user_registry, token_cache
+    if user_registry is None:
+        from user_store import TokenCache, UserRegistry
+        token_cache = TokenCache()
+        user_registry = UserRegistry(USERS_FILE, default_users)
+    return user_registry
 
 def create_access_token(data: dict, expires_delta: timedelta = None):
     """Create a JWT access token"""
@@ -128,46 +176,52 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    """Dependency to get current authenticated user"""
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Dependency to get current authenticated user (in-memory lookups only)"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
+    registry = get_user_registry()
+    token = credentials.credentials
+    # A token verified recently skips the signature check
+    username = token_cache.get(token)
+    if username is None:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
             raise credentials_exception
-        
-        users = load_users()
-        if username not in users:
+        username = payload.get("sub")
+        if username is None:
             raise credentials_exception
-        
-        return users[username]
-    except JWTError:
+        token_cache.put(token, username, payload.get("exp"))
+
+    user = registry.get(username)
+    if user is None:
         raise credentials_exception
+    return user
 
 # ==================== AUTH ENDPOINTS ====================
 
 @app.post("/api/login", response_model=Token)
-def login(login_data: LoginRequest):
+async def login(login_data: LoginRequest, response: Response):
     """Authenticate user and return JWT token"""
-    users = load_users()
+    from password_hasher import server_timing
+
+    user = get_user_registry().get(login_data.username)
     
     # Check if user exists
-    if login_data.username not in users:
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password"
         )
     
-    user = users[login_data.username]
-    
-    # Verify password
-    if not verify_password(login_data.password, user["password"]):
+    # Verify password (on the hashing pool, not the event loop)
+    valid, timings = await hash_in_pool('verify', login_data.password, user["password"])
+    response.headers["Server-Timing"] = server_timing(timings)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password"
@@ -187,7 +241,7 @@ def login(login_data: LoginRequest):
     }
 
 @app.get("/api/profile", response_model=UserProfile)
-def get_profile(current_user: dict = Depends(get_current_user)):
+async def get_profile(current_user: dict = Depends(get_current_user)):
     """Get current user profile"""
     return {
         "username": current_user["username"],
@@ -196,17 +250,13 @@ def get_profile(current_user: dict = Depends(get_current_user)):
     }
 
 @app.put("/api/profile")
+@offload('io')
 def update_profile(profile: UpdateProfile, current_user: dict = Depends(get_current_user)):
     """Update user profile"""
-    users = load_users()
     username = current_user["username"]
     
-    # Update user data
-    users[username]["email"] = profile.email
-    users[username]["display_name"] = profile.display_name
-    
-    # Save changes
-    save_users(users)
+    # Update user data and save (the in-memory registry is updated too)
+    get_user_registry().update(username, email=profile.email, display_name=profile.display_name)
     
     return {
         "message": "Profile updated successfully",
@@ -218,13 +268,16 @@ def update_profile(profile: UpdateProfile, current_user: dict = Depends(get_curr
     }
 
 @app.post("/api/change-password")
-def change_password(password_data: ChangePassword, current_user: dict = Depends(get_current_user)):
+async def change_password(password_data: ChangePassword, response: Response,
+                          current_user: dict = Depends(get_current_user)):
     """Change user password"""
-    users = load_users()
+    from password_hasher import server_timing
+
     username = current_user["username"]
     
     # Verify old password
-    if not verify_password(password_data.old_password, users[username]["password"]):
+    valid, timings = await hash_in_pool('verify', password_data.old_password, current_user["password"])
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Old password is incorrect"
@@ -237,59 +290,181 @@ def change_password(password_data: ChangePassword, current_user: dict = Depends(
             detail="New password must be at least 6 characters"
         )
     
-    # Update password
-    users[username]["password"] = hash_password(password_data.new_password)
-    
-    # Save changes
-    save_users(users)
+    # Update password and save
+    new_hash, hash_timings = await hash_in_pool('hash', password_data.new_password)
+    timings.update(hash_timings, queue=timings['queue'] + hash_timings['queue'])
+    response.headers["Server-Timing"] = server_timing(timings)
+    await asyncio.to_thread(get_user_registry().update, username, password=new_hash)
     
     return {"message": "Password changed successfully"}
 
+# ==================== DATA UTILITIES ====================
+
+input_load_stats = {}
+dataset_store = None
+# Identical concurrent requests share one computation (see single_flight)
+flights = SingleFlight()
+result_cache = None
+
+def read_input_rows(path):
+    """Rows of the '1. Input Level' sheet in dataset_store.ROW_FIELDS order.
+
+    Only that sheet is read (see input_reader). The engine and load time
+    of the last read in this process are kept in `input_load_stats`; it
+    stays empty while every version comes from the dataset log.
+    """
+    from dataset_store import ROW_FIELDS
+    from input_reader import read_input_level
+
+    columns, stats = read_input_level(path)
+    input_load_stats.update(stats)
+    return list(zip(*(columns[name].tolist() for name in ROW_FIELDS)))
+
+def get_dataset_store():
+    """Open the versioned catalog on first use"""
+    global dataset_store
+    if dataset_store is None:
+        from dataset_store import DatasetStore
+        dataset_store = DatasetStore(DATASET_LOG)
+    return dataset_store
+
+def dataset_version():
+    """Current dataset version; a changed workbook is committed as a new version first"""
+    return get_dataset_store().sync(DATA_FILE, read_input_rows)
+
+def get_result_cache():
+    """Disk cache of responses and artifacts, shared across restarts and workers"""
+    global result_cache
+    if result_cache is None:
+        from result_cache import ResultCache
+        result_cache = ResultCache()
+    return result_cache
+
+def result_key(namespace, version, weights, **params):
+    """Result cache key: namespace + the version's content hash + RESULT_SCHEMA, rounded weights and params"""
+    weights = [round(float(w), 6) for w in weights]
+    return get_result_cache().key(namespace, get_dataset_store().content_hash(version),
+                                  {"schema": RESULT_SCHEMA, "weights": weights, **params})
+
+async def current_dataset_version():
+    """dataset_version() on the I/O pool, since a changed workbook is re-read"""
+    from input_reader import InputFormatError
+
+    try:
+        # After an edit every waiting request would re-check the workbook; one does
+        return await flights.do(('dataset_version',), lambda: run_io(dataset_version))
+    except InputFormatError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+def load_input_level(version=None):
+    """Vendor levels of a dataset version (default: current) as a DataFrame.
+
+    pandas is imported here rather than at module level so that the API
+    process and cheap endpoints start without it.
+    """
+    import pandas as pd
+
+    if version is None:
+        version = dataset_version()
+    return pd.DataFrame(get_dataset_store().columns(version))
+
+def save_input_level(df, source='api'):
+    """Write the vendor levels back to the '1. Input Level' sheet and commit a new version.
+
+    Call inside get_dataset_store().exclusive(), together with the read
+    the new levels are based on.
+    """
+    import shutil
+    import pandas as pd
+
+    # Written to a copy and swapped in, so the workbook is never seen half-written
+    root, ext = os.path.splitext(DATA_FILE)
+    tmp_path = f"{root}.tmp{ext}"  # openpyxl needs the .xlsx extension
+    shutil.copyfile(DATA_FILE, tmp_path)
+    with pd.ExcelWriter(tmp_path, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
+        df.to_excel(writer, sheet_name='1. Input Level', index=False, startrow=2)
+    os.replace(tmp_path, DATA_FILE)
+    return get_dataset_store().sync(DATA_FILE, read_input_rows, source=source)
+
+def score_input_level(weights, version=None):
+    """Score the input levels of a dataset version (default: current).
+
+    Returns the DataFrame (with *_val, Score and Rank columns added) and
+    the engine result holding every intermediate matrix.
+    """
+    from topsis_engine import LEVEL_COLUMNS, VALUE_COLUMNS, levels_to_values, topsis
+
+    df = load_input_level(version)
+    df[VALUE_COLUMNS] = levels_to_values(df[LEVEL_COLUMNS].to_numpy())
+    res = topsis(df[VALUE_COLUMNS].to_numpy(), weights)
+    df['Score'] = res['scores']
+    df['Rank'] = res['ranks']
+    return df, res
+
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "SPK Kajek API is running"}
 
 @app.get("/api/data")
-def get_data():
+@offload('io')
+def get_data(request: Request, response: Response):
+    from input_reader import InputFormatError
+
     try:
         # Prefer Excel as it seems to be the source of truth in the original dashboard
-        df = pd.read_excel(DATA_FILE, sheet_name='1. Input Level', skiprows=2)
-        df.columns = ['No', 'Vendor', 'Nama Paket (Plan)', 'CPU_Level', 'RAM_Level', 'DiskIO_Level', 'Price_Level']
-        df = df.dropna(subset=['Vendor']).reset_index(drop=True)
+        version = dataset_version()
+        # Revalidation only needs the version's content hash, not a DataFrame
+        etag = make_etag('data', get_dataset_store().content_hash(version))
+        unchanged = not_modified(request, etag)
+        if unchanged is not None:
+            return unchanged
+        df = load_input_level(version)
+        response.headers.update(validator_headers(etag))
+        # Only set when this process read the workbook itself; a restarted
+        # process or another worker picks the version up from the log
+        if input_load_stats:
+            response.headers["X-Load-Engine"] = input_load_stats['engine']
+            response.headers["X-Load-Time"] = f"{input_load_stats['seconds']:.4f}"
         
         # Convert NaN to None for JSON compatibility
         return df.fillna("").to_dict(orient="records")
+    except InputFormatError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/data")
+@offload('io')
 def add_vendor(vendor: VendorData):
+    import pandas as pd
+
     try:
-        # Read existing data
-        df = pd.read_excel(DATA_FILE, sheet_name='1. Input Level', skiprows=2)
-        df.columns = ['No', 'Vendor', 'Nama Paket (Plan)', 'CPU_Level', 'RAM_Level', 'DiskIO_Level', 'Price_Level']
-        df = df.dropna(subset=['Vendor']).reset_index(drop=True)
+        # Read-modify-write of the workbook: one edit at a time across workers
+        with get_dataset_store().exclusive():
+            # Read existing data
+            df = load_input_level()
         
-        # Create new row
-        new_no = len(df) + 1
-        new_row = pd.DataFrame([{
-            'No': new_no,
-            'Vendor': vendor.vendor,
-            'Nama Paket (Plan)': vendor.nama_paket,
-            'CPU_Level': vendor.cpu_level,
-            'RAM_Level': vendor.ram_level,
-            'DiskIO_Level': vendor.diskio_level,
-            'Price_Level': vendor.price_level
-        }])
+            # Create new row
+            new_no = len(df) + 1
+            new_row = pd.DataFrame([{
+                'No': new_no,
+                'Vendor': vendor.vendor,
+                'Nama Paket (Plan)': vendor.nama_paket,
+                'CPU_Level': vendor.cpu_level,
+                'RAM_Level': vendor.ram_level,
+                'DiskIO_Level': vendor.diskio_level,
+                'Price_Level': vendor.price_level
+            }])
         
-        # Append new row
-        df = pd.concat([df, new_row], ignore_index=True)
+            # Append new row
+            df = pd.concat([df, new_row], ignore_index=True)
         
-        # Save back to Excel (create new sheet or overwrite)
-        with pd.ExcelWriter(DATA_FILE, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
-            # Write with header rows
-            df_to_save = df.copy()
-            df_to_save.to_excel(writer, sheet_name='1. Input Level', index=False, startrow=2)
+            # Save back to Excel (create new sheet or overwrite)
+            save_input_level(df, source='api:add')
         
         return {"message": "Vendor added successfully", "no": new_no}
     except Exception as e:
@@ -298,22 +473,22 @@ def add_vendor(vendor: VendorData):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.delete("/api/data/{vendor_no}")
+@offload('io')
 def delete_vendor(vendor_no: int):
     try:
-        # Read existing data
-        df = pd.read_excel(DATA_FILE, sheet_name='1. Input Level', skiprows=2)
-        df.columns = ['No', 'Vendor', 'Nama Paket (Plan)', 'CPU_Level', 'RAM_Level', 'DiskIO_Level', 'Price_Level']
-        df = df.dropna(subset=['Vendor']).reset_index(drop=True)
+        # Read-modify-write of the workbook: one edit at a time across workers
+        with get_dataset_store().exclusive():
+            # Read existing data
+            df = load_input_level()
         
-        # Find and remove the vendor
-        df = df[df['No'] != vendor_no]
+            # Find and remove the vendor
+            df = df[df['No'] != vendor_no]
         
-        # Re-number
-        df['No'] = range(1, len(df) + 1)
+            # Re-number
+            df['No'] = range(1, len(df) + 1)
         
-        # Save back to Excel
-        with pd.ExcelWriter(DATA_FILE, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
-            df.to_excel(writer, sheet_name='1. Input Level', index=False, startrow=2)
+            # Save back to Excel
+            save_input_level(df, source='api:delete')
         
         return {"message": "Vendor deleted successfully"}
     except Exception as e:
@@ -322,28 +497,28 @@ def delete_vendor(vendor_no: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.put("/api/data/{vendor_no}")
+@offload('io')
 def update_vendor(vendor_no: int, vendor: VendorData):
     """Update an existing vendor"""
     try:
-        df = pd.read_excel(DATA_FILE, sheet_name='1. Input Level', skiprows=2)
-        df.columns = ['No', 'Vendor', 'Nama Paket (Plan)', 'CPU_Level', 'RAM_Level', 'DiskIO_Level', 'Price_Level']
-        df = df.dropna(subset=['Vendor']).reset_index(drop=True)
+        # Read-modify-write of the workbook: one edit at a time across workers
+        with get_dataset_store().exclusive():
+            df = load_input_level()
         
-        # Find the vendor and update
-        mask = df['No'] == vendor_no
-        if not mask.any():
-            raise HTTPException(status_code=404, detail="Vendor not found")
+            # Find the vendor and update
+            mask = df['No'] == vendor_no
+            if not mask.any():
+                raise HTTPException(status_code=404, detail="Vendor not found")
         
-        df.loc[mask, 'Vendor'] = vendor.vendor
-        df.loc[mask, 'Nama Paket (Plan)'] = vendor.nama_paket
-        df.loc[mask, 'CPU_Level'] = vendor.cpu_level
-        df.loc[mask, 'RAM_Level'] = vendor.ram_level
-        df.loc[mask, 'DiskIO_Level'] = vendor.diskio_level
-        df.loc[mask, 'Price_Level'] = vendor.price_level
+            df.loc[mask, 'Vendor'] = vendor.vendor
+            df.loc[mask, 'Nama Paket (Plan)'] = vendor.nama_paket
+            df.loc[mask, 'CPU_Level'] = vendor.cpu_level
+            df.loc[mask, 'RAM_Level'] = vendor.ram_level
+            df.loc[mask, 'DiskIO_Level'] = vendor.diskio_level
+            df.loc[mask, 'Price_Level'] = vendor.price_level
         
-        # Save back to Excel
-        with pd.ExcelWriter(DATA_FILE, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
-            df.to_excel(writer, sheet_name='1. Input Level', index=False, startrow=2)
+            # Save back to Excel
+            save_input_level(df, source='api:update')
         
         return {"message": "Vendor updated successfully"}
     except HTTPException:
@@ -353,73 +528,82 @@ def update_vendor(vendor_no: int, vendor: VendorData):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+def ranking_response(df, res):
+    """Response body shared by /api/calculate and history replay"""
+    df['D_pos'] = res['d_pos']
+    df['D_neg'] = res['d_neg']
+    
+    # Sort by rank
+    result = df.sort_values('Rank')
+    
+    # Prepare response
+    rankings = result[['Rank', 'Vendor', 'Nama Paket (Plan)', 
+                      'CPU_val', 'RAM_val', 'DiskIO_val', 'Price_val', 
+                      'Score', 'D_pos', 'D_neg']].to_dict(orient='records')
+    
+    top = result.iloc[0]
+    
+    return {
+        "rankings": rankings,
+        "top_recommendation": {
+            "Vendor": top['Vendor'],
+            "Nama Paket (Plan)": top['Nama Paket (Plan)'],
+            "CPU_val": int(top['CPU_val']),
+            "RAM_val": int(top['RAM_val']),
+            "DiskIO_val": int(top['DiskIO_val']),
+            "Price_val": int(top['Price_val']),
+            "Score": float(top['Score']),
+            "Rank": int(top['Rank'])
+        },
+        "matrix": {
+            "ideal_pos": res['ideal_pos'].tolist(),
+            "ideal_neg": res['ideal_neg'].tolist()
+        }
+    }
+
+def json_body(content):
+    """Serialize a response body once, so coalesced requests can share the bytes"""
+    from fastapi.encoders import jsonable_encoder
+    return JSONResponse(jsonable_encoder(content)).body
+
+async def coalesced_json(endpoint, weights, body, request=None):
+    """JSON of `body(weights, version)`, from the result cache or computed on the CPU pool.
+
+    Concurrent identical requests share one lookup/computation. The result
+    cache key doubles as the ETag, so a client that already has this
+    result gets 304 without a cache read.
+    """
+    # Dataset sync on the I/O pool, scoring on the CPU pool
+    version = await current_dataset_version()
+    weight_list = weights.as_list()
+    key = await run_io(result_key, endpoint, version, weight_list)
+    etag = make_etag(key)
+    if request is not None:
+        unchanged = not_modified(request, etag)
+        if unchanged is not None:
+            return unchanged
+
+    async def compute():
+        cache = get_result_cache()
+        content = await run_io(cache.get, key)
+        if content is not None:
+            return content, "HIT"
+        content = await run_cpu(lambda: json_body(body(weights, version)))
+        await run_io(cache.put, key, content)
+        return content, "MISS"
+
+    content, cache_status = await flights.do((endpoint, version, tuple(weight_list)), compute)
+    return Response(content=content, media_type="application/json",
+                    headers={"X-Cache": cache_status, **validator_headers(etag)})
+
 @app.post("/api/calculate")
-def calculate_topsis(weights: WeightRequest):
+async def calculate_topsis(weights: WeightRequest, request: Request):
+    return await coalesced_json('calculate', weights, topsis_ranking, request)
+
+def topsis_ranking(weights, version):
+    """Body of /api/calculate (runs on the CPU pool)"""
     try:
-        # Load data from Excel
-        df = pd.read_excel(DATA_FILE, sheet_name='1. Input Level', skiprows=2)
-        df.columns = ['No', 'Vendor', 'Nama Paket (Plan)', 'CPU_Level', 'RAM_Level', 'DiskIO_Level', 'Price_Level']
-        df = df.dropna(subset=['Vendor']).reset_index(drop=True)
-        
-        # Convert levels to actual values
-        df['CPU_val'] = df['CPU_Level'].apply(lambda x: {1:2, 2:4, 3:6, 4:8, 5:10}[int(x)])
-        df['RAM_val'] = df['RAM_Level'].apply(lambda x: {1:2, 2:4, 3:8, 4:16, 5:32}[int(x)])
-        df['DiskIO_val'] = df['DiskIO_Level'].apply(lambda x: {1:150, 2:300, 3:500, 4:700, 5:1000}[int(x)])
-        df['Price_val'] = df['Price_Level'].apply(lambda x: {1:15, 2:35, 3:75, 4:150, 5:250}[int(x)])
-        
-        # TOPSIS Calculation
-        w = np.array([weights.cpu, weights.ram, weights.disk, weights.price])
-        X = df[['CPU_val', 'RAM_val', 'DiskIO_val', 'Price_val']].values
-        
-        # Normalization
-        X_norm = X / np.sqrt((X**2).sum(axis=0))
-        
-        # Weighted matrix
-        X_weighted = X_norm * w
-        
-        # Ideal solutions (CPU, RAM, DiskIO are BENEFIT, Price is COST)
-        ideal_pos = np.array([X_weighted[:, 0].max(), X_weighted[:, 1].max(), 
-                              X_weighted[:, 2].max(), X_weighted[:, 3].min()])
-        ideal_neg = np.array([X_weighted[:, 0].min(), X_weighted[:, 1].min(), 
-                              X_weighted[:, 2].min(), X_weighted[:, 3].max()])
-        
-        # Euclidean distance
-        D_pos = np.sqrt(((X_weighted - ideal_pos)**2).sum(axis=1))
-        D_neg = np.sqrt(((X_weighted - ideal_neg)**2).sum(axis=1))
-        
-        # TOPSIS Score
-        df['Score'] = D_neg / (D_pos + D_neg)
-        df['Rank'] = df['Score'].rank(ascending=False).astype(int)
-        df['D_pos'] = D_pos
-        df['D_neg'] = D_neg
-        
-        # Sort by rank
-        result = df.sort_values('Rank')
-        
-        # Prepare response
-        rankings = result[['Rank', 'Vendor', 'Nama Paket (Plan)', 
-                          'CPU_val', 'RAM_val', 'DiskIO_val', 'Price_val', 
-                          'Score', 'D_pos', 'D_neg']].to_dict(orient='records')
-        
-        top = result.iloc[0]
-        
-        return {
-            "rankings": rankings,
-            "top_recommendation": {
-                "Vendor": top['Vendor'],
-                "Nama Paket (Plan)": top['Nama Paket (Plan)'],
-                "CPU_val": int(top['CPU_val']),
-                "RAM_val": int(top['RAM_val']),
-                "DiskIO_val": int(top['DiskIO_val']),
-                "Price_val": int(top['Price_val']),
-                "Score": float(top['Score']),
-                "Rank": int(top['Rank'])
-            },
-            "matrix": {
-                "ideal_pos": ideal_pos.tolist(),
-                "ideal_neg": ideal_neg.tolist()
-            }
-        }
+        return ranking_response(*score_input_level(weights.as_list(), version))
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -427,51 +611,31 @@ def calculate_topsis(weights: WeightRequest):
 
 
 @app.post("/api/calculate-detail")
-def calculate_topsis_detail(weights: WeightRequest):
+async def calculate_topsis_detail(weights: WeightRequest, request: Request):
     """Return detailed calculation matrices for the Perhitungan view"""
+    return await coalesced_json('calculate-detail', weights, topsis_detail, request)
+
+def topsis_detail(weights, version):
+    """Body of /api/calculate-detail (runs on the CPU pool)"""
+    import numpy as np
+    from topsis_engine import CRITERIA_NAMES, CRITERIA_TYPES, VALUE_COLUMNS
+
     try:
-        # Load data from Excel
-        df = pd.read_excel(DATA_FILE, sheet_name='1. Input Level', skiprows=2)
-        df.columns = ['No', 'Vendor', 'Nama Paket (Plan)', 'CPU_Level', 'RAM_Level', 'DiskIO_Level', 'Price_Level']
-        df = df.dropna(subset=['Vendor']).reset_index(drop=True)
-        
-        # Convert levels to actual values
-        cpu_map = {1:2, 2:4, 3:6, 4:8, 5:10}
-        ram_map = {1:2, 2:4, 3:8, 4:16, 5:32}
-        disk_map = {1:150, 2:300, 3:500, 4:700, 5:1000}
-        price_map = {1:15, 2:35, 3:75, 4:150, 5:250}
-        
-        df['CPU_val'] = df['CPU_Level'].apply(lambda x: cpu_map[int(x)])
-        df['RAM_val'] = df['RAM_Level'].apply(lambda x: ram_map[int(x)])
-        df['DiskIO_val'] = df['DiskIO_Level'].apply(lambda x: disk_map[int(x)])
-        df['Price_val'] = df['Price_Level'].apply(lambda x: price_map[int(x)])
+        df, res = score_input_level(weights.as_list(), version)
         
         # Step 1: Decision Matrix (X)
-        X = df[['CPU_val', 'RAM_val', 'DiskIO_val', 'Price_val']].values
-        
-        # Step 2: Normalization - rij = xij / sqrt(sum(xij^2))
-        col_sums_sq = np.sqrt((X**2).sum(axis=0))
-        X_norm = X / col_sums_sq
-        
-        # Step 3: Weighted Normalization - yij = wj * rij
-        w = np.array([weights.cpu, weights.ram, weights.disk, weights.price])
-        X_weighted = X_norm * w
+        X = df[VALUE_COLUMNS].values
         
-        # Step 4: Ideal Solutions
-        # A+ (Positive Ideal): Max for BENEFIT, Min for COST
-        # A- (Negative Ideal): Min for BENEFIT, Max for COST
-        ideal_pos = np.array([X_weighted[:, 0].max(), X_weighted[:, 1].max(), 
-                              X_weighted[:, 2].max(), X_weighted[:, 3].min()])
-        ideal_neg = np.array([X_weighted[:, 0].min(), X_weighted[:, 1].min(), 
-                              X_weighted[:, 2].min(), X_weighted[:, 3].max()])
-        
-        # Step 5: Distance Calculations
-        D_pos = np.sqrt(((X_weighted - ideal_pos)**2).sum(axis=1))
-        D_neg = np.sqrt(((X_weighted - ideal_neg)**2).sum(axis=1))
-        
-        # Step 6: TOPSIS Score
-        scores = D_neg / (D_pos + D_neg)
-        ranks = pd.Series(scores).rank(ascending=False).astype(int).tolist()
+        # Steps 2-6: normalization, weighting, ideals, distances and score
+        col_sums_sq = res['divisors']
+        X_norm = res['normalized']
+        X_weighted = res['weighted']
+        ideal_pos = res['ideal_pos']
+        ideal_neg = res['ideal_neg']
+        D_pos = res['d_pos']
+        D_neg = res['d_neg']
+        scores = res['scores']
+        ranks = res['ranks'].tolist()
         
         # Prepare response with all matrices
         vendors = df['Vendor'].tolist()
@@ -484,8 +648,8 @@ def calculate_topsis_detail(weights: WeightRequest):
                 "price": weights.price
             },
             "criteria": {
-                "names": ["CPU", "RAM", "Disk I/O", "Harga"],
-                "types": ["BENEFIT", "BENEFIT", "BENEFIT", "COST"]
+                "names": CRITERIA_NAMES,
+                "types": CRITERIA_TYPES
             },
             "formulas": {
                 "normalization": "rij = xij / √(Σxij²)",
@@ -541,128 +705,797 @@ def calculate_topsis_detail(weights: WeightRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# ==================== EXPORT ====================
+
+EXPORT_COLUMNS = ['Rank', 'No', 'Vendor', 'Nama Paket (Plan)',
+                  'CPU_Level', 'CPU_val', 'RAM_Level', 'RAM_val',
+                  'DiskIO_Level', 'DiskIO_val', 'Price_Level', 'Price_val',
+                  'Score', 'D_pos', 'D_neg']
+
+def file_chunks(f, chunk_size=64 * 1024):
+    """Stream an open file and close it"""
+    with f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+# Registered before /api/export/{fmt} so "xlsx" is not taken as a stream format
+@app.post("/api/export/xlsx")
+async def export_workbook(weights: WeightRequest):
+    """Step-by-step TOPSIS workbook (normalization to ranking) for the given weights"""
+    from report_service import XLSX_MEDIA_TYPE, build_workbook
+
+    weight_list = weights.as_list()
+    cache = get_result_cache()
+    version = await current_dataset_version()
+    key = await run_io(result_key, 'report', version, weight_list)
+
+    # Served from the open handle, so eviction cannot remove it mid-send
+    f = await run_io(cache.open, key)
+    cache_status = "HIT"
+    if f is None:
+        cache_status = "MISS"
+        try:
+            df, res = await run_cpu(score_input_level, weight_list, version)
+            # The workbook write is the slow part; it runs on the report pool
+            f = await run_in('report', cache.put_file, key,
+                             lambda tmp_path: build_workbook(tmp_path, df, res, weight_list))
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            raise HTTPException(status_code=500, detail=str(e))
+
+    return StreamingResponse(file_chunks(f), media_type=XLSX_MEDIA_TYPE, headers={
+        "Content-Disposition": 'attachment; filename="hasil_topsis.xlsx"',
+        "Content-Length": str(os.fstat(f.fileno()).st_size),
+        "X-Cache": cache_status,
+    })
+
+@app.post("/api/export/{fmt}")
+async def export_rankings(fmt: str, weights: WeightRequest):
+    """Stream the full ranking as CSV, NDJSON or Parquet"""
+    from export_service import EXPORT_FORMATS, iter_export, rank_order
+
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=404, detail=f"Unsupported export format, expected one of: {', '.join(EXPORT_FORMATS)}")
+
+    version = await current_dataset_version()
+    try:
+        df, res = await run_cpu(score_input_level, weights.as_list(), version)
+        df['D_pos'] = res['d_pos']
+        df['D_neg'] = res['d_neg']
+
+        # Column arrays are streamed in rank order; no sorted frame is built
+        columns = {name: df[name].to_numpy() for name in EXPORT_COLUMNS}
+        body = iter_export(columns, rank_order(res['ranks'], res['scores']), fmt)
+    except RuntimeError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="hasil_topsis.{fmt}"'}
+    )
+
+
 # ==================== HISTORY FUNCTIONS ====================
 
-def load_history():
-    """Load history from JSON file"""
-    if os.path.exists(HISTORY_FILE):
-        with open(HISTORY_FILE, 'r') as f:
-            return json.load(f)
-    return []
+history_store = None
 
-def save_history(history):
-    """Save history to JSON file"""
-    with open(HISTORY_FILE, 'w') as f:
-        json.dump(history, f, indent=2, ensure_ascii=False)
+def get_history_store():
+    """Open the history log on first use (migrating the old JSON file if needed)"""
+    global history_store
+    if history_store is None:
+        from history_store import HistoryStore
+        history_store = HistoryStore(HISTORY_FILE, legacy_path=LEGACY_HISTORY_FILE)
+    return history_store
 
 class HistoryEntry(BaseModel):
     title: str
     description: Optional[str] = ""
     weights: WeightRequest
     tags: Optional[List[str]] = []
+
+class CorrelationScenario(BaseModel):
+    name: Optional[str] = None
+    weights: WeightRequest
+
+class CorrelationRequest(BaseModel):
+    ids: List[int] = []
+    scenarios: List[CorrelationScenario] = []
+    dataset_version: Optional[int] = None
     
 @app.get("/api/history")
-def get_history():
-    """Get all calculation history"""
+@offload('io')
+def get_history(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[int] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    tag: Optional[str] = None,
+    vendor: Optional[str] = None,
+    weights: Optional[str] = Query(None, description="cpu,ram,disk,price; matches the same weight bucket"),
+    fields: Optional[str] = Query(None, description="Comma-separated keys to return per entry")
+):
+    """Calculation history, newest first.
+
+    Without `limit` every matching entry is returned. With it, the
+    X-Next-Cursor header carries the `cursor` for the next page. The
+    packed full ranking ("result") is only included when asked for in
+    `fields`; see /api/history/{id}/rankings for the decoded form.
+    """
+    from history_store import parse_timestamp
+
+    try:
+        since_ts = parse_timestamp(since) if since else None
+        until_ts = parse_timestamp(until) if until else None
+        weight_list = [float(w) for w in weights.split(',')] if weights else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid filter: {e}")
+    if weight_list is not None and len(weight_list) != 4:
+        raise HTTPException(status_code=400, detail="weights must be 4 comma-separated numbers: cpu,ram,disk,price")
+
     try:
-        history = load_history()
-        return history
+        store = get_history_store()
+        # The version is shared by every worker; read before the query, so a
+        # body is never older than its tag
+        etag = make_etag('history', store.version, sorted(request.query_params.multi_items()))
+        unchanged = not_modified(request, etag)
+        if unchanged is not None:
+            return unchanged
+        response.headers.update(validator_headers(etag))
+        entries, next_cursor = store.query(
+            limit=limit, cursor=cursor, since=since_ts, until=until_ts, tag=tag, vendor=vendor,
+            weights=weight_list, fields=[f.strip() for f in fields.split(',') if f.strip()] if fields else None
+        )
+        if next_cursor is not None:
+            response.headers["X-Next-Cursor"] = str(next_cursor)
+        if not fields:
+            for e in entries:
+                e.pop("result", None)
+        return entries
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/history")
-def save_calculation(entry: HistoryEntry):
+async def save_calculation(entry: HistoryEntry):
     """Save a calculation to history"""
+    version = await current_dataset_version()
     try:
-        # Load existing history
-        history = load_history()
-        
-        # Perform TOPSIS calculation
-        df = pd.read_excel(DATA_FILE, sheet_name='1. Input Level', skiprows=2)
-        df.columns = ['No', 'Vendor', 'Nama Paket (Plan)', 'CPU_Level', 'RAM_Level', 'DiskIO_Level', 'Price_Level']
-        df = df.dropna(subset=['Vendor']).reset_index(drop=True)
-        
-        cpu_map = {1:2, 2:4, 3:6, 4:8, 5:10}
-        ram_map = {1:2, 2:4, 3:8, 4:16, 5:32}
-        disk_map = {1:150, 2:300, 3:500, 4:700, 5:1000}
-        price_map = {1:15, 2:35, 3:75, 4:150, 5:250}
-        
-        df['CPU_val'] = df['CPU_Level'].apply(lambda x: cpu_map[int(x)])
-        df['RAM_val'] = df['RAM_Level'].apply(lambda x: ram_map[int(x)])
-        df['DiskIO_val'] = df['DiskIO_Level'].apply(lambda x: disk_map[int(x)])
-        df['Price_val'] = df['Price_Level'].apply(lambda x: price_map[int(x)])
+        # Perform TOPSIS calculation on the current dataset version
+        history_entry = await run_cpu(build_history_entry, entry, version)
         
-        X = df[['CPU_val', 'RAM_val', 'DiskIO_val', 'Price_val']].values
-        w = np.array([entry.weights.cpu, entry.weights.ram, entry.weights.disk, entry.weights.price])
+        # Append to the log; the store assigns the id. Opening the store
+        # on first use scans the log, so that runs on the I/O pool too
+        entry_id = await run_io(lambda: get_history_store().append(history_entry))
         
-        X_norm = X / np.sqrt((X**2).sum(axis=0))
-        X_weighted = X_norm * w
-        
-        ideal_pos = np.array([X_weighted[:, 0].max(), X_weighted[:, 1].max(), 
-                              X_weighted[:, 2].max(), X_weighted[:, 3].min()])
-        ideal_neg = np.array([X_weighted[:, 0].min(), X_weighted[:, 1].min(), 
-                              X_weighted[:, 2].min(), X_weighted[:, 3].max()])
-        
-        D_pos = np.sqrt(((X_weighted - ideal_pos)**2).sum(axis=1))
-        D_neg = np.sqrt(((X_weighted - ideal_neg)**2).sum(axis=1))
-        
-        scores = D_neg / (D_pos + D_neg)
-        df['Score'] = scores
-        df['Rank'] = df['Score'].rank(ascending=False).astype(int)
-        
-        result = df.sort_values('Rank')
-        top = result.iloc[0]
-        
-        # Create history entry
-        history_entry = {
-            "id": len(history) + 1,
-            "timestamp": datetime.now().isoformat(),
-            "title": entry.title,
-            "description": entry.description,
-            "tags": entry.tags,
-            "weights": {
-                "cpu": entry.weights.cpu,
-                "ram": entry.weights.ram,
-                "disk": entry.weights.disk,
-                "price": entry.weights.price
-            },
-            "total_alternatives": len(df),
-            "top_vendor": top['Vendor'],
-            "top_score": round(float(top['Score']), 4),
-            "rankings": result[['Rank', 'Vendor', 'Nama Paket (Plan)', 'Score']].head(5).to_dict(orient='records')
+        return {"message": "Calculation saved to history", "id": entry_id}
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+def build_history_entry(entry, version):
+    """Score `entry`'s weights on a dataset version and build the record to store"""
+    from result_codec import encode_result
+
+    df, res = score_input_level(entry.weights.as_list(), version)
+    
+    result = df.sort_values('Rank')
+    top = result.iloc[0]
+    
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "title": entry.title,
+        "description": entry.description,
+        "tags": entry.tags,
+        "weights": {
+            "cpu": entry.weights.cpu,
+            "ram": entry.weights.ram,
+            "disk": entry.weights.disk,
+            "price": entry.weights.price
+        },
+        "dataset_version": version,
+        "total_alternatives": len(df),
+        "top_vendor": top['Vendor'],
+        "top_score": round(float(top['Score']), 4),
+        "rankings": result[['Rank', 'Vendor', 'Nama Paket (Plan)', 'Score']].head(5).to_dict(orient='records'),
+        # Full ranking, packed (see result_codec); rows resolve against dataset_version
+        "result": encode_result(res['scores'])
+    }
+
+@app.get("/api/history/analytics")
+@offload('io')
+def get_history_analytics(
+    period: str = Query("day", pattern="^(day|week)$"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Latest periods to return")
+):
+    """Vendor win counts, top-score statistics and average weights per day or week.
+
+    Served from aggregates the history store keeps up to date on every
+    save and delete, so the cost does not grow with the history.
+    """
+    return get_history_store().analytics(period, limit)
+
+MAX_CORRELATION_ITEMS = 200
+correlation_cache = None
+
+def get_correlation_cache():
+    global correlation_cache
+    if correlation_cache is None:
+        from rank_correlation import CorrelationCache
+        correlation_cache = CorrelationCache()
+    return correlation_cache
+
+@app.post("/api/history/correlation")
+async def history_correlation(request: CorrelationRequest, response: Response):
+    """Spearman and Kendall tau-b matrices between history entries and ad-hoc scenarios.
+
+    Every ranking is recomputed from its weights on one dataset version
+    (default: current) in a single batched engine pass, so entries saved
+    on different versions are compared over the same alternatives.
+    Results are cached per (version, entry ids, scenario weights).
+    """
+    version = request.dataset_version
+    if version is None:
+        version = await current_dataset_version()
+    result, cache_status = await run_cpu(correlation_matrices, request, version)
+    response.headers["X-Cache"] = cache_status
+    return result
+
+def correlation_matrices(request, version):
+    """Body of /api/history/correlation; returns (result, X-Cache value)"""
+    import numpy as np
+    from rank_correlation import kendall_matrix, spearman_matrix
+    from topsis_engine import LEVEL_COLUMNS, levels_to_values, topsis_scores
+
+    count = len(request.ids) + len(request.scenarios)
+    if not 2 <= count <= MAX_CORRELATION_ITEMS:
+        raise HTTPException(status_code=400,
+                            detail=f"Give between 2 and {MAX_CORRELATION_ITEMS} history ids and scenarios in total")
+
+    labels, weights = [], []
+    for history_id in request.ids:
+        entry = get_history_entry(history_id)
+        labels.append({"id": history_id, "title": entry.get("title")})
+        weights.append(WeightRequest(**entry["weights"]).as_list())
+    for i, scenario in enumerate(request.scenarios, 1):
+        labels.append({"scenario": scenario.name or f"Skenario {i}"})
+        weights.append(scenario.weights.as_list())
+
+    cache = get_correlation_cache()
+    key = (version, tuple(request.ids), tuple(tuple(round(float(w), 6) for w in ws) for ws in weights))
+    result = cache.get(key)
+    cache_status = "HIT" if result is not None else "MISS"
+    if result is None:
+        try:
+            columns = get_dataset_store().columns(version)
+        except KeyError:
+            raise HTTPException(status_code=404, detail=f"Unknown dataset version {version}")
+        X = levels_to_values(np.column_stack([columns[c] for c in LEVEL_COLUMNS]))
+        scores = topsis_scores(X, weights)
+
+        def matrix(values):
+            # NaN (a constant ranking) is not valid JSON
+            return [[None if np.isnan(v) else round(float(v), 6) for v in row] for row in values]
+
+        result = {
+            "dataset_version": version,
+            "alternatives": len(X),
+            "spearman": matrix(spearman_matrix(scores)),
+            "kendall": matrix(kendall_matrix(scores))
         }
-        
-        # Add to history (newest first)
-        history.insert(0, history_entry)
-        
-        # Keep only last 50 entries
-        history = history[:50]
-        
-        # Save
-        save_history(history)
-        
-        return {"message": "Calculation saved to history", "id": history_entry["id"]}
+        cache.put(key, result)
+    return {"labels": labels, **result}, cache_status
+
+def stored_ranking(entry):
+    """Full ranking of a history entry from its stored result, without re-scoring.
+
+    Returns (version, rows, order, scores, ranks): the catalog rows of
+    the entry's dataset version and, in rank order, row positions,
+    scores and ranks. Raises HTTPException when the entry has no stored
+    result or its dataset version is gone.
+    """
+    from result_codec import decode_result
+    from topsis_engine import rank_desc
+
+    version = entry.get("dataset_version")
+    if version is None or "result" not in entry:
+        raise HTTPException(status_code=409, detail=f"History entry {entry['id']} has no stored full ranking")
+    try:
+        rows = get_dataset_store().snapshot(version)
+    except KeyError:
+        raise HTTPException(status_code=410, detail=f"Dataset version {version} is no longer available")
+    order, scores = decode_result(entry["result"])
+    return version, rows, order, scores, rank_desc(scores)
+
+def get_history_entry(history_id):
+    entry = get_history_store().get(history_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"History entry {history_id} not found")
+    return entry
+
+@app.get("/api/history/diff")
+@offload('io')
+def diff_history(a: int, b: int):
+    """Compare the full rankings of two history entries.
+
+    Alternatives are matched by vendor and plan. `changes` lists every
+    alternative present in both, ordered by its rank in `b`, with the
+    rank movement (positive = moved up) and score difference.
+    """
+    rankings = {}
+    for history_id in (a, b):
+        _, rows, order, scores, ranks = stored_ranking(get_history_entry(history_id))
+        rankings[history_id] = {rows[pos][:2]: (int(rank), float(score))
+                                for pos, score, rank in zip(order.tolist(), scores.tolist(), ranks.tolist())}
+    before, after = rankings[a], rankings[b]
+
+    changes = []
+    for key, (rank, score) in sorted(after.items(), key=lambda item: item[1][0]):
+        if key not in before:
+            continue
+        old_rank, old_score = before[key]
+        changes.append({
+            "Vendor": key[0],
+            "Nama Paket (Plan)": key[1],
+            "rank_a": old_rank,
+            "rank_b": rank,
+            "rank_change": old_rank - rank,
+            "score_a": old_score,
+            "score_b": score,
+            "score_change": score - old_score
+        })
+
+    def listing(keys, ranking):
+        return [{"Vendor": k[0], "Nama Paket (Plan)": k[1], "Rank": ranking[k][0], "Score": ranking[k][1]}
+                for k in sorted(keys, key=lambda k: ranking[k][0])]
+
+    return {
+        "a": a,
+        "b": b,
+        "changes": changes,
+        "moved": sum(1 for c in changes if c["rank_change"]),
+        "only_in_a": listing(before.keys() - after.keys(), before),
+        "only_in_b": listing(after.keys() - before.keys(), after)
+    }
+
+@app.get("/api/history/trend")
+@offload('io')
+def history_trend(
+    vendor: str,
+    plan: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    tag: Optional[str] = None
+):
+    """Rank and score of one vendor across saved calculations, oldest first.
+
+    Read from the stored full rankings, so no calculation is re-run.
+    Without `plan` the vendor's best-ranked plan counts for each entry;
+    entries without a stored ranking are skipped.
+    """
+    entries, _ = get_history_store().query(
+        limit=limit, tag=tag, fields=["id", "timestamp", "title", "dataset_version", "result"])
+    wanted = vendor.lower(), plan.lower() if plan is not None else None
+
+    points = []
+    for entry in reversed(entries):
+        if "result" not in entry or entry.get("dataset_version") is None:
+            continue
+        try:
+            _, rows, order, scores, ranks = stored_ranking(entry)
+        except HTTPException:
+            continue
+        for pos, score, rank in zip(order.tolist(), scores.tolist(), ranks.tolist()):
+            name, row_plan = rows[pos][0], rows[pos][1]
+            if name.lower() == wanted[0] and (wanted[1] is None or str(row_plan).lower() == wanted[1]):
+                points.append({
+                    "id": entry["id"],
+                    "timestamp": entry["timestamp"],
+                    "title": entry.get("title"),
+                    "Nama Paket (Plan)": row_plan,
+                    "Rank": int(rank),
+                    "Score": float(score),
+                    "total_alternatives": len(rows)
+                })
+                break  # rank order: the first match is the best plan
+    return {"vendor": vendor, "plan": plan, "points": points}
+
+@app.get("/api/history/{history_id}/rankings")
+@offload('io')
+def get_history_rankings(history_id: int):
+    """Full stored ranking of a history entry (scores at float32 precision)"""
+    version, rows, order, scores, ranks = stored_ranking(get_history_entry(history_id))
+    return {
+        "id": history_id,
+        "dataset_version": version,
+        "rankings": [
+            {"Rank": int(rank), "No": pos + 1, "Vendor": rows[pos][0],
+             "Nama Paket (Plan)": rows[pos][1], "Score": float(score)}
+            for pos, score, rank in zip(order.tolist(), scores.tolist(), ranks.tolist())
+        ]
+    }
+
+@app.get("/api/history/{history_id}/replay")
+@offload('cpu')
+def replay_history(history_id: int):
+    """Re-run a saved calculation on the exact dataset version it was computed on"""
+    entry = get_history_store().get(history_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="History entry not found")
+    version = entry.get("dataset_version")
+    if version is None:
+        raise HTTPException(status_code=409, detail="History entry predates dataset versioning and cannot be replayed")
+
+    try:
+        weights = WeightRequest(**entry["weights"]).as_list()
+        df, res = score_input_level(weights, version)
+    except KeyError:
+        raise HTTPException(status_code=410, detail=f"Dataset version {version} is no longer available")
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+    return {"id": history_id, "dataset_version": version, "weights": entry["weights"],
+            **ranking_response(df, res)}
+
+@app.get("/api/dataset/versions")
+@offload('io')
+def get_dataset_versions():
+    """Every dataset version with its timestamp, source and row count"""
+    dataset_version()
+    return get_dataset_store().versions()
+
 @app.delete("/api/history/{history_id}")
+@offload('io')
 def delete_history(history_id: int):
     """Delete a history entry"""
     try:
-        history = load_history()
-        history = [h for h in history if h["id"] != history_id]
-        save_history(history)
+        get_history_store().delete(history_id)
         return {"message": "History entry deleted"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.delete("/api/history")
+@offload('io')
 def clear_history():
     """Clear all history"""
     try:
-        save_history([])
+        get_history_store().clear()
         return {"message": "All history cleared"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+# ==================== BACKGROUND JOBS ====================
+
+job_queue = None
+
+def get_job_queue():
+    """Open the job directory and start the job worker pool on first use"""
+    global job_queue
+    if job_queue is None:
+        from analysis_jobs import JOB_KINDS
+        from job_queue import JobQueue
+        job_queue = JobQueue(JOB_KINDS)
+    return job_queue
+
+@app.on_event("shutdown")
+def shutdown_job_queue():
+    if job_queue is not None:
+        job_queue.shutdown()
+
+CRITERIA_KEYS = ['cpu', 'ram', 'disk', 'price']
+
+class SweepJobRequest(BaseModel):
+    weights: WeightRequest
+    criterion: str = Field(pattern="^(cpu|ram|disk|price)$")
+    steps: int = Field(21, ge=2, le=1001)
+    track: int = Field(10, ge=1, le=100)
+    dataset_version: Optional[int] = None
+
+class SmaaJobRequest(BaseModel):
+    samples: int = Field(10000, ge=100, le=1_000_000)
+    ranks: int = Field(3, ge=1, le=20)
+    seed: Optional[int] = None
+    dataset_version: Optional[int] = None
+
+class BatchJobRequest(BaseModel):
+    scenarios: List[WeightRequest] = Field(min_length=1, max_length=100_000)
+    top: int = Field(5, ge=1, le=100)
+    dataset_version: Optional[int] = None
+
+class ExportJobRequest(BaseModel):
+    weights: WeightRequest
+    format: str = 'csv'
+    dataset_version: Optional[int] = None
+
+async def submit_job(kind, params, version):
+    """Queue a job on a dataset version (default: current); its columns go to the worker"""
+    from job_queue import QueueFull
+
+    if version is None:
+        version = await current_dataset_version()
+    try:
+        inputs = await run_io(get_dataset_store().columns, version)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Dataset version {version} not found")
+    try:
+        return await run_io(get_job_queue().submit, kind, {**params, "dataset_version": version}, inputs)
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+
+@app.post("/api/jobs/sweep", status_code=202)
+async def submit_sweep_job(request: SweepJobRequest):
+    """Weight sweep of one criterion from 0 to 1, tracking the top alternatives' ranks"""
+    return await submit_job('sweep', {"weights": request.weights.as_list(),
+                                      "criterion": CRITERIA_KEYS.index(request.criterion),
+                                      "steps": request.steps, "track": request.track}, request.dataset_version)
+
+@app.post("/api/jobs/smaa", status_code=202)
+async def submit_smaa_job(request: SmaaJobRequest):
+    """Rank acceptability indices over randomly sampled weights (SMAA)"""
+    return await submit_job('smaa', {"samples": request.samples, "ranks": request.ranks, "seed": request.seed},
+                            request.dataset_version)
+
+@app.post("/api/jobs/batch", status_code=202)
+async def submit_batch_job(request: BatchJobRequest):
+    """Top alternatives for many weight scenarios"""
+    return await submit_job('batch', {"scenarios": [w.as_list() for w in request.scenarios], "top": request.top},
+                            request.dataset_version)
+
+@app.post("/api/jobs/export", status_code=202)
+async def submit_export_job(request: ExportJobRequest):
+    """Full ranking written to a CSV, NDJSON or Parquet file for later download"""
+    from export_service import EXPORT_FORMATS
+
+    if request.format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format, expected one of: {', '.join(EXPORT_FORMATS)}")
+    return await submit_job('export', {"weights": request.weights.as_list(), "format": request.format,
+                                       "columns": EXPORT_COLUMNS}, request.dataset_version)
+
+@app.get("/api/jobs")
+@offload('io')
+def list_jobs():
+    """Every job still kept, newest first"""
+    return get_job_queue().list()
+
+def get_job_status(job_id):
+    job = get_job_queue().status(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.get("/api/jobs/{job_id}")
+@offload('io')
+def get_job(job_id: str):
+    """State and progress of a job"""
+    return get_job_status(job_id)
+
+@app.get("/api/jobs/{job_id}/result")
+@offload('io')
+def get_job_result(job_id: str):
+    """Result of a finished job: JSON, or the file it wrote"""
+    from fastapi.responses import FileResponse
+    from export_service import EXPORT_FORMATS
+
+    job = get_job_status(job_id)
+    if job["state"] != "done":
+        raise HTTPException(status_code=409, detail=f"Job is {job['state']}")
+    queue = get_job_queue()
+    result = queue.result(job_id)
+    if result is None:
+        raise HTTPException(status_code=410, detail="Job result is gone")
+    if "file" in result:
+        return FileResponse(queue.file_path(job_id, result["file"]), media_type=EXPORT_FORMATS[result["format"]],
+                            filename=result["file"])
+    return result
+
+@app.post("/api/jobs/{job_id}/cancel")
+@offload('io')
+def cancel_job(job_id: str):
+    """Cancel a queued job or stop a running one at its next progress report"""
+    job = get_job_queue().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.delete("/api/jobs/{job_id}")
+@offload('io')
+def delete_job(job_id: str):
+    """Cancel a job if needed and delete it with its result"""
+    if not get_job_queue().delete(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"message": "Job deleted"}
+
+# ==================== RESULT CACHE WARM-UP ====================
+
+RESULT_CACHE_WARM = int(os.environ.get('RESULT_CACHE_WARM', '8'))
+# Weight presets offered by the frontend (CalculationView default, AnalysisView scenarios)
+WARM_WEIGHTS = [[0.25, 0.25, 0.25, 0.25], [0.4, 0.4, 0.1, 0.1], [0.1, 0.1, 0.1, 0.7], [0.1, 0.2, 0.6, 0.1]]
+
+def warm_weight_sets():
+    """The presets plus the weights of the latest RESULT_CACHE_WARM history entries"""
+    from itertools import islice
+
+    weight_sets = dict.fromkeys(tuple(w) for w in WARM_WEIGHTS)
+    for entry in islice(get_history_store().iter_entries(), RESULT_CACHE_WARM):
+        weight_sets[tuple(entry['weights'][k] for k in CRITERIA_KEYS)] = None
+    return [WeightRequest(**dict(zip(CRITERIA_KEYS, w))) for w in weight_sets]
+
+async def warm_result_cache():
+    """Make sure rankings and detail matrices for the usual weights are in the result cache.
+
+    Entries already on disk (from before a restart, or written by another
+    worker) are only looked up.
+    """
+    for weights in await run_io(warm_weight_sets):
+        await coalesced_json('calculate', weights, topsis_ranking)
+        await coalesced_json('calculate-detail', weights, topsis_detail)
+
+@app.get("/api/cache")
+@offload('io')
+def get_result_cache_stats():
+    """Size, budget, hit/miss and eviction counts of the result cache"""
+    return get_result_cache().stats()
+
+# ==================== STARTUP AND HEALTH ====================
+
+# Imported during warm-up instead of by the first request that needs them
+PRELOAD_MODULES = ['numpy', 'pandas', 'openpyxl', 'matplotlib.figure', 'matplotlib.backends.backend_agg',
+                   'input_reader', 'topsis_engine', 'result_codec', 'export_service', 'report_service',
+                   'render_service', 'rank_correlation']
+startup_state = {"ready": False, "steps": {}}
+startup_task = None
+
+def preload_modules():
+    import importlib
+
+    for name in PRELOAD_MODULES:
+        importlib.import_module(name)
+
+def load_catalog():
+    """Sync the workbook into the dataset store and build the head version's columns and hash"""
+    version = dataset_version()
+    get_dataset_store().columns(version)
+    get_dataset_store().content_hash(version)
+
+def prime_engine():
+    """One full scoring pass, so the first request does not pay first-time allocations"""
+    ranking_response(*score_input_level(WARM_WEIGHTS[0], dataset_version()))
+
+async def start_password_hasher():
+    """Spawn the hashing workers now rather than on the first login"""
+    await get_password_hasher().wait_started()
+
+async def warm_up():
+    """Load everything the first requests would otherwise load, then mark the API ready.
+
+    A failing step is recorded (see /readyz) and warm-up moves on: the
+    routes report that error themselves, and the rest of the API can serve.
+    """
+    import time
+    import traceback
+
+    steps = [
+        ("imports", lambda: run_io(preload_modules)),
+        ("catalog", lambda: run_io(load_catalog)),
+        ("history", lambda: run_io(get_history_store)),
+        ("users", lambda: run_io(lambda: get_user_registry().seed())),
+        ("password_hasher", start_password_hasher),
+        ("engine", lambda: run_cpu(prime_engine)),
+        ("results", warm_result_cache),
+    ]
+    for name, step in steps:
+        started = time.perf_counter()
+        try:
+            await step()
+            startup_state["steps"][name] = {"ms": round(1000 * (time.perf_counter() - started), 1)}
+        except Exception as e:
+            traceback.print_exc()
+            startup_state["steps"][name] = {"ms": round(1000 * (time.perf_counter() - started), 1), "error": str(e)}
+    startup_state["ready"] = True
+
+@app.on_event("startup")
+async def start_warm_up():
+    # In the background: /healthz answers while the warm-up runs
+    global startup_task
+    startup_task = asyncio.get_running_loop().create_task(warm_up())
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness: the process is up and its event loop responds"""
+    return {"status": "ok"}
+
+@app.get("/readyz")
+async def readyz(response: Response):
+    """Readiness: 503 until the startup warm-up has finished, then 200"""
+    if not startup_state["ready"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return startup_state
+
+# ==================== CHART RENDERING ====================
+
+chart_renderer = None
+
+def get_chart_renderer():
+    """Create the chart render pool on first use (keeps matplotlib out of startup)"""
+    global chart_renderer
+    if chart_renderer is None:
+        from render_service import ChartRenderer
+        chart_renderer = ChartRenderer()
+    return chart_renderer
+
+def load_chart_data(weights, version=None):
+    """Score the input levels of a dataset version and bundle them for the chart renderer"""
+    from render_service import chart_data
+    from topsis_engine import PRICE_LEVEL_NAMES, VALUE_COLUMNS
+
+    df, _ = score_input_level(weights, version)
+    price_levels = [PRICE_LEVEL_NAMES.get(int(level), 'Unknown') for level in df['Price_Level']]
+    return chart_data(df['Vendor'].tolist(), df[VALUE_COLUMNS].to_numpy(), df['Score'].to_numpy(),
+                      df['Rank'].to_numpy(), price_levels, weights)
+
+@app.on_event("shutdown")
+def shutdown_chart_renderer():
+    if chart_renderer is not None:
+        chart_renderer.shutdown()
+
+@app.on_event("shutdown")
+def shutdown_executors():
+    import executors
+    executors.shutdown()
+
+@app.get("/api/chart/{panel}")
+async def get_chart(
+    panel: str,
+    cpu: float = 0.25,
+    ram: float = 0.25,
+    disk: float = 0.25,
+    price: float = 0.25,
+    fmt: str = Query('png', alias='format'),
+    dpi: int = Query(100, ge=50, le=300)
+):
+    """Render a single chart panel or the full dashboard as PNG/SVG"""
+    from render_service import FORMATS, PANELS
+
+    if panel not in PANELS:
+        raise HTTPException(status_code=404, detail=f"Unknown panel, expected one of: {', '.join(PANELS)}")
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format, expected one of: {', '.join(FORMATS)}")
+
+    weights = WeightRequest(cpu=cpu, ram=ram, disk=disk, price=price).as_list()
+    renderer = get_chart_renderer()
+    version = await current_dataset_version()
+    key = renderer.cache_key(version, weights, panel, fmt, dpi)
+
+    content = renderer.cache.get(key)
+    cache_status = "HIT"
+    if content is None:
+        # Then the disk cache, which survives restarts and is shared by workers
+        disk_key = await run_io(result_key, 'chart', version, weights, panel=panel, format=fmt, dpi=dpi)
+        content = await run_io(get_result_cache().get, disk_key)
+        if content is not None:
+            renderer.cache.put(key, content)
+    if content is None:
+        cache_status = "MISS"
+        try:
+            # Render on the bounded pool; the event loop stays free meanwhile
+            future = renderer.submit(key, lambda: load_chart_data(weights, version), panel, fmt, dpi)
+            content = await asyncio.wrap_future(future)
+            await run_io(get_result_cache().put, disk_key, content)
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            raise HTTPException(status_code=500, detail=str(e))
+
+    return Response(content=content, media_type=FORMATS[fmt], headers={"X-Cache": cache_status})
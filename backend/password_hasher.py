@@ -0,0 +1,107 @@
+"""PBKDF2 password hashing off the request threads.
+
+Each hash costs PBKDF2_ITERATIONS rounds of SHA-256 (tens of
+milliseconds of CPU). PasswordHasher runs them in a small process pool
+behind an AdmissionGate sized to that pool: a login burst queues (up to
+PASSWORD_HASH_QUEUE requests, then gets 503) instead of occupying the
+API's worker threads and CPU that /api/calculate needs.
+"""
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import secrets
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from admission import AdmissionGate
+
+PBKDF2_ITERATIONS = 100000
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', str(max(1, min(2, (os.cpu_count() or 2) // 2)))))
+PASSWORD_HASH_QUEUE = int(os.environ.get('PASSWORD_HASH_QUEUE', '32'))
+PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT', '10'))
+
+
+def hash_password(password: str) -> str:
+    """Hash a password using PBKDF2 with SHA-256"""
+    # Generate a random salt
+    salt = secrets.token_hex(16)
+    # Hash the password with the salt
+    pwd_hash = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt.encode('utf-8'), PBKDF2_ITERATIONS)
+    # Return salt and hash combined
+    return f"{salt}${pwd_hash.hex()}"
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against a hash"""
+    try:
+        salt, pwd_hash = hashed_password.split('$')
+        # Hash the provided password with the same salt
+        new_hash = hashlib.pbkdf2_hmac('sha256', plain_password.encode('utf-8'), salt.encode('utf-8'), PBKDF2_ITERATIONS)
+        # Compare hashes
+        return secrets.compare_digest(new_hash.hex(), pwd_hash)
+    except Exception:
+        return False
+
+
+class _Timing:
+    __slots__ = ('count', 'total', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def summary(self):
+        return {"count": self.count,
+                "mean_ms": 1000 * self.total / self.count if self.count else 0.0,
+                "max_ms": 1000 * self.max}
+
+
+class PasswordHasher:
+    """Bounded process pool for hash/verify; create it on the event loop that uses it"""
+
+    def __init__(self, workers=PASSWORD_HASH_WORKERS, queue=PASSWORD_HASH_QUEUE, timeout=PASSWORD_HASH_TIMEOUT):
+        # spawn, not fork: the API process has threads of its own
+        self._executor = ProcessPoolExecutor(max_workers=workers,
+                                             mp_context=multiprocessing.get_context('spawn'))
+        self.gate = AdmissionGate('password hashing', limit=workers, queue=queue, timeout=timeout)
+        self.timings = {'hash': _Timing(), 'verify': _Timing()}
+        # Start the workers now so the first login does not pay for the spawn
+        self._warming = [self._executor.submit(int) for _ in range(workers)]
+
+    async def wait_started(self):
+        """Return once the worker processes have booted and answered"""
+        await asyncio.gather(*map(asyncio.wrap_future, self._warming))
+
+    async def _run(self, op, fn, *args):
+        """Run fn in the pool; returns (result, {"queue": s, op: s}) for Server-Timing"""
+        queued = time.perf_counter()
+        async with self.gate.admit():
+            started = time.perf_counter()
+            result = await asyncio.wrap_future(self._executor.submit(fn, *args))
+        elapsed = time.perf_counter() - started
+        self.timings[op].add(elapsed)
+        return result, {"queue": started - queued, op: elapsed}
+
+    async def hash(self, password):
+        return await self._run('hash', hash_password, password)
+
+    async def verify(self, plain_password, hashed_password):
+        return await self._run('verify', verify_password, plain_password, hashed_password)
+
+    def stats(self):
+        return {"gate": self.gate.stats(), **{op: t.summary() for op, t in self.timings.items()}}
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def server_timing(timings):
+    """Format {"name": seconds} as a Server-Timing header value"""
+    return ', '.join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items())
@@ -0,0 +1,149 @@
+"""Spearman and Kendall rank-correlation matrices between score vectors.
+
+Each row of the input is one calculation's scores over the same
+alternatives. Spearman is the Pearson correlation of tie-averaged rank
+rows, computed for all rows with one `corrcoef`. Kendall's tau-b uses
+one matrix product over the pairwise sign rows while those fit in
+memory, and Knight's O(n log n) merge-sort algorithm per pair of rows
+beyond that. Finished matrices are kept in a small LRU.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+CORRELATION_CACHE_SIZE = int(os.environ.get('CORRELATION_CACHE_SIZE', '64'))
+# Largest rows x pairs sign matrix (float32 cells) built for the matrix-product Kendall
+KENDALL_DENSE_CELLS = 4_000_000
+
+
+def average_ranks(S):
+    """Rank every row of S ascending (1-based), ties getting their average rank"""
+    S = np.atleast_2d(np.asarray(S, dtype=float))
+    k, n = S.shape
+    order = np.argsort(S, axis=1, kind='stable')
+    ordered = np.take_along_axis(S, order, axis=1)
+
+    starts = np.ones((k, n), dtype=bool)
+    starts[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    group = np.cumsum(starts.ravel()) - 1  # tie groups, numbered across all rows
+    positions = np.tile(np.arange(1, n + 1, dtype=float), k)
+    mean_pos = np.bincount(group, weights=positions) / np.bincount(group)
+
+    ranks = np.empty((k, n))
+    np.put_along_axis(ranks, order, mean_pos[group].reshape(k, n), axis=1)
+    return ranks
+
+
+def spearman_matrix(S):
+    """Spearman's rho between every pair of rows (NaN where a row is constant)"""
+    ranks = average_ranks(S)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.corrcoef(ranks) if len(ranks) > 1 else np.ones((1, 1))
+
+
+def _tied_pairs(values):
+    _, counts = np.unique(values, return_counts=True)
+    return int((counts * (counts - 1) // 2).sum())
+
+
+def _count_inversions(values):
+    """Pairs i < j with values[i] > values[j], by bottom-up merge sort.
+
+    Each level merges all pairs of sorted blocks at once: a block pair's
+    number is folded into the sort key, so one searchsorted over the left
+    blocks counts, for every right element, the larger left elements.
+    """
+    _, a = np.unique(values, return_inverse=True)
+    a = a.ravel().astype(np.int64)
+    n = len(a)
+    span = int(a.max()) + 1 if n else 1
+    index = np.arange(n)
+    inversions = 0
+    width = 1
+    while width < n:
+        block = index // width
+        pair = block // 2
+        right = (block % 2).astype(bool)
+        keys = pair * span + a
+        left_keys, right_keys = keys[~right], keys[right]
+        left_end = np.searchsorted(left_keys, (pair[right] + 1) * span, side='left')
+        inversions += int((left_end - np.searchsorted(left_keys, right_keys, side='right')).sum())
+        a = np.sort(keys) - (index // (2 * width)) * span
+        width *= 2
+    return inversions
+
+
+def kendall_tau(x, y):
+    """Kendall's tau-b of two equally long vectors in O(n log n) (Knight, 1966)"""
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    n = len(x)
+    order = np.lexsort((y, x))
+    x, y = x[order], y[order]
+
+    pairs = n * (n - 1) // 2
+    ties_x = _tied_pairs(x)
+    ties_y = _tied_pairs(y)
+    # Equal (x, y) pairs are adjacent after the lexsort
+    if n:
+        joint = np.concatenate(([True], (x[1:] != x[:-1]) | (y[1:] != y[:-1]), [True]))
+        runs = np.diff(np.flatnonzero(joint))
+        ties_xy = int((runs * (runs - 1) // 2).sum())
+    else:
+        ties_xy = 0
+    # Sorted by x (then y), every inversion left in y is a discordant pair
+    discordant = _count_inversions(y)
+    concordant_minus_discordant = pairs - ties_x - ties_y + ties_xy - 2 * discordant
+
+    denominator = np.sqrt(float(pairs - ties_x) * float(pairs - ties_y))
+    return concordant_minus_discordant / denominator if denominator else float('nan')
+
+
+def kendall_matrix(S):
+    """Kendall's tau-b between every pair of rows of S"""
+    S = np.atleast_2d(np.asarray(S, dtype=float))
+    k, n = S.shape
+    pairs = n * (n - 1) // 2
+
+    if k * pairs <= KENDALL_DENSE_CELLS:
+        # One sign row per calculation over all alternative pairs:
+        # tau-b = (s_a . s_b) / sqrt(nonzero(s_a) * nonzero(s_b))
+        i, j = np.triu_indices(n, 1)
+        signs = np.sign(S[:, i] - S[:, j]).astype(np.float32)
+        untied = np.count_nonzero(signs, axis=1).astype(float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            tau = (signs @ signs.T).astype(float) / np.sqrt(np.outer(untied, untied))
+        np.fill_diagonal(tau, np.where(untied > 0, 1.0, np.nan))
+        return tau
+
+    tau = np.empty((k, k))
+    for a in range(k):
+        for b in range(a + 1, k):
+            tau[a, b] = tau[b, a] = kendall_tau(S[a], S[b])
+    constant = n < 2 or (S.min(axis=1) == S.max(axis=1))
+    np.fill_diagonal(tau, np.where(constant, np.nan, 1.0))
+    return tau
+
+
+class CorrelationCache:
+    """Thread-safe LRU of finished correlation results"""
+
+    def __init__(self, max_entries=CORRELATION_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
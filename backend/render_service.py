@@ -0,0 +1,304 @@
+"""Server-side chart rendering for TOPSIS results.
+
+Charts are drawn with the non-interactive Agg backend on standalone
+Figure objects (no pyplot state), so they can be rendered from worker
+threads. Rendered bytes are cached per (dataset version, weights, panel,
+format, dpi) and renders run in a small bounded pool, away from the API
+request threads.
+"""
+import io
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+PANELS = ['dashboard', 'ranking', 'radar', 'weights', 'scatter', 'heatmap', 'distribution']
+FORMATS = {'png': 'image/png', 'svg': 'image/svg+xml', 'pdf': 'application/pdf'}
+
+RENDER_WORKERS = int(os.environ.get('RENDER_WORKERS', '2'))
+RENDER_CACHE_SIZE = int(os.environ.get('RENDER_CACHE_SIZE', '128'))
+
+COLORS = {
+    'primary': '#2563EB', 'success': '#10B981', 'warning': '#F59E0B',
+    'danger': '#EF4444', 'purple': '#8B5CF6', 'bg': '#F8FAFC',
+    'card': '#FFFFFF', 'text': '#1E293B', 'muted': '#64748B'
+}
+PRICE_COLORS = {'Sangat Murah': COLORS['success'], 'Murah': '#6EE7B7',
+                'Sedang': COLORS['warning'], 'Mahal': '#FB923C', 'Sangat Mahal': COLORS['danger']}
+
+# Figure size (inches) for each standalone panel
+PANEL_SIZES = {
+    'dashboard': (20, 12), 'ranking': (10, 6), 'radar': (7, 6), 'weights': (7, 6),
+    'scatter': (10, 6), 'heatmap': (7, 5), 'distribution': (7, 5)
+}
+
+_mpl_lock = threading.Lock()
+_mpl_ready = False
+
+
+def _setup_matplotlib():
+    """Import matplotlib once with the Agg backend and the dashboard style"""
+    global _mpl_ready
+    with _mpl_lock:
+        if not _mpl_ready:
+            import matplotlib
+            matplotlib.use('Agg')
+            import matplotlib.style
+            matplotlib.style.use('seaborn-v0_8-whitegrid')
+            _mpl_ready = True
+
+
+def chart_data(vendors, values, scores, ranks, price_levels, weights):
+    """Bundle the arrays a chart needs, sorted by rank (best first)"""
+    order = np.argsort(np.asarray(ranks), kind='stable')
+    return {
+        'vendors': [vendors[i] for i in order],
+        'values': np.asarray(values, dtype=float)[order],
+        'scores': np.asarray(scores, dtype=float)[order],
+        'ranks': np.asarray(ranks, dtype=int)[order],
+        'price_levels': [price_levels[i] for i in order],
+        'weights': [float(w) for w in weights],
+    }
+
+
+def _draw_header(ax, data):
+    ax.set_facecolor(COLORS['primary'])
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+    ax.axis('off')
+    ax.text(0.5, 0.6, '🚀 SPK PEMILIHAN SERVER CLOUD TERBAIK', fontsize=20,
+            fontweight='bold', ha='center', va='center', color='white')
+    # No render date: charts are cached (on disk, across restarts) by data and weights only
+    ax.text(0.5, 0.2, f'Metode TOPSIS  •  {len(data["vendors"])} Alternatif  •  4 Kriteria',
+            fontsize=11, ha='center', va='center', color='#BFDBFE')
+
+
+def _draw_ranking(ax, data):
+    from matplotlib import cm
+
+    ax.set_facecolor(COLORS['card'])
+    n = min(10, len(data['vendors']))
+    scores = data['scores'][:n]
+    gradient = cm.Blues(np.linspace(0.9, 0.4, n))
+    ax.barh(range(n), scores, color=gradient, height=0.7, edgecolor='white', linewidth=2)
+
+    medals = ['🥇', '🥈', '🥉'] + [''] * 7
+    ax.set_yticks(range(n))
+    ax.set_yticklabels([f"{medals[i]} {data['vendors'][i]}" for i in range(n)],
+                       fontsize=10, fontweight='bold')
+    ax.invert_yaxis()
+    ax.set_xlim(0, 1.15)
+    ax.set_xlabel('')
+    ax.spines[['top', 'right', 'bottom']].set_visible(False)
+    ax.tick_params(bottom=False, labelbottom=False)
+
+    for i in range(n):
+        ax.text(scores[i] + 0.02, i, f"{scores[i]:.4f}", va='center',
+                fontsize=10, fontweight='bold', color=COLORS['text'])
+        ax.text(1.08, i, f"${data['values'][i, 3]:.0f}", va='center', fontsize=9,
+                color=COLORS['muted'], ha='center')
+
+    ax.text(1.08, -0.8, 'Harga', fontsize=9, ha='center', color=COLORS['muted'], style='italic')
+    ax.set_title('🏆 TOP 10 RANKING', fontsize=13, fontweight='bold', color=COLORS['text'], loc='left', pad=15)
+
+
+def _draw_radar(ax, data):
+    angles = np.linspace(0, 2 * np.pi, 4, endpoint=False).tolist() + [0]
+    radar_colors = [COLORS['primary'], COLORS['warning'], COLORS['success']]
+
+    for i in range(min(3, len(data['vendors']))):
+        cpu, ram, disk, price = data['values'][i]
+        values = [cpu / 10, ram / 20, disk / 1500, 1 - (price / 150)] + [cpu / 10]
+        ax.plot(angles, values, 'o-', linewidth=2.5, color=radar_colors[i],
+                label=f"#{data['ranks'][i]} {data['vendors'][i]}", markersize=7)
+        ax.fill(angles, values, alpha=0.15, color=radar_colors[i])
+
+    ax.set_xticks(angles[:-1])
+    ax.set_xticklabels(['CPU', 'RAM', 'Disk I/O', 'Harga\n(inverse)'], fontsize=10, fontweight='bold')
+    ax.set_ylim(0, 1)
+    ax.set_yticks([0.25, 0.5, 0.75])
+    ax.set_yticklabels(['25%', '50%', '75%'], fontsize=8, color=COLORS['muted'])
+    ax.legend(loc='upper right', bbox_to_anchor=(1.3, 1.15), fontsize=9, frameon=True)
+    ax.set_title('🎯 TOP 3 COMPARISON', fontsize=13, fontweight='bold', pad=20, color=COLORS['text'])
+
+
+def _draw_weights(ax, data):
+    ax.set_facecolor(COLORS['card'])
+    pie_colors = [COLORS['primary'], COLORS['success'], COLORS['purple'], COLORS['danger']]
+    wedges, _, autotexts = ax.pie(
+        data['weights'], labels=['CPU', 'RAM', 'Disk I/O', 'Harga'],
+        autopct='%1.0f%%', colors=pie_colors, startangle=90,
+        wedgeprops={'linewidth': 3, 'edgecolor': 'white'},
+        textprops={'fontsize': 11, 'fontweight': 'bold'},
+        pctdistance=0.75
+    )
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_fontweight('bold')
+
+    legend_labels = ['CPU (BENEFIT)', 'RAM (BENEFIT)', 'Disk I/O (BENEFIT)', 'Harga (COST)']
+    ax.legend(wedges, legend_labels, loc='lower center', bbox_to_anchor=(0.5, -0.15),
+              fontsize=9, ncol=2, frameon=False)
+    ax.set_title('⚖️ BOBOT KRITERIA', fontsize=13, fontweight='bold', color=COLORS['text'], pad=10)
+
+
+def _draw_scatter(ax, data):
+    ax.set_facecolor(COLORS['card'])
+    levels = np.array(data['price_levels'])
+    for level, color in PRICE_COLORS.items():
+        mask = levels == level
+        if mask.any():
+            ax.scatter(data['values'][mask, 3], data['scores'][mask],
+                       c=color, s=150, alpha=0.8, edgecolors='white', linewidth=2, label=level)
+
+    for i in range(min(3, len(data['vendors']))):
+        ax.annotate(f"#{data['ranks'][i]} {data['vendors'][i]}",
+                    xy=(data['values'][i, 3], data['scores'][i]),
+                    xytext=(10, 10), textcoords='offset points',
+                    fontsize=9, fontweight='bold',
+                    bbox=dict(boxstyle='round,pad=0.4', facecolor='white', edgecolor=COLORS['primary'], alpha=0.9),
+                    arrowprops=dict(arrowstyle='->', color=COLORS['primary'], lw=1.5))
+
+    ax.set_xlabel('Harga (USD/Bulan)', fontsize=11, fontweight='bold', color=COLORS['text'])
+    ax.set_ylabel('Score TOPSIS', fontsize=11, fontweight='bold', color=COLORS['text'])
+    ax.legend(loc='lower left', fontsize=9, frameon=True, title='Level Harga', title_fontsize=10)
+    ax.spines[['top', 'right']].set_visible(False)
+    ax.grid(True, alpha=0.3, linestyle='--')
+    ax.set_title('💰 HARGA vs SCORE', fontsize=13, fontweight='bold', color=COLORS['text'], loc='left', pad=15)
+
+
+def _draw_heatmap(ax, data):
+    import seaborn as sns
+
+    heatmap_data = data['values'][:5]
+    spread = heatmap_data.max(axis=0) - heatmap_data.min(axis=0) + 0.001
+    hm_norm = (heatmap_data - heatmap_data.min(axis=0)) / spread
+    hm_norm[:, 3] = 1 - hm_norm[:, 3]  # Inverse harga
+
+    sns.heatmap(hm_norm.T, annot=heatmap_data.T, fmt='.0f', cmap='RdYlGn',
+                xticklabels=[f"#{r}" for r in data['ranks'][:5]],
+                yticklabels=['CPU', 'RAM', 'I/O', 'Harga'],
+                cbar=False, ax=ax, linewidths=3, linecolor='white',
+                annot_kws={'fontsize': 11, 'fontweight': 'bold'})
+    ax.set_xticklabels(ax.get_xticklabels(), fontsize=10, fontweight='bold')
+    ax.set_yticklabels(ax.get_yticklabels(), fontsize=10, fontweight='bold')
+    ax.set_title('🔥 TOP 5 HEATMAP', fontsize=13, fontweight='bold', color=COLORS['text'], pad=15)
+
+
+def _draw_distribution(ax, data):
+    ax.set_facecolor(COLORS['card'])
+    # I/O is divided by 10 to keep it on the same scale as the other criteria
+    scale = np.array([1, 1, 10, 1])
+    top5_avg = data['values'][:5].mean(axis=0) / scale
+    all_avg = data['values'].mean(axis=0) / scale
+
+    x = np.arange(4)
+    width = 0.35
+    bars1 = ax.bar(x - width/2, top5_avg, width, label='Top 5', color=COLORS['primary'], edgecolor='white', linewidth=2)
+    ax.bar(x + width/2, all_avg, width, label='Semua', color=COLORS['muted'], alpha=0.6, edgecolor='white', linewidth=2)
+
+    ax.set_xticks(x)
+    ax.set_xticklabels(['CPU\n(Core)', 'RAM\n(GB)', 'I/O\n(MB/s)', 'Harga\n($)'], fontsize=10, fontweight='bold')
+    ax.legend(fontsize=10, loc='upper right', frameon=True)
+    ax.spines[['top', 'right']].set_visible(False)
+    ax.set_title('📊 TOP 5 vs RATA-RATA', fontsize=13, fontweight='bold', color=COLORS['text'], loc='left', pad=15)
+
+    for bar in bars1:
+        ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.5,
+                f'{bar.get_height():.1f}', ha='center', fontsize=9, fontweight='bold', color=COLORS['primary'])
+
+
+_DRAW = {
+    'ranking': _draw_ranking, 'radar': _draw_radar, 'weights': _draw_weights,
+    'scatter': _draw_scatter, 'heatmap': _draw_heatmap, 'distribution': _draw_distribution,
+}
+
+
+def _build_dashboard(fig, data):
+    gs = fig.add_gridspec(3, 4, height_ratios=[0.12, 1, 1], hspace=0.25, wspace=0.25,
+                          left=0.04, right=0.96, top=0.95, bottom=0.05)
+    _draw_header(fig.add_subplot(gs[0, :]), data)
+    _draw_ranking(fig.add_subplot(gs[1, :2]), data)
+    _draw_radar(fig.add_subplot(gs[1, 2], projection='polar'), data)
+    _draw_weights(fig.add_subplot(gs[1, 3]), data)
+    _draw_scatter(fig.add_subplot(gs[2, :2]), data)
+    _draw_heatmap(fig.add_subplot(gs[2, 2]), data)
+    _draw_distribution(fig.add_subplot(gs[2, 3]), data)
+
+
+def render_chart(data, panel='dashboard', fmt='png', dpi=100):
+    """Render one panel (or the full dashboard) and return the encoded bytes"""
+    if panel not in PANELS:
+        raise ValueError(f"Unknown panel '{panel}', expected one of: {', '.join(PANELS)}")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format '{fmt}', expected one of: {', '.join(FORMATS)}")
+
+    _setup_matplotlib()
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=PANEL_SIZES[panel], facecolor=COLORS['bg'])
+    FigureCanvasAgg(fig)
+    if panel == 'dashboard':
+        _build_dashboard(fig, data)
+    else:
+        ax = fig.add_subplot(111, projection='polar' if panel == 'radar' else None)
+        _DRAW[panel](ax, data)
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt, dpi=dpi, bbox_inches='tight', facecolor=COLORS['bg'])
+    return buf.getvalue()
+
+
+class ChartCache:
+    """Thread-safe LRU cache of rendered chart bytes"""
+
+    def __init__(self, max_entries=RENDER_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+class ChartRenderer:
+    """Renders charts in a bounded worker pool with a shared byte cache"""
+
+    def __init__(self, workers=RENDER_WORKERS, cache=None):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='chart-render')
+        self.cache = cache or ChartCache()
+
+    @staticmethod
+    def cache_key(dataset_version, weights, panel, fmt, dpi):
+        return (dataset_version, tuple(round(float(w), 6) for w in weights), panel, fmt, int(dpi))
+
+    def submit(self, key, load_data, panel, fmt, dpi):
+        """Return a Future of the rendered bytes; load_data() runs on the worker"""
+        def job():
+            data = load_data()
+            content = render_chart(data, panel, fmt, dpi)
+            self.cache.put(key, content)
+            return content
+
+        return self.executor.submit(job)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
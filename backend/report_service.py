@@ -0,0 +1,108 @@
+"""Step-by-step TOPSIS workbook reports built from engine results.
+
+The workbook is written in openpyxl write-only mode directly from the
+engine's intermediate matrices (no per-cell addressing, no re-parsing).
+Finished files go to the shared result cache (see result_cache), so a
+repeated download is just a file send.
+"""
+XLSX_MEDIA_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+MATRIX_HEADERS = ['Alternatif', 'CPU (C1)', 'RAM (C2)', 'Disk I/O (C3)', 'Harga (C4)']
+CRITERIA_HEADERS = ['Kriteria', 'CPU (C1)', 'RAM (C2)', 'Disk I/O (C3)', 'Harga (C4)']
+
+
+def _create_workbook():
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, NamedStyle, PatternFill
+
+    wb = Workbook(write_only=True)
+    wb.add_named_style(NamedStyle(
+        name='header', font=Font(bold=True, color="FFFFFF", size=11),
+        fill=PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")))
+    wb.add_named_style(NamedStyle(name='title', font=Font(bold=True, size=14, color="1F4E78")))
+    wb.add_named_style(NamedStyle(name='subtitle', font=Font(italic=True, size=10)))
+    return wb
+
+
+def _styled(ws, value, style):
+    from openpyxl.cell import WriteOnlyCell
+
+    cell = WriteOnlyCell(ws, value=value)
+    cell.style = style
+    return cell
+
+
+def _start_sheet(wb, title, heading, headers, widths, subtitle=None):
+    """Create a sheet with fixed column widths, a title block and a header row"""
+    from openpyxl.utils import get_column_letter
+
+    ws = wb.create_sheet(title)
+    for idx, width in enumerate(widths, 1):
+        ws.column_dimensions[get_column_letter(idx)].width = width
+    ws.append([_styled(ws, heading, 'title')])
+    ws.append([_styled(ws, subtitle, 'subtitle')] if subtitle else [])
+    ws.append([_styled(ws, h, 'header') for h in headers])
+    return ws
+
+
+def build_workbook(path, df, res, weights):
+    """Write the step-by-step workbook for one scored dataset to `path`.
+
+    `df` is the scored input frame (levels and *_val columns) and `res`
+    the matching `topsis_engine.topsis` result.
+    """
+    from topsis_engine import CRITERIA_TYPES, LEVEL_COLUMNS, VALUE_COLUMNS
+
+    wb = _create_workbook()
+    n = len(df)
+    labels = [f"A{i + 1}" for i in range(n)]
+    vendors = df['Vendor'].tolist()
+    matrix_widths = [14, 16, 16, 16, 16]
+
+    # 1. Input: levels next to the values they convert to
+    headers = ['No', 'Vendor', 'Nama Paket', 'CPU Lvl', 'CPU', 'RAM Lvl', 'RAM',
+               'I/O Lvl', 'Disk I/O', 'Harga Lvl', 'Harga']
+    ws = _start_sheet(wb, "1. Data Input", "DATA INPUT (LEVEL DAN NILAI)", headers,
+                      [6, 20, 30] + [10] * 8)
+    columns = [df[level].tolist() for level in LEVEL_COLUMNS]
+    values = [df[value].tolist() for value in VALUE_COLUMNS]
+    interleaved = [col for pair in zip(columns, values) for col in pair]
+    for row in zip(range(1, n + 1), vendors, df['Nama Paket (Plan)'].tolist(), *interleaved):
+        ws.append(row)
+
+    # 2. Weights and criterion types
+    ws = _start_sheet(wb, "2. Bobot & Kriteria", "BOBOT DAN TIPE KRITERIA", CRITERIA_HEADERS,
+                      matrix_widths)
+    ws.append(["Tipe"] + list(CRITERIA_TYPES))
+    ws.append(["Bobot (W)"] + [float(w) for w in weights])
+    ws.append(["Total Bobot"] + [float(sum(weights))])
+
+    # 3. Normalized matrix, with the per-criterion divisors above the data
+    ws = _start_sheet(wb, "3. Normalisasi", "MATRIKS TERNORMALISASI (R)", MATRIX_HEADERS,
+                      matrix_widths, subtitle="Rumus: rij = xij / √(Σxij²)")
+    ws.append(["√(Σxij²)"] + res['divisors'].tolist())
+    for label, row in zip(labels, res['normalized'].tolist()):
+        ws.append([label] + row)
+
+    # 4. Weighted matrix
+    ws = _start_sheet(wb, "4. Normalisasi Terbobot", "MATRIKS TERNORMALISASI TERBOBOT (Y)",
+                      MATRIX_HEADERS, matrix_widths, subtitle="Rumus: yij = wj × rij")
+    for label, row in zip(labels, res['weighted'].tolist()):
+        ws.append([label] + row)
+
+    # 5. Ideal solutions
+    ws = _start_sheet(wb, "5. Solusi Ideal", "SOLUSI IDEAL POSITIF (A+) DAN NEGATIF (A-)",
+                      CRITERIA_HEADERS, [20, 16, 16, 16, 16],
+                      subtitle="BENEFIT: A+ = MAX, A- = MIN; COST: A+ = MIN, A- = MAX")
+    ws.append(["A+ (Ideal Positif)"] + res['ideal_pos'].tolist())
+    ws.append(["A- (Ideal Negatif)"] + res['ideal_neg'].tolist())
+
+    # 6. Distances, score and rank
+    ws = _start_sheet(wb, "6. Jarak & Score TOPSIS", "PERHITUNGAN JARAK DAN SCORE TOPSIS",
+                      ['Alternatif', 'Vendor', 'D+ (Jarak ke A+)', 'D- (Jarak ke A-)', 'Score', 'Rank'],
+                      [12, 20, 18, 18, 12, 8], subtitle="Score = D- / (D+ + D-)")
+    for row in zip(labels, vendors, res['d_pos'].tolist(), res['d_neg'].tolist(),
+                   res['scores'].tolist(), res['ranks'].tolist()):
+        ws.append(row)
+
+    wb.save(path)
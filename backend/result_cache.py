@@ -0,0 +1,160 @@
+"""Disk-backed, size-bounded cache of engine outputs and rendered artifacts.
+
+Entries are files named by a content address: the SHA-256 of a
+namespace, the dataset's content hash and the request parameters. A
+restarted API, or another uvicorn worker on the same host, finds the
+same entries for the same data without any coordination, since files
+are only ever published with an atomic rename.
+
+Reads refresh a file's mtime, and eviction removes the least recently
+used files until the directory is back under RESULT_CACHE_BYTES. Each
+process keeps a running byte count of the directory and rescans it when
+that goes over budget (or every RESULT_CACHE_RESCAN seconds), so writes
+by other workers are picked up without a shared index.
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+
+RESULT_CACHE_DIR = os.environ.get('RESULT_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'spk_kajek_cache'))
+RESULT_CACHE_BYTES = int(os.environ.get('RESULT_CACHE_BYTES', str(256 * 1024 * 1024)))
+RESULT_CACHE_RESCAN = float(os.environ.get('RESULT_CACHE_RESCAN', '60'))
+# Eviction frees down to this share of the budget so it does not run on every write
+LOW_WATER = 0.9
+# Temp files older than this were left by a crashed writer
+STALE_TMP_SECONDS = 3600
+
+_ENTRY = re.compile(r'[0-9a-f]{64}')
+
+
+class ResultCache:
+    """Content-addressed files in one directory, LRU-evicted by total bytes"""
+
+    def __init__(self, directory=RESULT_CACHE_DIR, max_bytes=RESULT_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = None
+        self._scanned = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(namespace, dataset_hash, params):
+        """Content address of an entry; `params` must be JSON-serializable"""
+        payload = json.dumps([namespace, dataset_hash, params], sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key)
+
+    # ---------- reads ----------
+
+    def open(self, key):
+        """The entry opened for reading, or None; a hit refreshes its LRU position.
+
+        The open handle stays readable even if the entry is evicted while
+        it is being sent.
+        """
+        path = self.path(key)
+        try:
+            f = open(path, 'rb')
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        self.hits += 1
+        return f
+
+    def get(self, key):
+        """The entry's bytes, or None"""
+        f = self.open(key)
+        if f is None:
+            return None
+        with f:
+            return f.read()
+
+    # ---------- writes ----------
+
+    def put(self, key, content):
+        """Store bytes under `key`"""
+        def write(tmp_path):
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+        self.put_file(key, write).close()
+
+    def put_file(self, key, build):
+        """Run `build(tmp_path)`, publish the file atomically under `key` and return it opened for reading"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        os.close(fd)
+        try:
+            build(tmp_path)
+            f = open(tmp_path, 'rb')  # opened first, so eviction cannot take it from the caller
+            os.replace(tmp_path, self.path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._added(os.fstat(f.fileno()).st_size)
+        return f
+
+    def _added(self, size):
+        with self._lock:
+            if self._size is None or time.monotonic() - self._scanned >= RESULT_CACHE_RESCAN:
+                self._scan()
+            else:
+                self._size += size
+            if self._size > self.max_bytes:
+                self._evict(self._scan())
+
+    def _scan(self):
+        """Recount the directory (called with the lock held); returns (mtime_ns, size, path) per entry"""
+        entries = []
+        stale = time.time() - STALE_TMP_SECONDS
+        with os.scandir(self.directory) as it:
+            for item in it:
+                try:
+                    st = item.stat()
+                except FileNotFoundError:
+                    continue
+                if _ENTRY.fullmatch(item.name):
+                    entries.append((st.st_mtime_ns, st.st_size, item.path))
+                elif item.name.endswith('.tmp') and st.st_mtime < stale:
+                    self._remove(item.path)
+        self._size = sum(size for _, size, _ in entries)
+        self._scanned = time.monotonic()
+        return entries
+
+    def _evict(self, entries):
+        entries.sort()
+        target = self.max_bytes * LOW_WATER
+        for _, size, path in entries:
+            if self._size <= target:
+                break
+            if self._remove(path):
+                self._size -= size
+                self.evicted += 1
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False  # already gone, or still open on platforms that lock open files
+
+    def stats(self):
+        with self._lock:
+            if self._size is None:
+                self._scan()
+            return {"bytes": self._size, "max_bytes": self.max_bytes,
+                    "hits": self.hits, "misses": self.misses, "evicted": self.evicted}
@@ -0,0 +1,64 @@
+"""Compact binary encoding of a full ranking for history entries.
+
+A history entry stores its complete result, not just the top five,
+in a few hundred bytes:
+
+    {"rows": 21, "order": "<base64>", "scores": "<base64>", "encoding": 1}
+
+- `order` is the rank order as row positions (0-based) in the entry's
+  dataset version, packed little-endian as uint16, or uint32 when the
+  catalog has more than 65535 rows.
+- `scores` are the float32 scores in that same rank order. Sorted scores
+  change little from one to the next, so each value is XOR-ed with the
+  previous one (sign, exponent and leading mantissa bits cancel out)
+  and the deltas are zlib-compressed.
+
+Vendor names are not repeated: they come from the dataset store's
+snapshot of the entry's version.
+"""
+import base64
+import zlib
+
+import numpy as np
+
+ENCODING = 1
+
+
+def _b64(data):
+    return base64.b64encode(data).decode('ascii')
+
+
+def encode_result(scores):
+    """Pack the scores of one calculation (in row order) into a result blob dict"""
+    scores = np.asarray(scores, dtype=np.float64)
+    n = len(scores)
+    order = np.argsort(-scores, kind='stable')
+    order = order.astype('<u2' if n <= 0xFFFF else '<u4')
+
+    bits = scores[order].astype('<f4').view('<u4')
+    deltas = bits.copy()
+    deltas[1:] ^= bits[:-1]
+    return {
+        "rows": n,
+        "order": _b64(order.tobytes()),
+        "scores": _b64(zlib.compress(deltas.tobytes(), 9)),
+        "encoding": ENCODING,
+    }
+
+
+def decode_result(blob):
+    """Inverse of encode_result: (order, scores), both in rank order.
+
+    `order` holds row positions (int64) and `scores` float64 values of
+    float32 precision.
+    """
+    if blob.get("encoding") != ENCODING:
+        raise ValueError(f"Unsupported result encoding {blob.get('encoding')!r}")
+    n = blob["rows"]
+    order = np.frombuffer(base64.b64decode(blob["order"]), dtype='<u2' if n <= 0xFFFF else '<u4')
+    deltas = np.frombuffer(zlib.decompress(base64.b64decode(blob["scores"])), dtype='<u4')
+    if len(order) != n or len(deltas) != n:
+        raise ValueError("Result blob is truncated")
+    bits = np.bitwise_xor.accumulate(deltas) if n else deltas
+    return order.astype(np.int64), bits.view('<f4').astype(np.float64)
+
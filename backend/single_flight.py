@@ -0,0 +1,45 @@
+"""Single-flight coalescing of identical concurrent work.
+
+After a dataset edit every open dashboard refetches /api/calculate with
+the same weights at once. Requests that arrive while an identical one is
+still being computed (same key: endpoint, dataset version, weights) await
+that computation instead of starting their own, and all of them get its
+serialized body. Nothing is cached once the flight lands, so a later
+request always sees fresh data.
+"""
+import asyncio
+
+
+class SingleFlight:
+    """One in-flight computation per key; use on one event loop"""
+
+    def __init__(self):
+        self._flights = {}
+        self.started = 0
+        self.shared = 0
+
+    async def do(self, key, compute):
+        """Await `compute()` (a coroutine function), joining the identical flight if one is running.
+
+        Every caller of a flight gets its result or its exception. The
+        flight is shielded, so a caller that disconnects does not cancel
+        it for the others.
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = asyncio.ensure_future(compute())
+            self._flights[key] = flight
+            self.started += 1
+            flight.add_done_callback(lambda done: self._land(key, done))
+        else:
+            self.shared += 1
+        return await asyncio.shield(flight)
+
+    def _land(self, key, flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.cancelled():
+            flight.exception()  # retrieved here in case every caller went away
+
+    def stats(self):
+        return {"in_flight": len(self._flights), "started": self.started, "shared": self.shared}
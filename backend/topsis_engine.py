@@ -0,0 +1,103 @@
+"""Vectorized TOPSIS engine shared by the API routes and services.
+
+Every function works on plain NumPy arrays so callers decide how the
+catalog is loaded (pandas, openpyxl, snapshots) and how results are
+serialized.
+"""
+import numpy as np
+
+CRITERIA_NAMES = ['CPU', 'RAM', 'Disk I/O', 'Harga']
+CRITERIA_TYPES = ['BENEFIT', 'BENEFIT', 'BENEFIT', 'COST']
+LEVEL_COLUMNS = ['CPU_Level', 'RAM_Level', 'DiskIO_Level', 'Price_Level']
+VALUE_COLUMNS = ['CPU_val', 'RAM_val', 'DiskIO_val', 'Price_val']
+
+# Level (1-5) -> actual value per criterion, same as the CHOOSE() formulas
+# in '2. Konversi ke Nilai' of TOPSIS_Input_Level.xlsx
+LEVEL_VALUES = np.array([
+    [2, 2, 150, 15],
+    [4, 4, 300, 35],
+    [6, 8, 500, 75],
+    [8, 16, 700, 150],
+    [10, 32, 1000, 250],
+])
+PRICE_LEVEL_NAMES = {1: 'Sangat Murah', 2: 'Murah', 3: 'Sedang', 4: 'Mahal', 5: 'Sangat Mahal'}
+
+BENEFIT = np.array([t == 'BENEFIT' for t in CRITERIA_TYPES])
+
+
+def levels_to_values(levels):
+    """Convert an (n, 4) array of levels 1-5 to actual criterion values"""
+    levels = np.asarray(levels, dtype=np.int64).reshape(-1, len(CRITERIA_NAMES))
+    if levels.size and ((levels < 1) | (levels > 5)).any():
+        raise ValueError("Level must be between 1 and 5")
+    return LEVEL_VALUES[levels - 1, np.arange(len(CRITERIA_NAMES))]
+
+
+def rank_desc(scores):
+    """Rank scores from high to low (1 = best).
+
+    Ties get the average of their positions truncated to int, which is
+    what `pd.Series(scores).rank(ascending=False).astype(int)` returns.
+    """
+    _, inverse, counts = np.unique(-np.asarray(scores), return_inverse=True, return_counts=True)
+    first = np.cumsum(counts) - counts
+    return (first + (counts + 1) / 2)[inverse.ravel()].astype(int)
+
+
+def topsis(X, weights):
+    """Run TOPSIS on a decision matrix and return every intermediate step"""
+    X = np.asarray(X, dtype=float)
+    w = np.asarray(weights, dtype=float)
+
+    # Normalization: rij = xij / sqrt(sum(xij^2))
+    divisors = np.sqrt((X**2).sum(axis=0))
+    X_norm = X / divisors
+
+    # Weighted matrix: yij = wj * rij
+    X_weighted = X_norm * w
+
+    # Ideal solutions (max for BENEFIT, min for COST and vice versa)
+    col_max = X_weighted.max(axis=0)
+    col_min = X_weighted.min(axis=0)
+    ideal_pos = np.where(BENEFIT, col_max, col_min)
+    ideal_neg = np.where(BENEFIT, col_min, col_max)
+
+    # Euclidean distance to both ideals
+    D_pos = np.sqrt(((X_weighted - ideal_pos)**2).sum(axis=1))
+    D_neg = np.sqrt(((X_weighted - ideal_neg)**2).sum(axis=1))
+
+    scores = D_neg / (D_pos + D_neg)
+
+    return {
+        "divisors": divisors,
+        "normalized": X_norm,
+        "weighted": X_weighted,
+        "ideal_pos": ideal_pos,
+        "ideal_neg": ideal_neg,
+        "d_pos": D_pos,
+        "d_neg": D_neg,
+        "scores": scores,
+        "ranks": rank_desc(scores),
+    }
+
+
+def topsis_scores(X, weights):
+    """Scores for many weight vectors in one pass.
+
+    `weights` is (k, criteria); returns a (k, alternatives) array whose
+    row i equals `topsis(X, weights[i])["scores"]`.
+    """
+    X = np.asarray(X, dtype=float)
+    W = np.atleast_2d(np.asarray(weights, dtype=float))
+
+    X_norm = X / np.sqrt((X**2).sum(axis=0))
+    X_weighted = X_norm[None, :, :] * W[:, None, :]
+
+    col_max = X_weighted.max(axis=1, keepdims=True)
+    col_min = X_weighted.min(axis=1, keepdims=True)
+    ideal_pos = np.where(BENEFIT, col_max, col_min)
+    ideal_neg = np.where(BENEFIT, col_min, col_max)
+
+    D_pos = np.sqrt(((X_weighted - ideal_pos)**2).sum(axis=2))
+    D_neg = np.sqrt(((X_weighted - ideal_neg)**2).sum(axis=2))
+    return D_neg / (D_pos + D_neg)
@@ -0,0 +1,134 @@
+"""In-memory user registry and verified-token cache for authentication.
+
+users.json is parsed once and kept in memory. Writes go through the
+registry (atomic replace), and an edit made to the file by hand is
+picked up by re-checking its mtime and size at most every
+USERS_RECHECK_SECONDS. Decoded JWTs are remembered for a short TTL (never
+past their own expiry), so an authenticated request costs two dict
+lookups instead of a file read plus a signature check.
+
+A missing users.json is only created by `seed()`, which the API runs in
+its startup warm-up: hashing the default password and writing the file
+never happen inside a request.
+"""
+import copy
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+USERS_RECHECK_SECONDS = float(os.environ.get('USERS_RECHECK_SECONDS', '1.0'))
+TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', '1024'))
+TOKEN_CACHE_TTL = float(os.environ.get('TOKEN_CACHE_TTL', '300'))
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class UserRegistry:
+    """users.json held in memory; `seed()` writes `default_users()` when the file is missing"""
+
+    def __init__(self, path, default_users):
+        self.path = path
+        self.default_users = default_users
+        self._lock = threading.Lock()
+        self._users = None
+        self._stat = None
+        self._checked = 0.0
+
+    def _refresh(self):
+        """Reload the file if it changed on disk (called with the lock held)"""
+        now = time.monotonic()
+        if self._users is not None and now - self._checked < USERS_RECHECK_SECONDS:
+            return
+        self._checked = now
+        stat = _stat(self.path)
+        if self._users is not None and stat == self._stat:
+            return
+        if stat is None:
+            self._users, self._stat = {}, None  # not seeded (yet): nobody can log in
+            return
+        with open(self.path, 'r') as f:
+            self._users = json.load(f)
+        self._stat = stat
+
+    def _write(self, users):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"  # other workers may write at the same time
+        with open(tmp_path, 'w') as f:
+            json.dump(users, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._users = users
+        self._stat = _stat(self.path)
+
+    def seed(self):
+        """Load users.json, creating it from `default_users()` first if it does not exist.
+
+        Blocking (a password hash plus a file write): call it off the event
+        loop. Returns True if the file was created.
+        """
+        with self._lock:
+            if os.path.exists(self.path):
+                self._refresh()
+                return False
+            self._write(self.default_users())
+            return True
+
+    def get(self, username):
+        """The stored user dict (do not modify it), or None"""
+        with self._lock:
+            self._refresh()
+            return self._users.get(username)
+
+    def update(self, username, **fields):
+        """Change fields of one user and persist; returns the updated copy"""
+        with self._lock:
+            self._refresh()
+            users = copy.deepcopy(self._users)
+            users[username].update(fields)
+            self._write(users)
+            return dict(users[username])
+
+
+class TokenCache:
+    """Bounded LRU of verified token -> username with a TTL"""
+
+    def __init__(self, max_entries=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token):
+        with self._lock:
+            item = self._items.get(token)
+            if item is None:
+                return None
+            username, deadline = item
+            if time.monotonic() >= deadline:
+                del self._items[token]
+                return None
+            self._items.move_to_end(token)
+            return username
+
+    def put(self, token, username, expires_at=None):
+        """Remember a verified token; `expires_at` is its exp claim (epoch seconds)"""
+        lifetime = self.ttl
+        if expires_at is not None:
+            lifetime = min(lifetime, expires_at - time.time())
+        if lifetime <= 0:
+            return
+        with self._lock:
+            self._items[token] = (username, time.monotonic() + lifetime)
+            self._items.move_to_end(token)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
@@ -0,0 +1,140 @@
+"""Helper bersama untuk generator workbook TOPSIS (openpyxl write-only).
+
+Workbook ditulis baris demi baris (`ws.append`) sehingga memori tetap
+kecil walaupun jumlah vendor ribuan. Style didaftarkan sekali sebagai
+NamedStyle dan dipakai bersama oleh semua sel, dan lebar kolom
+diperkirakan dari sampel baris sebelum sheet mulai ditulis.
+"""
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, NamedStyle, PatternFill
+from openpyxl.utils import get_column_letter, quote_sheetname
+from openpyxl.workbook.defined_name import DefinedName
+
+WIDTH_SAMPLE_ROWS = 200
+MAX_COLUMN_WIDTH = 50
+
+
+def _fill(color):
+    return PatternFill(start_color=color, end_color=color, fill_type="solid")
+
+
+# Nama style -> atribut NamedStyle
+STYLES = {
+    'header': dict(fill=_fill("4472C4"), font=Font(bold=True, color="FFFFFF", size=11),
+                   alignment=Alignment(horizontal='center')),
+    'title': dict(font=Font(bold=True, size=14, color="1F4E78")),
+    'title_large': dict(font=Font(bold=True, size=16, color="1F4E78")),
+    'subtitle': dict(font=Font(italic=True)),
+    'subtitle_small': dict(font=Font(italic=True, size=10)),
+    'section': dict(font=Font(bold=True, size=12)),
+    'bold': dict(font=Font(bold=True)),
+    'input': dict(fill=_fill("FFF2CC")),
+    'warning': dict(font=Font(bold=True, color="FF0000", size=12)),
+    'warning_small': dict(font=Font(bold=True, color="FF0000")),
+}
+
+
+def create_workbook():
+    """Workbook write-only dengan semua NamedStyle sudah terdaftar"""
+    wb = Workbook(write_only=True)
+    for name, attrs in STYLES.items():
+        wb.add_named_style(NamedStyle(name=name, **attrs))
+    return wb
+
+
+def sheet_range(sheet, first_col, first_row, last_col=None, last_row=None):
+    """Referensi absolut, mis. '1. Data Input'!$D$4:$D$23"""
+    ref = f"{quote_sheetname(sheet)}!${first_col}${first_row}"
+    if last_col or last_row:
+        ref += f":${last_col or first_col}${last_row or first_row}"
+    return ref
+
+
+def dynamic_range(sheet, col, first_row, count):
+    """Range satu kolom mulai `first_row` sepanjang `count` baris (nama atau rumus).
+
+    INDEX tidak volatile seperti OFFSET, jadi rumus yang memakainya hanya
+    dihitung ulang bila sel yang dirujuknya berubah.
+    """
+    sheet = quote_sheetname(sheet)
+    return f"{sheet}!${col}${first_row}:INDEX({sheet}!${col}:${col},{first_row - 1}+{count})"
+
+
+def define_name(wb, name, ref):
+    """Daftarkan named range tingkat workbook; rumus cukup memakai `name`"""
+    wb.defined_names[name] = DefinedName(name, attr_text=ref)
+    return name
+
+
+def estimate_widths(rows, sample=WIDTH_SAMPLE_ROWS, max_width=MAX_COLUMN_WIDTH):
+    """Perkirakan lebar kolom dari sampel baris (tersebar rata), bukan semua sel.
+
+    Formula dihitung sebagai lebar angka karena yang tampil adalah hasilnya.
+    """
+    rows = list(rows)
+    step = max(1, len(rows) // sample)
+    widths = {}
+    for row in rows[::step]:
+        for idx, value in enumerate(row, 1):
+            if value is None:
+                continue
+            if isinstance(value, float):
+                text = f"{value:.6g}"
+            elif isinstance(value, str) and value.startswith('='):
+                text = "0.000000"
+            else:
+                text = str(value)
+            widths[idx] = max(widths.get(idx, 0), len(text))
+    return {idx: min(w + 2, max_width) for idx, w in widths.items()}
+
+
+class SheetWriter:
+    """Sheet write-only: lebar kolom diatur di awal, lalu baris ditambahkan berurutan"""
+
+    def __init__(self, wb, title, width_rows=()):
+        self.ws = wb.create_sheet(title)
+        for idx, width in estimate_widths(width_rows).items():
+            self.ws.column_dimensions[get_column_letter(idx)].width = width
+
+    def cell(self, value, style=None):
+        c = WriteOnlyCell(self.ws, value=value)
+        if style:
+            c.style = style
+        return c
+
+    def row(self, *values, style=None):
+        """Tambah satu baris; nilai bisa (value, style) untuk style per sel"""
+        cells = []
+        for value in values:
+            if isinstance(value, tuple):
+                cells.append(self.cell(*value))
+            elif style and value is not None:
+                cells.append(self.cell(value, style))
+            else:
+                cells.append(value)
+        self.ws.append(cells)
+
+    def rows(self, rows, styles=None):
+        """Tambah banyak baris sekaligus; styles = list style per kolom (None = polos)"""
+        if not styles or not any(styles):
+            for values in rows:
+                self.ws.append(values)
+            return
+        for values in rows:
+            self.ws.append([self.cell(v, s) if s else v for v, s in zip(values, styles)])
+
+    def title(self, text, style='title'):
+        self.row((text, style))
+
+    def header(self, names):
+        self.row(*names, style='header')
+
+    def blank(self, count=1):
+        for _ in range(count):
+            self.ws.append([])
+
+
+def frame_rows(df, columns):
+    """Baris (tuple nilai Python) dari kolom DataFrame, tanpa iterrows()"""
+    return list(zip(*(df[c].tolist() for c in columns)))
@@ -0,0 +1,491 @@
+"""Generator workbook TOPSIS dalam satu lintasan.
+
+CSV dibaca, diekstrak, dan diklasifikasi ke level cukup sekali; hasil
+antara TOPSIS dihitung sekali dengan engine vektor di backend/, lalu
+semua workbook ditulis dari data bersama yang sama.
+
+    python generate_excel.py                      # semua workbook
+    python generate_excel.py rumus level -j 2     # sebagian, paralel
+    python generate_excel.py perhitungan --peringkat -w 0.3 0.3 0.2 0.2
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from excel_common import SheetWriter, create_workbook, define_name, dynamic_range, frame_rows, sheet_range
+from topsis_spk import DEFAULT_CSV, DEFAULT_WEIGHTS, parse_weights
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+from topsis_engine import VALUE_COLUMNS, LEVEL_COLUMNS, topsis  # noqa: E402
+
+# Batas atas level 1-4 per kriteria (di atas batas terakhir = level 5)
+LEVEL_THRESHOLDS = {
+    'CPU_val': [2, 4, 6, 8],
+    'RAM_val': [2, 4, 8, 16],
+    'DiskIO_val': [200, 400, 600, 800],
+    'Price_val': [20, 50, 100, 200],
+}
+
+# Baris rumus cadangan di bawah data: vendor yang ditambahkan kemudian (di
+# Excel atau lewat API) langsung ikut dihitung tanpa membuat ulang workbook
+FORMULA_HEADROOM = 100
+
+CODES = ['C1', 'C2', 'C3', 'C4']
+MATRIX_COLS = ['B', 'C', 'D', 'E']
+CRITERIA_HEADERS = ["Kriteria", "CPU (C1)", "RAM (C2)", "Disk I/O (C3)", "Harga (C4)"]
+MATRIX_HEADERS = ['Alternatif', 'CPU (C1)', 'RAM (C2)', 'Disk I/O (C3)', 'Harga (C4)']
+FINAL_HEADERS = ['Alternatif', 'Vendor', 'D+ (Jarak ke A+)', 'D- (Jarak ke A-)', 'Score', 'Rank']
+
+GUIDE_LEFT = [
+    ("CPU (BENEFIT)", [
+        [1, "1-2 Core", "Sangat Rendah"],
+        [2, "3-4 Core", "Rendah"],
+        [3, "5-6 Core", "Sedang"],
+        [4, "7-8 Core", "Tinggi"],
+        [5, "9+ Core", "Sangat Tinggi"]
+    ]),
+    ("RAM (BENEFIT)", [
+        [1, "1-2 GB", "Sangat Rendah"],
+        [2, "3-4 GB", "Rendah"],
+        [3, "5-8 GB", "Sedang"],
+        [4, "9-16 GB", "Tinggi"],
+        [5, "17+ GB", "Sangat Tinggi"]
+    ]),
+]
+GUIDE_RIGHT = [
+    ("Disk I/O (BENEFIT)", [
+        [1, "100-200 MB/s", "Sangat Rendah"],
+        [2, "201-400 MB/s", "Rendah"],
+        [3, "401-600 MB/s", "Sedang"],
+        [4, "601-800 MB/s", "Tinggi"],
+        [5, "801+ MB/s", "Sangat Tinggi"]
+    ]),
+    ("Harga (COST)", [
+        [1, "$5-$20", "Sangat Murah"],
+        [2, "$21-$50", "Murah"],
+        [3, "$51-$100", "Sedang"],
+        [4, "$101-$200", "Mahal"],
+        [5, "$201+", "Sangat Mahal"]
+    ]),
+]
+
+
+def load_catalog(csv_file):
+    """Baca CSV sekali, ekstrak nilai numerik dan level 1-5 secara vektor"""
+    import pandas as pd
+
+    df = pd.read_csv(csv_file)
+    df['CPU_val'] = df['CPU'].str.extract(r'(\d+)', expand=False).astype(int)
+    df['RAM_val'] = df['RAM'].str.extract(r'(\d+)', expand=False).astype(int)
+
+    # Disk I/O (MB/s) = bandwidth / 8; Gbps dikonversi ke Mbps, default 100 Mbps
+    speed = df['Disk I/O Speed'].str.extract(r'(\d+(?:\.\d+)?)\s*(Gbps|Mbps)')
+    mbps = speed[0].astype(float)
+    mbps = mbps.where(speed[1] != 'Gbps', mbps * 1000).fillna(100.0)
+    df['DiskIO_val'] = mbps / 8
+    df['Price_val'] = df['Harga/Bulan (USD)'].str.extract(r'[\$\s]*([\d.]+)', expand=False).astype(float)
+
+    # Level dihitung dari nilai asli, sebelum pembulatan untuk tampilan
+    for val_col, level_col in zip(VALUE_COLUMNS, LEVEL_COLUMNS):
+        df[level_col] = np.searchsorted(LEVEL_THRESHOLDS[val_col], df[val_col].to_numpy()) + 1
+
+    df['DiskIO_val'] = df['DiskIO_val'].round(2)
+    df['Price_val'] = df['Price_val'].round(2)
+    return df
+
+
+def prepare(csv_file=DEFAULT_CSV, weights=DEFAULT_WEIGHTS):
+    """Data bersama untuk semua workbook: tabel vendor + hasil antara TOPSIS"""
+    df = load_catalog(csv_file)
+    return {
+        'df': df,
+        'weights': [float(w) for w in weights],
+        'labels': [f"A{no}" for no in df['No']],
+        'result': topsis(df[VALUE_COLUMNS].to_numpy(), weights),
+    }
+
+
+def _weights_sheet(wb, title, weights, warning=None):
+    ws = SheetWriter(wb, title, [CRITERIA_HEADERS])
+    ws.title("BOBOT DAN TIPE KRITERIA")
+    ws.blank()
+    ws.header(CRITERIA_HEADERS)
+    ws.row("Tipe", "BENEFIT", "BENEFIT", "BENEFIT", "COST")
+    ws.row("Bobot (W)", *[(w, 'input') for w in weights])
+    ws.blank()
+    ws.row("Total Bobot:", ("=SUM(B5:E5)", 'bold'))
+    if warning:
+        ws.blank()
+        ws.row((warning, 'warning_small'))
+
+
+def _if_vendor(vendor_ref, row, formula):
+    """Rumus yang kosong ("") selama baris vendor `row` di sheet input belum diisi"""
+    return f"=IF('{vendor_ref}'!$B{row}=\"\",\"\",{formula})"
+
+
+def _formula_sheets(wb, n, source_sheet, source_cols, sheet_no, vendor_ref, notes=True):
+    """Sheet normalisasi s.d. hasil berbasis rumus, memakai named range dinamis.
+
+    `source_sheet`/`source_cols` menunjuk kolom nilai kriteria (baris data mulai 4);
+    `sheet_no` = nomor sheet normalisasi pertama; `vendor_ref` = sheet input
+    dengan nama vendor di kolom B. Setiap sheet punya FORMULA_HEADROOM baris
+    rumus cadangan, dan named range mengikuti jumlah vendor yang terisi.
+    """
+    norm, weighted, ideal, final = (f"{sheet_no + i}. {name}" for i, name in enumerate(
+        ["Normalisasi", "Normalisasi Terbobot", "Solusi Ideal", "Hasil TOPSIS"]))
+    weights_sheet = f"{sheet_no - 1}. Bobot & Kriteria"
+    capacity = n + FORMULA_HEADROOM
+
+    define_name(wb, "Jumlah_Alternatif", f"COUNTA({sheet_range(vendor_ref, 'B', 4, 'B', capacity + 3)})")
+    for code, src_col, col in zip(CODES, source_cols, MATRIX_COLS):
+        define_name(wb, f"Nilai_{code}", dynamic_range(source_sheet, src_col, 4, "Jumlah_Alternatif"))
+        define_name(wb, f"Bobot_{code}", sheet_range(weights_sheet, col, 5))
+        define_name(wb, f"Pembagi_{code}", sheet_range(norm, col, 3))
+        define_name(wb, f"Terbobot_{code}", dynamic_range(weighted, col, 5, "Jumlah_Alternatif"))
+    define_name(wb, "Ideal_Positif", sheet_range(ideal, 'B', 4, 'E', 4))
+    define_name(wb, "Ideal_Negatif", sheet_range(ideal, 'B', 5, 'E', 5))
+    define_name(wb, "Skor", dynamic_range(final, 'E', 4, "Jumlah_Alternatif"))
+
+    # Normalisasi: pembagi √Σxij² dihitung sekali per kriteria (baris 3), bukan sekali per sel
+    rows = [(_if_vendor(vendor_ref, i + 4, f'"A{i+1}"'),) +
+            tuple(_if_vendor(vendor_ref, i + 4, f"'{source_sheet}'!{c}{i+4}/Pembagi_{code}")
+                  for code, c in zip(CODES, source_cols))
+            for i in range(capacity)]
+    ws = SheetWriter(wb, norm, [MATRIX_HEADERS] + rows)
+    ws.title("MATRIKS TERNORMALISASI (R)")
+    ws.row(("Rumus: rij = xij / √(Σxij²)", 'subtitle'))
+    ws.row(("√(Σxij²)", 'bold'), *[f"=SQRT(SUMSQ(Nilai_{code}))" for code in CODES])
+    ws.header(MATRIX_HEADERS)
+    ws.rows(rows)
+
+    # Normalisasi terbobot
+    rows = [(_if_vendor(vendor_ref, i + 4, f'"A{i+1}"'),) +
+            tuple(_if_vendor(vendor_ref, i + 4, f"'{norm}'!{col}{i+5}*Bobot_{code}")
+                  for code, col in zip(CODES, MATRIX_COLS))
+            for i in range(capacity)]
+    ws = SheetWriter(wb, weighted, [MATRIX_HEADERS] + rows)
+    ws.title("MATRIKS TERNORMALISASI TERBOBOT (Y)")
+    ws.row(("Rumus: yij = wj × rij", 'subtitle'))
+    ws.blank()
+    ws.header(MATRIX_HEADERS)
+    ws.rows(rows)
+
+    # Solusi ideal
+    rows = [
+        ("A+ (Ideal Positif)",
+         "=MAX(Terbobot_C1)", "=MAX(Terbobot_C2)", "=MAX(Terbobot_C3)", "=MIN(Terbobot_C4)"),
+        ("A- (Ideal Negatif)",
+         "=MIN(Terbobot_C1)", "=MIN(Terbobot_C2)", "=MIN(Terbobot_C3)", "=MAX(Terbobot_C4)"),
+    ]
+    ws = SheetWriter(wb, ideal, [CRITERIA_HEADERS] + rows)
+    ws.title("SOLUSI IDEAL POSITIF (A+) DAN NEGATIF (A-)")
+    ws.blank()
+    ws.header(CRITERIA_HEADERS)
+    ws.rows(rows)
+    if notes:
+        ws.blank()
+        ws.row("Keterangan:")
+        ws.row("• BENEFIT: A+ = MAX, A- = MIN")
+        ws.row("• COST: A+ = MIN, A- = MAX")
+
+    # Jarak ke sel solusi ideal, score dan rank
+    rows = []
+    for i in range(capacity):
+        row = i + 4
+        rows.append(tuple(_if_vendor(vendor_ref, row, formula) for formula in (
+            f'"A{i+1}"',
+            f"'{vendor_ref}'!B{row}",
+            f"SQRT(SUMXMY2('{weighted}'!B{i+5}:E{i+5},Ideal_Positif))",
+            f"SQRT(SUMXMY2('{weighted}'!B{i+5}:E{i+5},Ideal_Negatif))",
+            f"D{row}/(C{row}+D{row})",
+            f"RANK(E{row},Skor,0)",
+        )))
+    ws = SheetWriter(wb, final, [FINAL_HEADERS] + rows)
+    ws.title("HASIL PERHITUNGAN TOPSIS")
+    ws.blank()
+    ws.header(FINAL_HEADERS)
+    ws.rows(rows)
+    ws.blank(2)
+    return ws
+
+
+def build_perhitungan(data, path, peringkat=False):
+    """Workbook nilai statis: setiap langkah TOPSIS dari hasil engine"""
+    df, labels, res = data['df'], data['labels'], data['result']
+    wb = create_workbook()
+
+    # Sheet 1: Data Asli
+    data_cols = ['No', 'Vendor', 'Nama Paket (Plan)', 'CPU_val', 'CPU_Level', 'RAM_val', 'RAM_Level',
+                 'DiskIO_val', 'DiskIO_Level', 'Price_val', 'Price_Level']
+    rows1 = frame_rows(df, data_cols)
+    ws1 = SheetWriter(wb, "1. Data Asli", [data_cols] + rows1)
+    ws1.title("DATA ASLI ALTERNATIF")
+    ws1.blank()
+    ws1.header(data_cols)
+    ws1.rows(rows1)
+
+    # Sheet 2: Matriks Keputusan
+    rows2 = [(label,) + values for label, values in zip(labels, frame_rows(df, VALUE_COLUMNS))]
+    ws2 = SheetWriter(wb, "2. Matriks Keputusan", [MATRIX_HEADERS] + rows2)
+    ws2.title("MATRIKS KEPUTUSAN (X)")
+    ws2.blank()
+    ws2.header(MATRIX_HEADERS)
+    ws2.rows(rows2)
+    ws2.blank(2)
+    ws2.row("Tipe Kriteria:", "BENEFIT", "BENEFIT", "BENEFIT", "COST")
+    ws2.row("Bobot (W):", *data['weights'])
+
+    # Sheet 3: Normalisasi
+    rows3 = [(label,) + tuple(values) for label, values in zip(labels, res['normalized'].tolist())]
+    ws3 = SheetWriter(wb, "3. Normalisasi", [MATRIX_HEADERS] + rows3)
+    ws3.title("MATRIKS TERNORMALISASI (R)")
+    ws3.row(("Rumus: rij = xij / √(Σxij²)", 'subtitle_small'))
+    ws3.blank()
+    ws3.header(MATRIX_HEADERS)
+    ws3.rows(rows3)
+
+    # Sheet 4: Normalisasi Terbobot
+    rows4 = [(label,) + tuple(values) for label, values in zip(labels, res['weighted'].tolist())]
+    ws4 = SheetWriter(wb, "4. Normalisasi Terbobot", [MATRIX_HEADERS] + rows4)
+    ws4.title("MATRIKS TERNORMALISASI TERBOBOT (Y)")
+    ws4.row(("Rumus: yij = wj × rij", 'subtitle_small'))
+    ws4.blank()
+    ws4.header(MATRIX_HEADERS)
+    ws4.rows(rows4)
+
+    # Sheet 5: Solusi Ideal
+    rows5 = [("A+ (Ideal Positif)",) + tuple(res['ideal_pos'].tolist()),
+             ("A- (Ideal Negatif)",) + tuple(res['ideal_neg'].tolist())]
+    ws5 = SheetWriter(wb, "5. Solusi Ideal", [MATRIX_HEADERS] + rows5)
+    ws5.title("SOLUSI IDEAL POSITIF (A+) DAN NEGATIF (A-)")
+    ws5.blank()
+    ws5.header(["Kriteria"] + MATRIX_HEADERS[1:])
+    ws5.rows(rows5)
+    ws5.blank()
+    ws5.row("Keterangan:")
+    ws5.row("• BENEFIT: A+ = MAX, A- = MIN")
+    ws5.row("• COST: A+ = MIN, A- = MAX")
+
+    # Sheet 6: Jarak & Score (rentang RANK mengikuti jumlah data)
+    vendors = df['Vendor'].tolist()
+    score_range = f"$E$4:$E${len(df) + 3}"
+    rows6 = [(label, vendor, d_pos, d_neg, score, f"=RANK(E{idx+4},{score_range},0)")
+             for idx, (label, vendor, d_pos, d_neg, score) in enumerate(
+                 zip(labels, vendors, res['d_pos'].tolist(), res['d_neg'].tolist(), res['scores'].tolist()))]
+    ws6 = SheetWriter(wb, "6. Jarak & Score TOPSIS", [FINAL_HEADERS] + rows6)
+    ws6.title("PERHITUNGAN JARAK DAN SCORE TOPSIS")
+    ws6.blank()
+    ws6.header(FINAL_HEADERS)
+    ws6.rows(rows6)
+    ws6.blank(2)
+    ws6.row("Rumus Score TOPSIS:")
+    ws6.row("Score = D- / (D+ + D-)")
+    ws6.row("Semakin tinggi score, semakin baik alternatif")
+
+    # Sheet opsional: vendor diurutkan berdasarkan rank
+    if peringkat:
+        order = np.lexsort((-res['scores'], res['ranks']))
+        headers = ['Rank', 'Alternatif', 'Vendor', 'Nama Paket', 'Score']
+        plans = df['Nama Paket (Plan)'].tolist()
+        rows7 = [(int(res['ranks'][i]), labels[i], vendors[i], plans[i], float(res['scores'][i]))
+                 for i in order.tolist()]
+        ws7 = SheetWriter(wb, "7. Peringkat", [headers] + rows7)
+        ws7.title("PERINGKAT VENDOR")
+        ws7.blank()
+        ws7.header(headers)
+        ws7.rows(rows7)
+
+    wb.save(path)
+
+
+def build_rumus(data, path, **_):
+    """Workbook rumus: ubah nilai input, semua sheet lain ikut terhitung ulang"""
+    df = data['df']
+    wb = create_workbook()
+
+    # Sheet 1: Data Input
+    headers = ['No', 'Vendor', 'Nama Paket', 'CPU', 'RAM', 'Disk I/O', 'Harga']
+    rows1 = frame_rows(df, ['No', 'Vendor', 'Nama Paket (Plan)'] + VALUE_COLUMNS)
+    ws1 = SheetWriter(wb, "1. Data Input", [headers] + rows1)
+    ws1.title("DATA INPUT - UBAH NILAI DI SINI")
+    ws1.blank()
+    ws1.header(headers)
+    # Input data with yellow background for editable cells
+    ws1.rows(rows1, styles=[None, None, None, 'input', 'input', 'input', 'input'])
+    ws1.blank()
+    ws1.row(("⚠️ UBAH NILAI DI KOLOM KUNING (D-G) UNTUK RECALCULATE OTOMATIS", 'warning'))
+
+    # Sheet 2: Bobot & Kriteria
+    _weights_sheet(wb, "2. Bobot & Kriteria", data['weights'],
+                   warning="⚠️ UBAH BOBOT DI BARIS 5 (Total harus = 1)")
+
+    # Sheet 3-6: Normalisasi s.d. Hasil TOPSIS
+    ws = _formula_sheets(wb, len(df), "1. Data Input", ['D', 'E', 'F', 'G'], 3, "1. Data Input")
+    ws.row("Rumus Score TOPSIS:")
+    ws.row("Score = D- / (D+ + D-)")
+    ws.row("Semakin tinggi score (mendekati 1), semakin baik alternatif")
+
+    wb.save(path)
+
+
+def build_level(data, path, **_):
+    """Workbook input level 1-5 yang dikonversi ke nilai dengan CHOOSE()"""
+    df = data['df']
+    n = len(df)
+    wb = create_workbook()
+
+    # Sheet 0: Panduan Level (dua tabel berdampingan: kolom A-C dan E-G)
+    guide_header = [("Level", 'header'), ("Range", 'header'), ("Kategori", 'header')]
+    guide_rows = [left + [None] + right
+                  for (_, lt), (_, rt) in zip(GUIDE_LEFT, GUIDE_RIGHT) for left, right in zip(lt, rt)]
+    ws0 = SheetWriter(wb, "0. Panduan Level", guide_rows)
+    ws0.title("PANDUAN LEVEL PARAMETER (1-5)", style='title_large')
+    for (left_title, left_data), (right_title, right_data) in zip(GUIDE_LEFT, GUIDE_RIGHT):
+        ws0.blank()
+        ws0.row((left_title, 'section'), None, None, None, (right_title, 'section'))
+        ws0.row(*guide_header, None, *guide_header)
+        for left, right in zip(left_data, right_data):
+            ws0.row(*left, None, *right)
+
+    # Sheet 1: Input Level
+    headers = ['No', 'Vendor', 'Nama Paket', 'CPU Lvl', 'RAM Lvl', 'I/O Lvl', 'Harga Lvl']
+    rows1 = frame_rows(df, ['No', 'Vendor', 'Nama Paket (Plan)'] + LEVEL_COLUMNS)
+    ws1 = SheetWriter(wb, "1. Input Level", [headers] + rows1)
+    ws1.title("INPUT LEVEL (1-5) - UBAH DI KOLOM KUNING")
+    ws1.blank()
+    ws1.header(headers)
+    # Level input (yellow)
+    ws1.rows(rows1, styles=[None, None, None, 'input', 'input', 'input', 'input'])
+    ws1.blank()
+    ws1.row(("⚠️ INPUT LEVEL 1-5 DI KOLOM KUNING (Lihat sheet '0. Panduan Level')", 'warning'))
+
+    # Sheet 2: Konversi ke Nilai
+    headers = ['No', 'Vendor', 'CPU', 'RAM', 'Disk I/O', 'Harga']
+    rows2 = []
+    # Termasuk baris cadangan untuk vendor yang ditambahkan ke '1. Input Level' kemudian
+    for i in range(n + FORMULA_HEADROOM):
+        row = i + 4
+        rows2.append(tuple(_if_vendor("1. Input Level", row, formula) for formula in (
+            i+1,
+            f"'1. Input Level'!B{row}",
+            # CPU conversion: 1→2, 2→4, 3→6, 4→8, 5→10
+            f"CHOOSE('1. Input Level'!D{row},2,4,6,8,10)",
+            # RAM conversion: 1→2, 2→4, 3→8, 4→16, 5→32
+            f"CHOOSE('1. Input Level'!E{row},2,4,8,16,32)",
+            # Disk I/O conversion: 1→150, 2→300, 3→500, 4→700, 5→1000
+            f"CHOOSE('1. Input Level'!F{row},150,300,500,700,1000)",
+            # Price conversion: 1→15, 2→35, 3→75, 4→150, 5→250
+            f"CHOOSE('1. Input Level'!G{row},15,35,75,150,250)",
+        )))
+    ws2 = SheetWriter(wb, "2. Konversi ke Nilai", [headers] + rows2)
+    ws2.title("KONVERSI LEVEL KE NILAI AKTUAL (OTOMATIS)")
+    ws2.blank()
+    ws2.header(headers)
+    ws2.rows(rows2)
+
+    # Sheet 3: Bobot
+    _weights_sheet(wb, "3. Bobot & Kriteria", data['weights'])
+
+    # Sheet 4-7: Normalisasi s.d. Hasil TOPSIS
+    ws = _formula_sheets(wb, n, "2. Konversi ke Nilai", ['C', 'D', 'E', 'F'], 4, "1. Input Level",
+                         notes=False)
+    ws.row("Rumus Score TOPSIS: Score = D- / (D+ + D-)")
+    ws.row("Semakin tinggi score (mendekati 1), semakin baik alternatif")
+
+    wb.save(path)
+
+
+# Nama workbook -> (file output, builder, pesan setelah selesai)
+WORKBOOKS = {
+    'perhitungan': ('TOPSIS_Perhitungan_Lengkap.xlsx', build_perhitungan, [
+        "✅ File Excel berhasil dibuat: {path}",
+        "\n📊 Isi file:",
+        "  1. Data Asli - Data mentah dengan level",
+        "  2. Matriks Keputusan - Matriks X dengan bobot",
+        "  3. Normalisasi - Matriks R (ternormalisasi)",
+        "  4. Normalisasi Terbobot - Matriks Y",
+        "  5. Solusi Ideal - A+ dan A-",
+        "  6. Jarak & Score TOPSIS - Hasil akhir dengan ranking",
+    ]),
+    'rumus': ('TOPSIS_Rumus_Otomatis.xlsx', build_rumus, [
+        "✅ File Excel dengan rumus lengkap berhasil dibuat: {path}",
+        "\n📊 Cara Pakai:",
+        "  1. Buka sheet '1. Data Input'",
+        "  2. Ubah nilai di kolom KUNING (CPU, RAM, Disk I/O, Harga)",
+        "  3. Ubah bobot di sheet '2. Bobot & Kriteria' jika perlu",
+        "  4. Semua sheet lain akan OTOMATIS UPDATE!",
+        "\n✨ Semua menggunakan FORMULA EXCEL, bukan nilai statis",
+    ]),
+    'level': ('TOPSIS_Input_Level.xlsx', build_level, [
+        "✅ File Excel dengan input LEVEL berhasil dibuat: {path}",
+        "\n📊 Cara Pakai:",
+        "  1. Lihat sheet '0. Panduan Level' untuk referensi level 1-5",
+        "  2. Buka sheet '1. Input Level'",
+        "  3. Ubah LEVEL (1-5) di kolom KUNING",
+        "  4. Sheet '2. Konversi ke Nilai' otomatis convert level ke nilai",
+        "  5. Semua perhitungan TOPSIS otomatis update!",
+        "\n✨ Input cukup angka 1-5, sistem otomatis konversi!",
+    ]),
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Generator workbook Excel TOPSIS (satu lintasan)")
+    parser.add_argument('workbooks', nargs='*', metavar='WORKBOOK',
+                        help=f"Workbook yang dibuat: {', '.join(WORKBOOKS)} (default: semua)")
+    parser.add_argument('--csv', default=DEFAULT_CSV, help="File CSV sumber data")
+    parser.add_argument('-o', '--output-dir', default='.',
+                        help="Direktori output (default: direktori saat ini)")
+    parser.add_argument('-w', '--weights', nargs=4, type=float, metavar=('CPU', 'RAM', 'DISK', 'HARGA'),
+                        default=DEFAULT_WEIGHTS, help="Bobot kriteria (default: 0.25 masing-masing)")
+    parser.add_argument('--peringkat', action='store_true',
+                        help="Tambahkan sheet '7. Peringkat' ke workbook perhitungan")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="Jumlah proses paralel untuk menulis workbook (0 = semua core)")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.workbooks if name not in WORKBOOKS]
+    if unknown:
+        parser.error(f"workbook tidak dikenal: {', '.join(unknown)} (pilihan: {', '.join(WORKBOOKS)})")
+    names = list(dict.fromkeys(args.workbooks)) or list(WORKBOOKS)
+
+    try:
+        weights = parse_weights(args.weights)
+    except ValueError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        return 2
+
+    data = prepare(args.csv, weights)
+    os.makedirs(args.output_dir, exist_ok=True)
+    tasks = [(name, os.path.normpath(os.path.join(args.output_dir, WORKBOOKS[name][0]))) for name in names]
+    options = dict(peringkat=args.peringkat)
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    jobs = min(jobs, len(tasks))
+    if jobs <= 1:
+        for name, path in tasks:
+            WORKBOOKS[name][1](data, path, **options)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(WORKBOOKS[name][1], data, path, **options) for name, path in tasks]
+            for future in futures:
+                future.result()
+
+    for name, path in tasks:
+        if len(tasks) > 1:
+            print()
+        for line in WORKBOOKS[name][2]:
+            print(line.format(path=path))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
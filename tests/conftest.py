@@ -0,0 +1,32 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND = os.path.join(ROOT, 'backend')
+
+# The backend modules import each other as top-level modules (cwd is backend/)
+for path in (ROOT, BACKEND):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+@pytest.fixture
+def api_dir(tmp_path, monkeypatch):
+    """Run the API against a copy of the shipped workbook in `tmp_path`.
+
+    The stores and caches main.py opens lazily are reset, so they are
+    created again from files in the temporary directory. Returns main.
+    """
+    import main
+    from result_cache import ResultCache
+
+    shutil.copyfile(os.path.join(BACKEND, main.DATA_FILE), tmp_path / main.DATA_FILE)
+    monkeypatch.chdir(tmp_path)
+    for name in ('dataset_store', 'history_store'):
+        monkeypatch.setattr(main, name, None)
+    monkeypatch.setattr(main, 'result_cache', ResultCache(str(tmp_path / 'cache')))
+    monkeypatch.setattr(main, 'input_load_stats', {})
+    return main
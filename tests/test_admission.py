@@ -0,0 +1,106 @@
+"""Admission gates: bounded concurrency and queue, 429/503 rejections"""
+import asyncio
+
+import pytest
+
+from admission import AdmissionGate, AdmissionMiddleware, Overloaded, gate_from_env
+
+
+async def _until(condition):
+    async with asyncio.timeout(5):
+        while not condition():
+            await asyncio.sleep(0)
+
+
+def _holder(gate, release):
+    async def hold():
+        async with gate.admit():
+            await release.wait()
+    return asyncio.create_task(hold())
+
+
+def test_rejects_when_queue_is_full():
+    async def scenario():
+        gate = AdmissionGate('test', limit=1, queue=1, timeout=5)
+        release = asyncio.Event()
+        running, queued = _holder(gate, release), _holder(gate, release)
+        await _until(lambda: (gate.running, gate.waiting) == (1, 1))
+
+        with pytest.raises(Overloaded) as rejected:
+            await gate.acquire()
+        assert rejected.value.reason == 'queue_full'
+
+        release.set()
+        await asyncio.gather(running, queued)
+        return gate.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats['admitted'] == 2 and stats['rejected'] == 1
+    assert stats['running'] == stats['waiting'] == 0
+
+
+def test_rejects_after_waiting_too_long():
+    async def scenario():
+        gate = AdmissionGate('test', limit=1, queue=4, timeout=0.05, retry_after=3)
+        await gate.acquire()
+        with pytest.raises(Overloaded) as rejected:
+            await gate.acquire()
+        gate.release()
+        assert await gate.acquire() >= 0  # the slot is usable again
+        return gate, rejected.value
+
+    gate, error = asyncio.run(scenario())
+    assert (error.reason, error.retry_after) == ('timeout', 3)
+    assert gate.waiting == 0 and gate.rejected == 1
+
+
+def test_cancelled_waiter_leaves_no_slot_behind():
+    async def scenario():
+        gate = AdmissionGate('test', limit=1, queue=1, timeout=5)
+        release = asyncio.Event()
+        running, queued = _holder(gate, release), _holder(gate, release)
+        await _until(lambda: gate.running == 1)
+        queued.cancel()  # the client went away while queued
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        release.set()
+        await running
+        await asyncio.wait_for(gate.acquire(), 1)
+        return gate
+
+    gate = asyncio.run(scenario())
+    assert (gate.running, gate.waiting, gate.admitted) == (1, 0, 2)
+
+
+def test_gate_from_env(monkeypatch):
+    monkeypatch.setenv('ADMISSION_REPORT_PDF_LIMIT', '7')
+    monkeypatch.setenv('ADMISSION_REPORT_PDF_QUEUE', '0')
+    gate = gate_from_env('report-pdf', limit=2, queue=8, timeout=1)
+    assert (gate.limit, gate.queue, gate.timeout) == (7, 0, 1.0)
+
+
+def test_middleware_answers_429_and_503():
+    from starlette.applications import Starlette
+    from starlette.responses import PlainTextResponse
+    from starlette.routing import Route
+    from starlette.testclient import TestClient
+
+    full = AdmissionGate('full', limit=0, queue=0, timeout=1, retry_after=2)
+    slow = AdmissionGate('slow', limit=0, queue=1, timeout=0.01)
+    open_gate = AdmissionGate('open', limit=1, queue=0, timeout=1)
+
+    async def ok(request):
+        return PlainTextResponse('ok')
+
+    app = Starlette(routes=[Route('/{name}', ok, methods=['GET', 'POST'])])
+    app.add_middleware(AdmissionMiddleware, routes=[('GET', '/full', full), ('GET', '/slow', slow),
+                                                     ('GET', '/open', open_gate)])
+    client = TestClient(app)
+
+    response = client.get('/full')
+    assert response.status_code == 429 and response.headers['retry-after'] == '2'
+    assert client.get('/slow').status_code == 503
+    response = client.get('/open')
+    assert response.status_code == 200 and response.headers['server-timing'].startswith('admission;dur=')
+    assert open_gate.running == 0
+    assert client.post('/full').status_code == 200  # only GET is gated
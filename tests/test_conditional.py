@@ -0,0 +1,77 @@
+"""ETags and 304 Not Modified"""
+import pytest
+
+from conditional import etag_matches, make_etag, not_modified
+
+WEIGHTS = {"cpu": 0.25, "ram": 0.25, "disk": 0.25, "price": 0.25}
+
+
+def _request(if_none_match=None):
+    from starlette.requests import Request
+
+    headers = [] if if_none_match is None else [(b'if-none-match', if_none_match.encode())]
+    return Request({'type': 'http', 'method': 'GET', 'path': '/', 'headers': headers})
+
+
+def test_make_etag_is_stable_and_quoted():
+    etag = make_etag('data', 'abc', {'b': 1, 'a': 2})
+    assert etag == make_etag('data', 'abc', {'a': 2, 'b': 1})
+    assert etag != make_etag('data', 'abd', {'a': 2, 'b': 1})
+    assert etag.startswith('"') and etag.endswith('"')
+
+
+@pytest.mark.parametrize('header, expected', [
+    (None, False),
+    ('', False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"x", "abc"', True),
+    ('*', True),
+    ('"abcd"', False),
+    ('abc', False),
+])
+def test_etag_matches(header, expected):
+    assert etag_matches(header, '"abc"') is expected
+
+
+def test_not_modified():
+    assert not_modified(_request(), '"abc"') is None
+    assert not_modified(_request('"other"'), '"abc"') is None
+
+    response = not_modified(_request('"abc"'), '"abc"')
+    assert response.status_code == 304
+    assert response.headers['etag'] == '"abc"'
+    assert response.headers['cache-control'] == 'no-cache'
+    assert response.body == b''
+
+
+def _revalidate(client, method, url, **kwargs):
+    first = getattr(client, method)(url, **kwargs)
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    again = getattr(client, method)(url, headers={'If-None-Match': etag}, **kwargs)
+    return etag, again
+
+
+def test_routes_answer_304_until_the_data_changes(api_dir):
+    from fastapi.testclient import TestClient
+
+    client = TestClient(api_dir.app)
+
+    etag, again = _revalidate(client, 'get', '/api/data')
+    assert again.status_code == 304 and again.headers['ETag'] == etag
+
+    _, again = _revalidate(client, 'post', '/api/calculate', json=WEIGHTS)
+    assert again.status_code == 304
+
+    history_etag, again = _revalidate(client, 'get', '/api/history', params={'limit': 5})
+    assert again.status_code == 304
+    assert client.post('/api/history', json={"title": "t", "weights": WEIGHTS}).status_code == 200
+    changed = client.get('/api/history', params={'limit': 5}, headers={'If-None-Match': history_etag})
+    assert changed.status_code == 200 and changed.headers['ETag'] != history_etag
+
+    vendor = {"vendor": "New", "nama_paket": "Plan", "cpu_level": 1, "ram_level": 2,
+              "diskio_level": 3, "price_level": 4}
+    assert client.post('/api/data', json=vendor).status_code == 200
+    changed = client.get('/api/data', headers={'If-None-Match': etag})
+    assert changed.status_code == 200 and changed.headers['ETag'] != etag
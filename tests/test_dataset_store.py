@@ -0,0 +1,107 @@
+"""Delta log of the versioned vendor catalog"""
+import json
+import os
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from dataset_store import CHECKPOINT_EVERY, DatasetStore
+
+
+def _row(i):
+    return (f"Vendor {i}", f"Plan {i}", 1 + i % 5, 1 + i % 4, 1 + i % 3, 1 + i % 2)
+
+
+def _edit(rng, rows, fresh):
+    rows = list(rows)
+    op = rng.choice(['add', 'delete', 'update', 'move'] if rows else ['add'])
+    if op == 'add':
+        rows.insert(rng.randint(0, len(rows)), _row(next(fresh)))
+    elif op == 'delete':
+        del rows[rng.randrange(len(rows))]
+    elif op == 'update':
+        rows[rng.randrange(len(rows))] = _row(next(fresh))
+    else:
+        rows.insert(rng.randint(0, len(rows) - 1), rows.pop(rng.randrange(len(rows))))
+    return rows
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'dataset_versions.jsonl')
+
+
+def test_every_version_reads_back_live_and_after_reopen(path):
+    rng = random.Random(7)
+    fresh = iter(range(10 ** 6))
+    store = DatasetStore(path)
+    expected = {0: []}
+    rows = [_row(next(fresh)) for _ in range(10)]
+    for _ in range(3 * CHECKPOINT_EVERY + 5):  # past several checkpoints
+        version = store.commit(rows)
+        expected[version] = rows
+        rows = _edit(rng, rows, fresh)
+
+    reopened = DatasetStore(path)
+    assert reopened.head == store.head == len(expected) - 1
+    for version in rng.sample(sorted(expected), len(expected)):  # out of order, through the LRU
+        assert store.snapshot(version) == expected[version]
+        assert reopened.snapshot(version) == expected[version]
+        assert reopened.content_hash(version) == store.content_hash(version)
+
+
+def test_rows_are_written_once(path):
+    store = DatasetStore(path)
+    base = [_row(i) for i in range(5)]
+    store.commit(base)
+    store.commit(base[1:])
+    store.commit(base)  # rows 0-4 again: only a version record
+
+    with open(path, encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert sum(r['op'] == 'row' for r in records) == 5
+    assert store.content_hash(3) == store.content_hash(1) != store.content_hash(2)
+
+
+def test_unchanged_commit_keeps_the_head(path):
+    store = DatasetStore(path)
+    assert store.commit([_row(1)]) == 1
+    assert store.commit([_row(1)]) == 1
+    assert [v['version'] for v in store.versions()] == [1]
+
+
+def test_columns_and_unknown_versions(path):
+    store = DatasetStore(path)
+    store.commit([_row(1), _row(2)])
+
+    columns = store.columns(1)
+    assert columns['No'].tolist() == [1, 2]
+    assert columns['Vendor'].tolist() == ['Vendor 1', 'Vendor 2']
+    assert columns['CPU_Level'].dtype == np.int64
+    assert len(store.columns(0)['Vendor']) == 0
+    with pytest.raises(KeyError):
+        store.snapshot(5)
+
+
+def test_sync_reads_the_file_only_when_it_changed(path, tmp_path):
+    data_file = tmp_path / 'input.txt'
+    data_file.write_text('a')
+    reads = []
+
+    def reader(p):
+        reads.append(p)
+        return [_row(len(reads))]
+
+    store = DatasetStore(path)
+    assert store.sync(str(data_file), reader) == 1
+    assert store.sync(str(data_file), reader) == 1
+    assert DatasetStore(path).sync(str(data_file), reader) == 1  # stat restored from the log
+    assert len(reads) == 1
+
+    data_file.write_text('bb')
+    assert store.sync(str(data_file), reader) == 2
+    assert len(reads) == 2
+    assert store.versions()[-1]['source'] == 'file'
+    assert os.path.exists(path + '.head')
@@ -0,0 +1,137 @@
+"""Append, tombstone, compaction and reopen of the history log"""
+import json
+import os
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from history_store import HistoryStore
+
+
+def _entry(title, vendor='A', tags=(), timestamp='2026-01-01T00:00:00'):
+    return {"timestamp": timestamp, "title": title,
+            "weights": {"cpu": 0.25, "ram": 0.25, "disk": 0.25, "price": 0.25},
+            "top_vendor": vendor, "tags": list(tags)}
+
+
+def _records(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'history.jsonl')
+
+
+def test_append_assigns_ids_and_reads_back(path):
+    store = HistoryStore(path)
+    ids = [store.append({**_entry(f"e{i}"), "id": 999}) for i in range(3)]
+
+    assert ids == [1, 2, 3]  # a client-supplied id is ignored
+    assert store.get(2)['title'] == 'e1'
+    assert store.get(4) is None
+    assert [e['id'] for e in store.iter_entries()] == [3, 2, 1]
+    assert len(store) == 3
+
+
+def test_delete_appends_a_tombstone(path):
+    store = HistoryStore(path)
+    for i in range(3):
+        store.append(_entry(f"e{i}"))
+    before = store.version
+
+    assert store.delete(2)
+    assert not store.delete(2)
+    assert not store.delete(42)
+
+    assert store.get(2) is None
+    assert len(store) == 2
+    assert store.version != before
+    assert _records(path)[-1] == {'op': 'del', 'id': 2}
+    # Ids are never reused
+    assert store.append(_entry("e3")) == 4
+
+
+def test_query_filters_and_pages(path):
+    store = HistoryStore(path)
+    for i in range(5):
+        store.append(_entry(f"e{i}", vendor='B' if i % 2 else 'A', tags=['x'] if i < 2 else []))
+
+    page, cursor = store.query(limit=2)
+    assert [e['id'] for e in page] == [5, 4]
+    page, cursor = store.query(limit=2, cursor=cursor)
+    assert [e['id'] for e in page] == [3, 2]
+    page, cursor = store.query(limit=2, cursor=cursor)
+    assert [e['id'] for e in page] == [1] and cursor is None
+
+    assert [e['id'] for e in store.query(vendor='B')[0]] == [4, 2]
+    assert [e['id'] for e in store.query(tag='x')[0]] == [2, 1]
+    assert store.query(fields=['title'], limit=1)[0] == [{'title': 'e4'}]
+
+
+def test_compact_keeps_live_entries_and_version(path):
+    store = HistoryStore(path)
+    for i in range(10):
+        store.append(_entry(f"e{i}"))
+    for entry_id in range(1, 10, 2):
+        store.delete(entry_id)
+    version = store.version
+    size = os.path.getsize(path)
+
+    assert store.compact()
+
+    assert os.path.getsize(path) < size
+    records = _records(path)
+    assert records[0] == {'op': 'meta', 'next_id': 11}
+    assert [r['entry']['id'] for r in records[1:]] == [2, 4, 6, 8, 10]
+    assert store.version == version
+    assert [e['id'] for e in store.iter_entries()] == [10, 8, 6, 4, 2]
+    assert store.append(_entry("after")) == 11
+
+
+def test_reopen_rebuilds_the_same_state(path):
+    store = HistoryStore(path)
+    for i in range(6):
+        store.append(_entry(f"e{i}", vendor='AB'[i % 2]))
+    store.delete(3)
+    store.compact()
+    store.append(_entry("late"))
+
+    reopened = HistoryStore(path)
+    assert reopened.version == store.version
+    assert [e['id'] for e in reopened.iter_entries()] == [7, 6, 5, 4, 2, 1]
+    assert reopened.analytics() == store.analytics()
+    assert reopened.append(_entry("next")) == 8
+
+
+def test_clear_keeps_ids_increasing(path):
+    store = HistoryStore(path)
+    store.append(_entry("a"))
+    store.append(_entry("b"))
+    store.clear()
+
+    assert len(store) == 0
+    assert HistoryStore(path).append(_entry("c")) == 3
+
+
+def test_torn_last_line_is_dropped(path):
+    store = HistoryStore(path)
+    store.append(_entry("a"))
+    with open(path, 'ab') as f:
+        f.write(b'{"op": "put", "entry": {"id": 2, "tit')  # crashed mid-write
+
+    reopened = HistoryStore(path)
+    assert len(reopened) == 1
+    assert reopened.append(_entry("b")) == 2
+    assert [r.get('entry', {}).get('id') for r in _records(path)[1:]] == [1, 2]
+
+
+def test_legacy_json_is_migrated(tmp_path, path):
+    legacy = tmp_path / 'calculation_history.json'
+    legacy.write_text(json.dumps([{**_entry("new"), "id": 2}, {**_entry("old"), "id": 1}]))
+
+    store = HistoryStore(path, legacy_path=str(legacy))
+    assert [e['title'] for e in store.iter_entries()] == ['new', 'old']
+    assert store.append(_entry("next")) == 3
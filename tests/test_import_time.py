@@ -0,0 +1,51 @@
+"""Import-time budget of the CLI and the API (python -X importtime).
+
+Plotting, pandas and Excel libraries are imported inside the code paths
+that need them; importing the entry points must not pull them in.
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+from conftest import BACKEND, ROOT
+
+HEAVY_MODULES = ['pandas', 'matplotlib', 'openpyxl', 'seaborn']
+# topsis_service's analyzer is built on pandas; only plotting has to stay lazy there
+ALLOWED = {'topsis_service': {'pandas'}}
+# Cumulative seconds, with room for slower machines: about 3x what they take
+# on a developer laptop (main is mostly FastAPI and pydantic)
+IMPORT_BUDGET = {
+    'main': float(os.environ.get('IMPORT_BUDGET_MAIN', '1.5')),
+    'topsis_spk': float(os.environ.get('IMPORT_BUDGET_CLI', '0.5')),
+    'topsis_service': float(os.environ.get('IMPORT_BUDGET_SERVICE', '1.5')),
+}
+CWD = {'main': BACKEND, 'topsis_spk': ROOT, 'topsis_service': BACKEND}
+
+
+def import_in_subprocess(module):
+    """(cumulative import seconds, heavy modules loaded) for a cold `import module`"""
+    code = f"import sys, json; import {module}; print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=CWD[module],
+                          capture_output=True, text=True, timeout=120)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    # Lines look like "import time:  self [us] | cumulative | name"; the module's own line is its total
+    match = re.search(rf'^import time:\s+\d+ \|\s+(\d+) \| {module}$', proc.stderr, re.MULTILINE)
+    assert match, f"no importtime line for {module}"
+    return int(match.group(1)) / 1e6, json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize('module', sorted(IMPORT_BUDGET))
+def test_import_stays_light(module):
+    pytest.importorskip('numpy')
+    if module != 'topsis_spk':
+        pytest.importorskip('fastapi')
+
+    seconds, heavy = import_in_subprocess(module)
+
+    heavy = [name for name in heavy if name not in ALLOWED.get(module, ())]
+    assert heavy == [], f"importing {module} loaded {heavy}"
+    assert seconds < IMPORT_BUDGET[module], f"importing {module} took {seconds:.2f}s"
@@ -0,0 +1,60 @@
+"""'1. Input Level' read with each engine"""
+import os
+
+import pytest
+
+pytest.importorskip('openpyxl')
+
+from conftest import BACKEND
+from input_reader import read_input_level
+
+
+def _api_written_workbook(main):
+    """The workbook after the API saved it back (startrow=2)"""
+    df = main.load_input_level()
+    df.loc[len(df)] = [len(df) + 1, 'Added', 'Plan X', 1, 2, 3, 4]
+    main.save_input_level(df)
+    return os.path.abspath(main.DATA_FILE)
+
+
+@pytest.mark.parametrize('source', ['shipped', 'api'])
+def test_engines_read_the_same_columns(source, api_dir):
+    pytest.importorskip('python_calamine')
+    if source == 'shipped':
+        path = os.path.join(BACKEND, 'TOPSIS_Input_Level.xlsx')
+    else:
+        path = _api_written_workbook(api_dir)
+
+    fast, fast_stats = read_input_level(path, engine='calamine')
+    slow, slow_stats = read_input_level(path, engine='openpyxl')
+
+    assert fast_stats['rows'] == slow_stats['rows'] > 0
+    assert fast.keys() == slow.keys()
+    for name in fast:
+        assert fast[name].tolist() == slow[name].tolist(), name
+
+
+def test_api_written_sheet(api_dir):
+    path = _api_written_workbook(api_dir)
+    columns, stats = read_input_level(path, engine='openpyxl')
+    assert columns['Vendor'][-1] == 'Added'
+    assert columns['No'].tolist() == list(range(1, stats['rows'] + 1))
+
+
+def test_blank_no_takes_the_row_position(tmp_path):
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = '1. Input Level'
+    ws.append([])
+    ws.append([])
+    ws.append(['No', 'Vendor', 'Nama Paket (Plan)', 'CPU_Level', 'RAM_Level', 'DiskIO_Level', 'Price_Level'])
+    ws.append([1, 'A', 'p', 1, 2, 3, 4])
+    ws.append([None, 'B', 'p', 2, 3, 4, 5])  # hand-edited row
+    path = str(tmp_path / 'input.xlsx')
+    wb.save(path)
+
+    columns, _ = read_input_level(path, engine='openpyxl')
+    assert columns['No'].tolist() == [1, 2]
+    assert columns['CPU_Level'].tolist() == [1, 2]
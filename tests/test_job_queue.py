@@ -0,0 +1,130 @@
+"""Job lifecycle: submit, progress, result, failure, cancellation, ownership, eviction"""
+import json
+import os
+import time
+
+import pytest
+
+from job_queue import FINISHED, JobQueue, QueueFull
+
+
+def _echo(params, inputs, ctx):
+    ctx.progress(1, 1, 'done')
+    return {"params": params, "inputs": inputs}
+
+
+def _fail(params, inputs, ctx):
+    raise ValueError("bad input")
+
+
+def _until_cancelled(params, inputs, ctx):
+    for i in range(6000):
+        ctx.progress(i, 6000)
+        time.sleep(0.01)
+    return {}
+
+
+KINDS = {'echo': _echo, 'fail': _fail, 'slow': _until_cancelled}
+
+
+@pytest.fixture
+def make_queue(tmp_path):
+    queues = []
+
+    def make(**kwargs):
+        queue = JobQueue(KINDS, directory=str(tmp_path / 'jobs'), **kwargs)
+        queues.append(queue)
+        return queue
+
+    yield make
+    for queue in queues:
+        queue.shutdown()
+
+
+def _wait(queue, job_id, states=FINISHED, timeout=60):
+    deadline = time.monotonic() + timeout
+    while True:
+        status = queue.status(job_id)
+        if status['state'] in states:
+            return status
+        assert time.monotonic() < deadline, status
+        time.sleep(0.02)
+
+
+def test_job_runs_to_a_result(make_queue):
+    queue = make_queue()
+    job = queue.submit('echo', {"n": 1}, inputs=[1, 2])
+    assert job['state'] in ('queued', 'running')
+
+    status = _wait(queue, job['id'])
+    assert status['state'] == 'done' and status['error'] is None
+    assert status['progress'] == {"done": 1, "total": 1, "message": 'done'}
+    assert status['expires'] == pytest.approx(status['finished'] + queue.ttl)
+    assert queue.result(job['id']) == {"params": {"n": 1}, "inputs": [1, 2]}
+    assert [j['id'] for j in queue.list()] == [job['id']]
+
+
+def test_failure_is_recorded(make_queue):
+    queue = make_queue()
+    status = _wait(queue, queue.submit('fail', {})['id'])
+    assert status['state'] == 'failed'
+    assert status['error'] == 'ValueError: bad input'
+    assert queue.result(status['id']) is None
+
+
+def test_cancel_and_delete_a_running_job(make_queue):
+    queue = make_queue()
+    job_id = queue.submit('slow', {})['id']
+    _wait(queue, job_id, states=('running',))
+
+    assert queue.cancel(job_id)['cancel_requested']
+    assert _wait(queue, job_id)['state'] == 'cancelled'
+    assert queue.delete(job_id)
+    assert queue.status(job_id) is None
+    assert not queue.delete(job_id)
+
+
+def test_queue_full(make_queue):
+    queue = make_queue(max_pending=1)
+    job_id = queue.submit('slow', {})['id']
+    with pytest.raises(QueueFull):
+        queue.submit('echo', {})
+    queue.cancel(job_id)
+    _wait(queue, job_id)
+    assert _wait(queue, queue.submit('echo', {})['id'])['state'] == 'done'
+
+
+def test_other_process_jobs_are_shared_until_orphaned(make_queue, tmp_path):
+    owner, other = make_queue(), make_queue()
+    job_id = owner.submit('slow', {})['id']
+    _wait(owner, job_id, states=('running',))
+
+    # Still owned: another queue on the same directory sees it running and can cancel it
+    assert other.status(job_id)['state'] == 'running'
+    assert other.cancel(job_id)['cancel_requested']
+    assert _wait(owner, job_id)['state'] == 'cancelled'
+
+    # A job left running by a process that is gone (owner.lock not held)
+    orphan = 'f' * 32
+    os.makedirs(tmp_path / 'jobs' / orphan)
+    (tmp_path / 'jobs' / orphan / 'job.json').write_text(json.dumps(
+        {"id": orphan, "kind": 'slow', "params": {}, "state": 'running', "owner": 0,
+         "created": time.time(), "finished": None, "error": None}))
+    status = other.status(orphan)
+    assert status['state'] == 'failed' and status['error'].startswith('Interrupted')
+
+
+def test_finished_jobs_expire(make_queue):
+    queue = make_queue(ttl=0)
+    job_id = queue.submit('echo', {})['id']
+    _wait(queue, job_id)
+    time.sleep(0.01)
+    assert queue.list() == []
+    assert queue.status(job_id) is None
+
+
+def test_rejects_paths_that_are_not_job_ids(make_queue):
+    queue = make_queue()
+    assert queue.status('../jobs') is None
+    assert queue.result('..') is None
+    assert not queue.delete('x' * 32)
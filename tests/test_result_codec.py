@@ -0,0 +1,40 @@
+"""Round trip of the packed history results"""
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from result_codec import decode_result, encode_result
+
+
+@pytest.mark.parametrize('n', [0, 1, 21, 70000])
+def test_round_trip(n):
+    rng = np.random.default_rng(n)
+    scores = rng.random(n)
+
+    blob = encode_result(scores)
+    order, decoded = decode_result(blob)
+
+    assert blob['rows'] == n
+    assert order.tolist() == np.argsort(-scores, kind='stable').tolist()
+    assert np.array_equal(decoded, scores[order].astype(np.float32).astype(np.float64))
+
+
+def test_ties_keep_row_order():
+    order, scores = decode_result(encode_result([0.5, 0.9, 0.5, 0.9]))
+    assert order.tolist() == [1, 3, 0, 2]
+    assert scores.tolist() == [0.8999999761581421, 0.8999999761581421, 0.5, 0.5]
+
+
+def test_order_width_follows_row_count():
+    import base64
+
+    assert len(base64.b64decode(encode_result(np.zeros(10))['order'])) == 10 * 2
+    assert len(base64.b64decode(encode_result(np.zeros(0x10000))['order'])) == 0x10000 * 4
+
+
+def test_rejects_unknown_encoding_and_truncated_blobs():
+    blob = encode_result([0.1, 0.2, 0.3])
+    with pytest.raises(ValueError, match='encoding'):
+        decode_result({**blob, 'encoding': 99})
+    with pytest.raises(ValueError, match='truncated'):
+        decode_result({**blob, 'rows': 4})
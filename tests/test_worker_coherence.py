@@ -0,0 +1,135 @@
+"""Several worker processes sharing one dataset log and one history log"""
+import multiprocessing
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from dataset_store import DatasetStore
+from history_store import HistoryStore
+
+WORKERS = 4
+COMMITS = 20
+
+
+def _row(worker, i):
+    return (f"Vendor {worker}-{i}", "Plan", 1 + i % 5, 2, 3, 4)
+
+
+def _commit_dataset(path, worker, ready, done, results):
+    store = DatasetStore(path)
+    ready.wait()
+    versions = []
+    for i in range(COMMITS):
+        with store.exclusive():  # read-modify-write, as the vendor routes do
+            rows = store.snapshot(store.refresh())
+            versions.append(store.commit(rows + [_row(worker, i)], source=f"worker-{worker}"))
+    done.wait()  # every process has finished writing
+    results.put((versions, store.refresh(), store.content_hash(store.head)))
+
+
+def _append_history(path, worker, ready, done, results):
+    store = HistoryStore(path)
+    ready.wait()
+    ids = []
+    for i in range(COMMITS):
+        ids.append(store.append({"timestamp": "2026-01-01T00:00:00", "title": f"{worker}-{i}",
+                                 "weights": {"cpu": 0.25, "ram": 0.25, "disk": 0.25, "price": 0.25},
+                                 "top_vendor": "A", "tags": [f"w{worker}"]}))
+        if i % 5 == 4:
+            assert store.delete(ids[-2])
+        if worker == 0 and i == COMMITS // 2:
+            store.compact()  # rewrites the file while the others append
+    done.wait()
+    store.refresh()
+    results.put((ids, store.version, len(store), [e['id'] for e in store.query()[0]]))
+
+
+def _run(target, path):
+    ctx = multiprocessing.get_context('spawn')
+    ready, done, results = ctx.Barrier(WORKERS), ctx.Barrier(WORKERS), ctx.Queue()
+    processes = [ctx.Process(target=target, args=(path, worker, ready, done, results)) for worker in range(WORKERS)]
+    for p in processes:
+        p.start()
+    out = [results.get(timeout=120) for _ in processes]
+    for p in processes:
+        p.join(timeout=30)
+        assert p.exitcode == 0
+    return out
+
+
+def test_dataset_versions_are_global(tmp_path):
+    path = str(tmp_path / 'dataset_versions.jsonl')
+    DatasetStore(path).commit([_row('seed', 0)], source='seed')
+
+    out = _run(_commit_dataset, path)
+
+    versions = sorted(v for committed, _, _ in out for v in committed)
+    assert versions == list(range(2, 2 + WORKERS * COMMITS))
+    assert {head for _, head, _ in out} == {1 + WORKERS * COMMITS}
+    assert len({digest for _, _, digest in out}) == 1
+
+    reopened = DatasetStore(path)
+    assert [v['version'] for v in reopened.versions()] == list(range(1, 2 + WORKERS * COMMITS))
+    assert len(reopened.snapshot(reopened.head)) == 1 + WORKERS * COMMITS
+
+
+def test_history_ids_are_global(tmp_path):
+    path = str(tmp_path / 'history.jsonl')
+    HistoryStore(path)
+
+    out = _run(_append_history, path)
+
+    ids = sorted(i for appended, _, _, _ in out for i in appended)
+    assert ids == list(range(1, 1 + WORKERS * COMMITS))
+    assert len({version for _, version, _, _ in out}) == 1
+    assert len({live for _, _, live, _ in out}) == 1
+    assert len({tuple(listed) for _, _, _, listed in out}) == 1
+
+    reopened = HistoryStore(path)
+    assert reopened.version == out[0][1]
+    assert len(reopened) == WORKERS * COMMITS - WORKERS * (COMMITS // 5)
+
+
+def test_data_served_from_the_log_after_restart(api_dir, monkeypatch):
+    pytest.importorskip('openpyxl')
+    from fastapi.testclient import TestClient
+
+    main = api_dir
+    client = TestClient(main.app)
+
+    first = client.get('/api/data')
+    assert first.status_code == 200
+    assert 'X-Load-Engine' in first.headers
+
+    # A restarted process (or another worker) opens the same log and never reads the workbook
+    monkeypatch.setattr(main, 'dataset_store', None)
+    monkeypatch.setattr(main, 'input_load_stats', {})
+    second = client.get('/api/data')
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert second.headers['ETag'] == first.headers['ETag']
+    assert 'X-Load-Engine' not in second.headers
+
+
+def test_partial_line_from_a_crashed_writer(tmp_path):
+    dataset_path, history_path = str(tmp_path / 'dataset.jsonl'), str(tmp_path / 'history.jsonl')
+    datasets = DatasetStore(dataset_path), DatasetStore(dataset_path)
+    histories = HistoryStore(history_path), HistoryStore(history_path)
+    datasets[0].commit([_row('a', 0)])
+    histories[0].append({"timestamp": "2026-01-01T00:00:00", "title": "a", "weights": {},
+                         "top_vendor": "A", "tags": []})
+
+    # Another worker was killed halfway through writing a line
+    for path in (dataset_path, history_path):
+        with open(path, 'ab') as f:
+            f.write(b'{"op": "version", "vers')
+
+    assert datasets[1].commit([_row('a', 0), _row('b', 0)]) == 2
+    assert histories[1].append({"timestamp": "2026-01-01T00:00:00", "title": "b", "weights": {},
+                                "top_vendor": "B", "tags": []}) == 2
+
+    assert len(datasets[0].snapshot(datasets[0].refresh())) == 2
+    assert len(DatasetStore(dataset_path).snapshot(2)) == 2
+    assert histories[0].get(2)['title'] == 'b'
+    assert [e['id'] for e in HistoryStore(history_path).iter_entries()] == [2, 1]
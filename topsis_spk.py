@@ -1,12 +1,31 @@
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import re
+import os
+import sys
+import glob
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 
+# Ekspor hasil memakai modul yang sama dengan backend
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+from export_service import EXPORT_FORMATS as EXPORT_MEDIA_TYPES, rank_order, write_export  # noqa: E402
+
+DEFAULT_CSV = 'No-Vendor-NamaPaketPlan-CPU-RAM-DiskIOSpeed-HargaBulanUSD.csv'
+DEFAULT_WEIGHTS = [0.25, 0.25, 0.25, 0.25]  # CPU, RAM, Disk I/O, Harga
+WEIGHT_KEYS = ['cpu', 'ram', 'disk', 'price']
+PLOT_FORMATS = ['png', 'svg', 'pdf']
+EXPORT_FORMATS = list(EXPORT_MEDIA_TYPES)
+EXPORT_COLUMNS = ['Rank', 'No', 'Vendor', 'Nama Paket (Plan)', 
+                  'CPU_val', 'CPU_Level', 'RAM_val', 'RAM_Level', 
+                  'DiskIO_val', 'DiskIO_Level', 'Price_val', 'Price_Level', 
+                  'Score']
+
 class TOPSISAnalyzer:
     def __init__(self, csv_file, weights):
+        import pandas as pd  # lazy: `--help` dan validasi argumen tidak perlu pandas
+        
         self.df = pd.read_csv(csv_file)
         self.weights = np.array(weights)
         self.criteria_names = ['CPU', 'RAM', 'Disk I/O', 'Harga']
@@ -93,8 +112,9 @@ class TOPSISAnalyzer:
         print("╚" + "═"*W + "╝")
         
         # Kriteria & Bobot (compact)
+        w = [f"{x * 100:.0f}%" for x in self.weights]
         print("\n┌─ ⚖️  BOBOT KRITERIA " + "─"*48 + "┐")
-        print(f"│  CPU: 25% (BENEFIT)  │  RAM: 25% (BENEFIT)  │  I/O: 25% (BENEFIT)  │  Harga: 25% (COST)  │")
+        print(f"│  CPU: {w[0]} (BENEFIT)  │  RAM: {w[1]} (BENEFIT)  │  I/O: {w[2]} (BENEFIT)  │  Harga: {w[3]} (COST)  │")
         print("└" + "─"*68 + "┘")
         
         result = self.df[['Rank', 'Vendor', 'Nama Paket (Plan)', 'CPU_val', 'CPU_Level',
@@ -129,7 +149,12 @@ class TOPSISAnalyzer:
         print(f"║  📈 Score TOPSIS: {top['Score']:.4f}".ljust(69) + "║")
         print("╚" + "═"*68 + "╝\n")
         
-    def create_visualizations(self):
+    def create_visualizations(self, output_file='hasil_visualisasi_topsis.png', dpi=300,
+                              show=False, verbose=True):
+        # Dependensi visualisasi berat, hanya dimuat saat plot benar-benar dibuat
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        
         result = self.df.sort_values('Rank')
         
         # Modern color palette
@@ -303,27 +328,32 @@ class TOPSISAnalyzer:
             ax6.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.5, 
                     f'{bar.get_height():.1f}', ha='center', fontsize=9, fontweight='bold', color=COLORS['primary'])
         
-        plt.savefig('hasil_visualisasi_topsis.png', dpi=300, bbox_inches='tight', facecolor=COLORS['bg'])
-        print("✓ Visualisasi disimpan ke 'hasil_visualisasi_topsis.png'")
-        plt.show()
+        fig.savefig(output_file, dpi=dpi, bbox_inches='tight', facecolor=COLORS['bg'])
+        if verbose:
+            print(f"✓ Visualisasi disimpan ke '{output_file}'")
+        if show:
+            plt.show()
+        plt.close(fig)
         
-    def export_results(self):
-        result = self.df[['Rank', 'No', 'Vendor', 'Nama Paket (Plan)', 
-                          'CPU_val', 'CPU_Level', 'RAM_val', 'RAM_Level', 
-                          'DiskIO_val', 'DiskIO_Level', 'Price_val', 'Price_Level', 
-                          'Score']].sort_values('Rank')
+    def export_results(self, output_dir='.', fmt='csv', verbose=True):
+        output_path = os.path.join(output_dir, f'hasil_topsis_lengkap.{fmt}')
+        txt_path = os.path.join(output_dir, 'rekomendasi_top5.txt')
         
-        result.to_csv('hasil_topsis_lengkap.csv', index=False)
-        print("✓ Hasil lengkap disimpan ke 'hasil_topsis_lengkap.csv'")
+        # Urutan ranking dan penulisan per potongan dipakai bersama dengan API
+        # (backend/export_service.py), jadi hasil CLI dan /api/export sama
+        order = rank_order(self.df['Rank'].to_numpy(), self.df['Score'].to_numpy())
+        write_export(output_path, {c: self.df[c].to_numpy() for c in EXPORT_COLUMNS}, order, fmt)
+        if verbose:
+            print(f"✓ Hasil lengkap disimpan ke '{output_path}'")
         
         # Export top 5 detail
-        top5 = result.head(5)
-        with open('rekomendasi_top5.txt', 'w', encoding='utf-8') as f:
+        top5 = self.df.iloc[order[:5]]
+        with open(txt_path, 'w', encoding='utf-8') as f:
             f.write("="*80 + "\n")
             f.write("SPK PEMILIHAN SERVER CLOUD TERBAIK PT KAJEK INDONESIA\n")
             f.write("TOP 5 REKOMENDASI\n")
             f.write("="*80 + "\n\n")
-            for _, row in top5.iterrows():
+            for row in top5.to_dict(orient='records'):
                 f.write(f"Rank #{row['Rank']}\n")
                 f.write(f"Vendor: {row['Vendor']}\n")
                 f.write(f"Paket: {row['Nama Paket (Plan)']}\n")
@@ -334,28 +364,214 @@ class TOPSISAnalyzer:
                 f.write(f"Score TOPSIS: {row['Score']:.4f}\n")
                 f.write("-"*80 + "\n\n")
         
-        print("✓ Top 5 rekomendasi disimpan ke 'rekomendasi_top5.txt'")
+        if verbose:
+            print(f"✓ Top 5 rekomendasi disimpan ke '{txt_path}'")
+
+
+def parse_weights(value):
+    """Mengubah satu skenario bobot (list atau dict cpu/ram/disk/price) menjadi list 4 angka"""
+    if isinstance(value, dict):
+        missing = [k for k in WEIGHT_KEYS if k not in value]
+        if missing:
+            raise ValueError(f"Bobot tidak lengkap, kurang: {', '.join(missing)}")
+        value = [value[k] for k in WEIGHT_KEYS]
+    weights = [float(w) for w in value]
+    if len(weights) != 4:
+        raise ValueError(f"Bobot harus 4 nilai (CPU, RAM, Disk I/O, Harga), didapat {len(weights)}")
+    if any(w < 0 for w in weights) or sum(weights) <= 0:
+        raise ValueError("Bobot harus non-negatif dan totalnya lebih dari 0")
+    return weights
+
+def load_scenarios(weights_file):
+    """Membaca file JSON berisi skenario bobot.
 
-def main():
-    # Konfigurasi
-    csv_file = 'No-Vendor-NamaPaketPlan-CPU-RAM-DiskIOSpeed-HargaBulanUSD.csv'
-    weights = [0.25, 0.25, 0.25, 0.25]  # CPU, RAM, Disk I/O, Harga
+    Format yang didukung:
+      {"seimbang": [0.25, 0.25, 0.25, 0.25], "hemat": {"cpu": 0.2, "ram": 0.2, "disk": 0.1, "price": 0.5}}
+      [{"name": "seimbang", "weights": [0.25, 0.25, 0.25, 0.25]}, ...]
+    """
+    with open(weights_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
     
-    # Inisialisasi
-    analyzer = TOPSISAnalyzer(csv_file, weights)
+    if isinstance(data, dict):
+        items = list(data.items())
+    elif isinstance(data, list):
+        items = [(item.get('name', f"skenario_{i + 1}"), item['weights']) for i, item in enumerate(data)]
+    else:
+        raise ValueError("File bobot harus berisi object atau list skenario")
+    
+    if not items:
+        raise ValueError("File bobot tidak berisi skenario")
+    
+    scenarios = [(str(name), parse_weights(w)) for name, w in items]
+    names = [name for name, _ in scenarios]
+    if len(set(names)) != len(names):
+        raise ValueError("Nama skenario bobot harus unik")
+    return scenarios
+
+def expand_inputs(patterns):
+    """Mengembangkan pola glob menjadi daftar file CSV (urut, tanpa duplikat)"""
+    files, seen = [], set()
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            # 'a.csv' dan './a.csv' adalah file yang sama
+            key = os.path.normcase(os.path.abspath(path))
+            if key not in seen:
+                seen.add(key)
+                files.append(path)
+    return files
+
+def input_dirnames(csv_files):
+    """Subdirektori output per file input: path relatif terhadap direktori bersama, tanpa ekstensi.
+
+    'r1/prices.csv' dan 'r2/prices.csv' menjadi 'r1/prices' dan 'r2/prices'.
+    Ekstensi hanya dipertahankan bila dua file berbeda ekstensinya saja.
+    """
+    paths = [os.path.abspath(f) for f in csv_files]
+    root = os.path.commonpath([os.path.dirname(p) for p in paths])
+    relative = [os.path.relpath(p, root) for p in paths]
+    split = [os.path.splitext(r) for r in relative]
+    stems = [stem for stem, _ in split]
+    clashing = {stem for stem in stems if stems.count(stem) > 1}
+    return [f"{stem}_{ext.lstrip('.')}" if stem in clashing else stem for stem, ext in split]
+
+def scenario_dirname(name):
+    """Nama skenario yang aman dipakai sebagai satu komponen path"""
+    safe = re.sub(r'[^\w.-]+', '_', name).strip('._')
+    return safe or 'skenario'
+
+def run_job(csv_file, scenario, weights, output_dir, plot=True, fmt='png', dpi=300,
+            export_format='csv', show=False, verbose=False):
+    """Menjalankan satu kombinasi file × skenario bobot dan menulis hasilnya ke output_dir.
+
+    Dipanggil langsung atau dari worker ProcessPoolExecutor, sehingga harus berupa
+    fungsi top-level dan hanya mengembalikan ringkasan yang bisa di-pickle.
+    """
+    if plot and not show:
+        # Worker batch tidak punya display; pakai backend non-interaktif
+        import matplotlib
+        matplotlib.use('Agg')
+    
+    os.makedirs(output_dir, exist_ok=True)
     
-    # Proses
+    analyzer = TOPSISAnalyzer(csv_file, weights)
     analyzer.extract_values()
     analyzer.calculate_topsis()
     
-    # Output
-    analyzer.print_report()
-    analyzer.export_results()
-    analyzer.create_visualizations()
+    if verbose:
+        analyzer.print_report()
+    analyzer.export_results(output_dir, fmt=export_format, verbose=verbose)
+    if plot:
+        output_file = os.path.join(output_dir, f'hasil_visualisasi_topsis.{fmt}')
+        analyzer.create_visualizations(output_file, dpi=dpi, show=show, verbose=verbose)
+    
+    top = analyzer.df.sort_values('Rank').iloc[0]
+    return {
+        'csv_file': csv_file,
+        'scenario': scenario,
+        'output_dir': output_dir,
+        'alternatives': len(analyzer.df),
+        'top_vendor': top['Vendor'],
+        'top_score': float(top['Score'])
+    }
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="SPK Pemilihan Server Cloud (TOPSIS) - mode CLI/batch"
+    )
+    parser.add_argument('inputs', nargs='*', default=[DEFAULT_CSV],
+                        help="File CSV atau pola glob (contoh: 'data/*.csv')")
+    parser.add_argument('-w', '--weights', metavar='FILE',
+                        help="File JSON berisi satu atau lebih skenario bobot")
+    parser.add_argument('-o', '--output-dir', default='.',
+                        help="Direktori output (default: direktori saat ini)")
+    parser.add_argument('--no-plot', action='store_true',
+                        help="Lewati pembuatan visualisasi")
+    parser.add_argument('--format', choices=PLOT_FORMATS, default='png',
+                        help="Format file visualisasi (default: png)")
+    parser.add_argument('--export', choices=EXPORT_FORMATS, default='csv',
+                        help="Format hasil lengkap: csv, ndjson atau parquet (default: csv)")
+    parser.add_argument('--dpi', type=int, default=300,
+                        help="Resolusi visualisasi raster (default: 300)")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="Jumlah proses paralel (0 = semua core)")
+    parser.add_argument('--show', action='store_true',
+                        help="Tampilkan visualisasi secara interaktif (hanya untuk satu job)")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    
+    csv_files = expand_inputs(args.inputs)
+    if not csv_files:
+        print("✗ Tidak ada file CSV yang cocok dengan input", file=sys.stderr)
+        return 2
+    
+    try:
+        scenarios = load_scenarios(args.weights) if args.weights else [('default', DEFAULT_WEIGHTS)]
+    except (OSError, ValueError, KeyError) as e:
+        print(f"✗ Gagal membaca file bobot: {e}", file=sys.stderr)
+        return 2
+    
+    # Nama skenario berasal dari file bobot: disaring dulu sebelum jadi nama direktori
+    scenario_dirs = [scenario_dirname(name) for name, _ in scenarios]
+    if len(set(scenario_dirs)) != len(scenario_dirs):
+        print("✗ Nama skenario bobot harus unik setelah karakter selain huruf, angka, '.', '-' dan '_' "
+              "diganti '_'", file=sys.stderr)
+        return 2
+    
+    # Satu job menulis langsung ke output_dir; batch memakai subdirektori file/skenario
+    tasks = []
+    single = len(csv_files) == 1 and len(scenarios) == 1
+    for csv_file, input_dir in zip(csv_files, input_dirnames(csv_files)):
+        for (name, weights), scenario_dir in zip(scenarios, scenario_dirs):
+            output_dir = args.output_dir if single else os.path.join(args.output_dir, input_dir, scenario_dir)
+            tasks.append((csv_file, name, weights, output_dir))
+    
+    output_dirs = [os.path.normcase(os.path.abspath(task[3])) for task in tasks]
+    if len(set(output_dirs)) != len(output_dirs):
+        print("✗ Dua job akan menulis ke direktori output yang sama", file=sys.stderr)
+        return 2
+    
+    if args.show and not single:
+        print("✗ --show hanya bisa dipakai untuk satu file dan satu skenario", file=sys.stderr)
+        return 2
+    
+    options = dict(plot=not args.no_plot, fmt=args.format, dpi=args.dpi, export_format=args.export)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    jobs = min(jobs, len(tasks))
+    
+    results, failures = [], []
+    if jobs <= 1:
+        for task in tasks:
+            try:
+                results.append(run_job(*task, show=args.show, verbose=single, **options))
+            except Exception as e:
+                failures.append((task, e))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = {executor.submit(run_job, *task, **options): task for task in tasks}
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    failures.append((futures[future], e))
+    
+    if not single:
+        print(f"\n{'File':<40} {'Skenario':<16} {'Top Vendor':<18} {'Score':>8}")
+        print("─" * 85)
+        for r in sorted(results, key=lambda r: (r['csv_file'], r['scenario'])):
+            # Path apa adanya (bukan basename): file dengan nama sama di direktori berbeda tetap terbedakan
+            print(f"{r['csv_file'][-40:]:<40} {r['scenario'][:16]:<16} "
+                  f"{r['top_vendor'][:18]:<18} {r['top_score']:>8.4f}")
+    
+    for (csv_file, name, _, _), e in failures:
+        print(f"✗ {csv_file} [{name}]: {e}", file=sys.stderr)
     
     print("\n" + "="*80)
-    print("✓ ANALISIS SELESAI".center(80))
+    print(f"✓ ANALISIS SELESAI  •  {len(results)}/{len(tasks)} job berhasil".center(80))
     print("="*80 + "\n")
+    return 1 if failures else 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())